@@ -13,7 +13,7 @@ sys.path.insert(0, ROOT_DIR)
 
 from app.core.config import settings  # noqa: E402
 from app.core.database import Base  # noqa: E402
-from app.models import prospect, campaign, agent, user  # noqa: F401,E402
+from app.models import prospect, campaign, agent, user, checkpoint, rollup  # noqa: F401,E402
 
 # Alembic config
 config = context.config
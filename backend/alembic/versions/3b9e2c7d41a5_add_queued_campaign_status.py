@@ -0,0 +1,35 @@
+"""Add queued campaign status
+
+Revision ID: 3b9e2c7d41a5
+Revises: f84c110a4821
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e2c7d41a5'
+down_revision: Union[str, Sequence[str], None] = 'f84c110a4821'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite stores the enum as VARCHAR without a CHECK constraint,
+    # only PostgreSQL has a native type to extend.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE campaignstatus ADD VALUE IF NOT EXISTS 'QUEUED'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL cannot drop a value from an enum type; move rows back instead.
+    op.execute(
+        sa.text("UPDATE campaigns SET status = 'PENDING' WHERE status = 'QUEUED'")
+    )
@@ -0,0 +1,41 @@
+"""Add campaign checkpoints
+
+Revision ID: 7c1d5e9a2b64
+Revises: 3b9e2c7d41a5
+Create Date: 2026-10-18 16:41:07.532918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d5e9a2b64'
+down_revision: Union[str, Sequence[str], None] = '3b9e2c7d41a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('campaign_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('task_name', sa.String(length=255), nullable=False),
+    sa.Column('output', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', 'task_name', name='uq_campaign_checkpoints_task')
+    )
+    op.create_index(op.f('ix_campaign_checkpoints_campaign_id'), 'campaign_checkpoints', ['campaign_id'], unique=False)
+    op.create_index(op.f('ix_campaign_checkpoints_id'), 'campaign_checkpoints', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_campaign_checkpoints_id'), table_name='campaign_checkpoints')
+    op.drop_index(op.f('ix_campaign_checkpoints_campaign_id'), table_name='campaign_checkpoints')
+    op.drop_table('campaign_checkpoints')
@@ -0,0 +1,30 @@
+"""Add agent activity time indexes
+
+Revision ID: a4f6b2c8d913
+Revises: 7c1d5e9a2b64
+Create Date: 2026-10-18 19:12:44.208361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f6b2c8d913'
+down_revision: Union[str, Sequence[str], None] = '7c1d5e9a2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_agent_activities_started_at', 'agent_activities', ['started_at'], unique=False)
+    op.create_index('ix_agent_activities_campaign_started', 'agent_activities', ['campaign_id', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_agent_activities_campaign_started', table_name='agent_activities')
+    op.drop_index('ix_agent_activities_started_at', table_name='agent_activities')
@@ -0,0 +1,84 @@
+"""Add metrics rollups
+
+Revision ID: d2e8a61f5c37
+Revises: a4f6b2c8d913
+Create Date: 2026-10-18 21:03:18.664027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e8a61f5c37'
+down_revision: Union[str, Sequence[str], None] = 'a4f6b2c8d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('agent_activity_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('agent_name', sa.String(length=100), nullable=False),
+    sa.Column('hour', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('activity_count', sa.Integer(), nullable=False),
+    sa.Column('duration_sum', sa.Float(), nullable=False),
+    sa.Column('timed_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', 'agent_name', 'hour', 'status', name='uq_agent_activity_rollups_key')
+    )
+    op.create_index(op.f('ix_agent_activity_rollups_hour'), 'agent_activity_rollups', ['hour'], unique=False)
+    op.create_index(op.f('ix_agent_activity_rollups_id'), 'agent_activity_rollups', ['id'], unique=False)
+    op.create_table('prospect_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('sector', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('prospect_count', sa.Integer(), nullable=False),
+    sa.Column('quality_score_sum', sa.Float(), nullable=False),
+    sa.Column('quality_score_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', 'sector', 'status', name='uq_prospect_rollups_key')
+    )
+    op.create_index(op.f('ix_prospect_rollups_id'), 'prospect_rollups', ['id'], unique=False)
+
+    # Backfill from the existing rows, with the hours formatted as SQLAlchemy stores them
+    if op.get_bind().dialect.name == 'sqlite':
+        hour = "strftime('%Y-%m-%d %H:00:00.000000', started_at)"
+        duration = "(julianday(completed_at) - julianday(started_at)) * 86400.0"
+    else:
+        hour = "date_trunc('hour', started_at)"
+        duration = "extract(epoch from completed_at - started_at)"
+    op.execute(f"""
+        INSERT INTO agent_activity_rollups
+            (campaign_id, agent_name, hour, status, activity_count, duration_sum, timed_count)
+        SELECT campaign_id, agent_name, {hour}, COALESCE(status, ''),
+               COUNT(*), COALESCE(SUM({duration}), 0), COUNT(completed_at)
+        FROM agent_activities
+        WHERE started_at IS NOT NULL
+        GROUP BY campaign_id, agent_name, {hour}, COALESCE(status, '')
+    """)
+    op.execute("""
+        INSERT INTO prospect_rollups
+            (campaign_id, sector, status, prospect_count, quality_score_sum, quality_score_count)
+        SELECT campaign_id, COALESCE(sector, ''), COALESCE(status, ''),
+               COUNT(*), COALESCE(SUM(quality_score), 0), COUNT(quality_score)
+        FROM prospects
+        GROUP BY campaign_id, COALESCE(sector, ''), COALESCE(status, '')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_prospect_rollups_id'), table_name='prospect_rollups')
+    op.drop_table('prospect_rollups')
+    op.drop_index(op.f('ix_agent_activity_rollups_id'), table_name='agent_activity_rollups')
+    op.drop_index(op.f('ix_agent_activity_rollups_hour'), table_name='agent_activity_rollups')
+    op.drop_table('agent_activity_rollups')
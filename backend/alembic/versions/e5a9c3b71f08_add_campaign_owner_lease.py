@@ -0,0 +1,33 @@
+"""Add campaign owner lease
+
+Revision ID: e5a9c3b71f08
+Revises: d2e8a61f5c37
+Create Date: 2026-10-18 23:17:52.403118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3b71f08'
+down_revision: Union[str, Sequence[str], None] = 'd2e8a61f5c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Campaigns already queued or running have no owner: the first API
+    # process started after the upgrade recovers them
+    op.add_column('campaigns', sa.Column('owner', sa.String(length=100), nullable=True))
+    op.add_column('campaigns', sa.Column('owner_lease_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('campaigns') as batch_op:
+        batch_op.drop_column('owner_lease_until')
+        batch_op.drop_column('owner')
@@ -7,11 +7,14 @@ from datetime import datetime, timedelta
 from app.core.database import get_db
 from app.schemas.agent import AgentActivityResponse, AgentStatus
 from app.models.agent import AgentActivity
+from app.models.rollup import AgentActivityRollup
+from app.services.metrics_rollups import hour_bucket
 from app.utils.logger import setup_logger
 
 router = APIRouter()
 logger = setup_logger(__name__)
 
+
 @router.get("/activity", response_model=List[AgentActivityResponse])
 async def get_agent_activity(
     campaign_id: Optional[int] = Query(None),
@@ -114,39 +117,73 @@ async def get_agent_stats(
     hours: int = Query(24, ge=1, le=168),  # Last N hours, max 1 week
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
-    """Get agent statistics"""
+    """Get agent statistics over the last ``hours`` hours.
+
+    Complete hours are read from the hourly rollups; the hour the window
+    starts in is only partly inside it, so its activities are counted from
+    the raw agent_activities rows.
+    """
     try:
         since = datetime.utcnow() - timedelta(hours=hours)
+        full_hours_since = hour_bucket(since)
+        if full_hours_since < since:
+            full_hours_since += timedelta(hours=1)
         
-        query = select(AgentActivity).where(AgentActivity.started_at >= since)
+        # One row per (agent, status), summed over the complete hours of the window
+        query = (
+            select(
+                AgentActivityRollup.agent_name,
+                AgentActivityRollup.status,
+                func.sum(AgentActivityRollup.activity_count),
+                func.sum(AgentActivityRollup.duration_sum),
+                func.sum(AgentActivityRollup.timed_count)
+            )
+            .where(AgentActivityRollup.hour >= full_hours_since)
+            .group_by(AgentActivityRollup.agent_name, AgentActivityRollup.status)
+        )
+        edge_query = (
+            select(
+                AgentActivity.agent_name,
+                AgentActivity.status,
+                AgentActivity.started_at,
+                AgentActivity.completed_at
+            )
+            .where(AgentActivity.started_at >= since, AgentActivity.started_at < full_hours_since)
+        )
         
         if campaign_id:
-            query = query.where(AgentActivity.campaign_id == campaign_id)
+            query = query.where(AgentActivityRollup.campaign_id == campaign_id)
+            edge_query = edge_query.where(AgentActivity.campaign_id == campaign_id)
             
-        result = await db.execute(query)
-        activities = result.scalars().all()
+        groups = [tuple(row) for row in (await db.execute(query)).all()]
+        
+        # Edge hour, summed the way the rollups are
+        edge_totals: Dict[tuple, List[float]] = {}
+        for agent_name, status, started_at, completed_at in (await db.execute(edge_query)).all():
+            total = edge_totals.setdefault((agent_name, status or ""), [0, 0.0, 0])
+            total[0] += 1
+            if completed_at:
+                total[1] += (completed_at - started_at).total_seconds()
+                total[2] += 1
+        groups.extend(key + tuple(total) for key, total in edge_totals.items())
         
-        # Calculate statistics
         stats = {
-            "total_activities": len(activities),
+            "total_activities": 0,
             "activities_by_agent": {},
             "activities_by_status": {},
             "average_task_duration": 0.0,
             "success_rate": 0.0
         }
         
-        # Group by agent
-        for activity in activities:
-            agent_name = activity.agent_name
-            if agent_name not in stats["activities_by_agent"]:
-                stats["activities_by_agent"][agent_name] = 0
-            stats["activities_by_agent"][agent_name] += 1
-            
-            # Group by status
-            status = activity.status
-            if status not in stats["activities_by_status"]:
-                stats["activities_by_status"][status] = 0
-            stats["activities_by_status"][status] += 1
+        completed_duration = 0.0
+        completed_timed = 0
+        for agent_name, status, count, duration_sum, timed in groups:
+            stats["total_activities"] += count
+            stats["activities_by_agent"][agent_name] = stats["activities_by_agent"].get(agent_name, 0) + count
+            stats["activities_by_status"][status] = stats["activities_by_status"].get(status, 0) + count
+            if status == "completed" and timed:
+                completed_duration += float(duration_sum or 0.0)
+                completed_timed += timed
         
         # Calculate success rate
         completed = stats["activities_by_status"].get("completed", 0)
@@ -156,15 +193,9 @@ async def get_agent_stats(
         if total_finished > 0:
             stats["success_rate"] = (completed / total_finished) * 100
         
-        # Calculate average duration for completed tasks
-        completed_activities = [a for a in activities 
-                             if a.status == "completed" and a.completed_at]
-        if completed_activities:
-            total_duration = sum(
-                (a.completed_at - a.started_at).total_seconds() 
-                for a in completed_activities
-            )
-            stats["average_task_duration"] = total_duration / len(completed_activities)
+        # Average duration of the completed tasks that recorded their end
+        if completed_timed:
+            stats["average_task_duration"] = completed_duration / completed_timed
         
         return stats
         
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import List, Optional
 from pydantic import ValidationError
 
@@ -9,9 +9,13 @@ from app.schemas.campaign import (
     CampaignCreate, CampaignUpdate, CampaignResponse, CampaignStats
 )
 from app.models.campaign import Campaign, CampaignStatus
-from app.models.prospect import Prospect
+from app.models.rollup import ProspectRollup
 from app.services.crewai_service import crewai_service
+from app.services.campaign_scheduler import CampaignAlreadyScheduledError, CampaignQueueFullError
+from app.services.prospect_enricher import enrich_campaign_prospects
+from app.services.metrics_rollups import campaign_stats_cache
 from app.utils.logger import setup_logger
+from src.ai_agent_crew.tools.cache import tool_cache
 
 router = APIRouter()
 logger = setup_logger(__name__)
@@ -104,16 +108,53 @@ async def start_campaign(
         if campaign.status == CampaignStatus.RUNNING:
             raise HTTPException(status_code=400, detail="Campaign is already running")
         
-        # Start the campaign
+        if campaign.status == CampaignStatus.QUEUED:
+            raise HTTPException(status_code=400, detail="Campaign is already queued")
+        
+        # Queue the campaign
         result = await crewai_service.start_campaign(campaign_id)
         return result
         
     except HTTPException:
         raise
+    except CampaignQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except CampaignAlreadyScheduledError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Error starting campaign {campaign_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/campaigns/{campaign_id}/resume")
+async def resume_campaign(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Resume a failed or cancelled campaign from its last completed crew task"""
+    try:
+        result = await db.execute(
+            select(Campaign.status).where(Campaign.id == campaign_id)
+        )
+        status = result.scalar_one_or_none()
+        
+        if status is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        
+        if status not in (CampaignStatus.FAILED, CampaignStatus.CANCELLED):
+            raise HTTPException(status_code=400, detail="Only failed or cancelled campaigns can be resumed")
+        
+        return await crewai_service.resume_campaign(campaign_id)
+        
+    except HTTPException:
+        raise
+    except CampaignQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except CampaignAlreadyScheduledError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error resuming campaign {campaign_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/campaigns/{campaign_id}/stop")
 async def stop_campaign(campaign_id: int):
     """Stop a running campaign"""
@@ -143,55 +184,62 @@ async def get_campaign_stats(
 ):
     """Get campaign statistics"""
     try:
-        # Check if campaign exists
+        cached = campaign_stats_cache.get(campaign_id)
+        if cached is not None:
+            return cached
+        
+        # One statement: the campaign's target joined with its (sector, status)
+        # rollups; a campaign without prospects gives one row of NULL rollup columns
         result = await db.execute(
-            select(Campaign).where(Campaign.id == campaign_id)
+            select(
+                Campaign.prospect_count,
+                ProspectRollup.sector,
+                ProspectRollup.status,
+                ProspectRollup.prospect_count,
+                ProspectRollup.quality_score_sum,
+                ProspectRollup.quality_score_count
+            )
+            .outerjoin(
+                ProspectRollup,
+                (ProspectRollup.campaign_id == Campaign.id) & (ProspectRollup.prospect_count > 0)
+            )
+            .where(Campaign.id == campaign_id)
         )
-        campaign = result.scalar_one_or_none()
+        rows = result.all()
         
-        if not campaign:
+        if not rows:
             raise HTTPException(status_code=404, detail="Campaign not found")
         
-        # Get prospect statistics
-        total_prospects_result = await db.execute(
-            select(func.count(Prospect.id)).where(Prospect.campaign_id == campaign_id)
-        )
-        total_prospects = total_prospects_result.scalar() or 0
-        
-        # Get prospects by status
-        status_result = await db.execute(
-            select(Prospect.status, func.count(Prospect.id))
-            .where(Prospect.campaign_id == campaign_id)
-            .group_by(Prospect.status)
-        )
-        prospects_by_status = dict(status_result.all())
-        
-        # Get prospects by sector
-        sector_result = await db.execute(
-            select(Prospect.sector, func.count(Prospect.id))
-            .where(Prospect.campaign_id == campaign_id)
-            .group_by(Prospect.sector)
-        )
-        prospects_by_sector = dict(sector_result.all())
-        
-        # Get average quality score
-        score_result = await db.execute(
-            select(func.avg(Prospect.quality_score)).where(Prospect.campaign_id == campaign_id)
-        )
-        avg_quality_score = score_result.scalar() or 0.0
+        target_count = rows[0][0]
+        total_prospects = 0
+        prospects_by_status = {}
+        prospects_by_sector = {}
+        score_sum = 0.0
+        scored = 0
+        for _, sector, status, count, quality_score_sum, quality_score_count in rows:
+            if count is None:
+                continue
+            total_prospects += count
+            prospects_by_status[status] = prospects_by_status.get(status, 0) + count
+            prospects_by_sector[sector] = prospects_by_sector.get(sector, 0) + count
+            score_sum += quality_score_sum
+            scored += quality_score_count
+        avg_quality_score = score_sum / scored if scored else 0.0
         
         # Calculate completion rate
         completion_rate = 0.0
-        if campaign.prospect_count > 0:
-            completion_rate = (total_prospects / campaign.prospect_count) * 100
+        if target_count and target_count > 0:
+            completion_rate = (total_prospects / target_count) * 100
         
-        return CampaignStats(
+        stats = CampaignStats(
             total_prospects=total_prospects,
             prospects_by_status=prospects_by_status,
             prospects_by_sector=prospects_by_sector,
             average_quality_score=float(avg_quality_score),
             completion_rate=min(completion_rate, 100.0)
         )
+        campaign_stats_cache.set(campaign_id, stats)
+        return stats
         
     except HTTPException:
         raise
@@ -199,6 +247,29 @@ async def get_campaign_stats(
         logger.error(f"Error getting stats for campaign {campaign_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/campaigns/{campaign_id}/enrich")
+async def enrich_campaign(
+    campaign_id: int,
+    overwrite: bool = Query(False, description="Replace contact fields that are already filled"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Re-enrich the contacts of a campaign's prospects in bulk, outside the crew"""
+    try:
+        result = await db.execute(
+            select(Campaign.id).where(Campaign.id == campaign_id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        
+        return await enrich_campaign_prospects(db, campaign_id, overwrite=overwrite)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error enriching prospects of campaign {campaign_id}: {str(e)}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/crew/info")
 async def get_crew_info():
     """Get CrewAI configuration information"""
@@ -208,6 +279,25 @@ async def get_crew_info():
         logger.error(f"Error getting crew info: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/tools/cache")
+async def get_tool_cache_stats():
+    """Get hit/miss counters of the crew tool result cache (API process)"""
+    try:
+        return tool_cache.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting tool cache stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/tools/cache")
+async def clear_tool_cache():
+    """Drop every cached tool result and reset the counters"""
+    try:
+        tool_cache.clear()
+        return {"message": "Tool cache cleared"}
+    except Exception as e:
+        logger.error(f"Error clearing tool cache: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/health")
 async def health_check():
     """API health check"""
@@ -6,6 +6,7 @@ from typing import List, Optional
 from app.core.database import get_db
 from app.schemas.prospect import ProspectResponse, ProspectUpdate
 from app.models.prospect import Prospect
+from app.services.metrics_rollups import move_prospect_rollups, prospect_rollup_values
 from app.utils.logger import setup_logger
 
 router = APIRouter()
@@ -82,10 +83,15 @@ async def update_prospect(
             raise HTTPException(status_code=404, detail="Prospect not found")
         
         # Update fields
+        before = prospect_rollup_values(prospect)
         update_data = prospect_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(prospect, field, value)
         
+        after = prospect_rollup_values(prospect)
+        if after != before:
+            await move_prospect_rollups(db, prospect.campaign_id, removed=[before], added=[after])
+        
         await db.commit()
         await db.refresh(prospect)
         
@@ -117,6 +123,7 @@ async def delete_prospect(
         await db.execute(
             delete(Prospect).where(Prospect.id == prospect_id)
         )
+        await move_prospect_rollups(db, prospect.campaign_id, removed=[prospect_rollup_values(prospect)])
         await db.commit()
         
         logger.info(f"Deleted prospect {prospect_id}")
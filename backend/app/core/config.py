@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 import secrets
 
 from pydantic import Field
@@ -35,9 +35,81 @@ class Settings(BaseSettings):
     # API Keys
     OPENAI_API_KEY: Optional[str] = None
     SERPER_API_KEY: Optional[str] = None
+    HUNTER_API_KEY: Optional[str] = None  # contact lookup fallback when set
+    HUNTER_API_URL: str = "https://api.hunter.io/v2"
 
     # CrewAI Config
     CREW_CONFIG_PATH: str = "src/ai_agent_crew/config"
+    CREW_STRUCTURED_OUTPUT: bool = True  # prospect tasks return JSON (CrewProspectList)
+    CREW_WARMUP_ON_STARTUP: bool = True  # thread backend: load CrewAI in the background at startup
+
+    # Business directory used by the search tools
+    BUSINESS_DIRECTORY_BACKEND: str = "memory"
+    BUSINESS_DIRECTORY_PATHS: List[str] = []  # CSV or JSONL files; built-in samples when empty
+    BUSINESS_SEARCH_PAGE_SIZE: int = 5
+    CONTACT_BATCH_CONCURRENCY: int = 8  # contact lookups in flight per batch
+
+    # HTTP client shared by the crew tools (enrichment APIs)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 10
+    HTTP_CLIENT_TIMEOUT: float = 10.0  # seconds
+    HTTP_CLIENT_PER_HOST_LIMIT: int = 4  # requests in flight per host
+    HTTP_CLIENT_MAX_RETRIES: int = 3
+    HTTP_CLIENT_BACKOFF_BASE: float = 0.5  # seconds, doubled per retry, jittered
+    HTTP_CLIENT_BACKOFF_MAX: float = 8.0
+    HTTP_PROVIDER_RATE_LIMITS: Dict[str, float] = {  # requests per second, by provider
+        "hunter": 10.0,
+        "clearbit": 10.0,
+        "apollo": 5.0,
+        "crunchbase": 3.0
+    }
+
+    # Crew tool result cache
+    TOOL_CACHE_BACKEND: str = "memory"  # "memory" or "sqlite"
+    TOOL_CACHE_PATH: str = "./db/tool_cache.db"
+    TOOL_CACHE_MAX_ENTRIES: int = 10_000
+    TOOL_CACHE_DEFAULT_TTL: float = 3600  # seconds, 0 disables caching
+    TOOL_CACHE_TTLS: Dict[str, float] = {
+        "Global Business Search": 86400,
+        "Global Contact Finder": 7 * 86400,
+        "Global Market Analysis": 86400
+    }
+
+    # Campaign execution
+    CAMPAIGN_MAX_WORKERS: int = 2
+    CAMPAIGN_QUEUE_MAX_SIZE: int = 100
+    CAMPAIGN_EXECUTION_BACKEND: str = "thread"  # "thread" or "process"
+    CAMPAIGN_PROCESS_MAX_TASKS_PER_CHILD: int = 5
+    CAMPAIGN_CANCEL_GRACE_SECONDS: float = 5.0
+    CAMPAIGN_QUEUE_BACKEND: str = "scheduler"  # "scheduler" (in the API), "inprocess", "sqlite" or "redis"
+    CAMPAIGN_QUEUE_PATH: str = "./db/campaign_queue.db"
+    CAMPAIGN_JOB_LEASE_SECONDS: float = 60.0  # a job is handed out again when its worker stops renewing it
+    CAMPAIGN_WORKER_POLL_SECONDS: float = 2.0
+    CAMPAIGN_RESUME_ON_STARTUP: bool = True  # requeue campaigns of dead API processes from their last finished task
+    CAMPAIGN_OWNER_LEASE_SECONDS: float = 60.0  # campaigns of an API process that stops renewing them are recovered
+
+    # Prospect ingestion
+    PROSPECT_INGEST_BATCH_SIZE: int = 25
+    PROSPECT_INSERT_CHUNK_SIZE: int = 500
+
+    # Campaign stats
+    CAMPAIGN_STATS_CACHE_SECONDS: float = 5.0  # 0 disables the cache
+
+    # Agent activity recording
+    ACTIVITY_BATCH_SIZE: int = 50  # activities per batched insert
+    ACTIVITY_FLUSH_SECONDS: float = 2.0  # buffered activities are written at least this often
+
+    # Result parsing
+    PARSER_PARALLEL_MIN_SIZE: int = 200_000  # characters; smaller results are parsed sequentially
+    PARSER_MAX_WORKERS: int = 4
+
+    # WebSocket monitoring
+    WEBSOCKET_SEND_TIMEOUT: float = 5.0  # seconds; slower clients are disconnected
+    WEBSOCKET_SEND_QUEUE_SIZE: int = 100  # messages waiting per client
+    WEBSOCKET_OVERFLOW_POLICY: str = "coalesce"  # "drop_oldest", "coalesce" or "disconnect"
+    WEBSOCKET_BACKPLANE: str = "memory"  # "memory" (one process), "redis" or "socket" (API workers of one box)
+    WEBSOCKET_BACKPLANE_CHANNEL: str = "websocket_events"
+    WEBSOCKET_BACKPLANE_SOCKET_DIR: str = "./db/ws_backplane"
 
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
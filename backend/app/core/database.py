@@ -25,7 +25,7 @@ async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         # Import all models to ensure they are registered
-        from app.models import campaign, prospect, agent, user
+        from app.models import campaign, prospect, agent, user, checkpoint, rollup
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
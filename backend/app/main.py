@@ -5,18 +5,55 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
 import json
 from datetime import datetime
+from typing import Optional
 
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.database import init_db
 from app.services.websocket_manager import manager
+from app.services.event_backplane import create_event_backplane
+from app.services.campaign_scheduler import campaign_scheduler
+from app.services.campaign_executor import campaign_executor
+from app.services.campaign_worker import create_campaign_worker
+from app.services.crewai_service import crewai_service
+from app.services.job_queue import job_queue
+from app.services.prospect_parser import shutdown_chunk_pool
 from app.utils.logger import setup_logger
+from src.ai_agent_crew.tools.directory import get_business_directory
+from src.ai_agent_crew.tools.http_client import http_client
 
 # Setup logging
 logger = setup_logger(__name__)
 
+async def relay_worker_events():
+    """Forward the progress sent by campaign workers to the WebSocket clients"""
+    while True:
+        try:
+            async for campaign_id, message in job_queue.events():
+                # Every API process reads the worker events: deliver to its
+                # own clients, without going through the backplane
+                manager.deliver(campaign_id, message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error relaying campaign worker events: {str(e)}")
+            await asyncio.sleep(1)
+
+async def maintain_campaign_leases():
+    """Keep the leases of this process' campaigns and recover those of dead processes"""
+    while True:
+        try:
+            await crewai_service.renew_campaign_leases()
+            await crewai_service.recover_interrupted_campaigns()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error maintaining campaign leases: {str(e)}")
+        await asyncio.sleep(settings.CAMPAIGN_OWNER_LEASE_SECONDS / 3)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -24,9 +61,49 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Agent Prospecting Platform...")
     await init_db()
     logger.info("Database initialized")
+    backplane = create_event_backplane()
+    if backplane is not None:
+        await manager.start_backplane(backplane)
+    campaign_scheduler.start()
+    worker = None
+    relay_task = None
+    lease_task = None
+    if job_queue is not None and job_queue.shared:
+        # Campaigns run in the campaign workers (python -m app.worker)
+        await job_queue.start()
+        relay_task = asyncio.create_task(relay_worker_events())
+    else:
+        await campaign_executor.start()
+        if job_queue is not None:
+            worker = create_campaign_worker(job_queue)
+            await worker.start()
+        # Campaigns left by API processes that are gone, now and whenever a
+        # sibling dies; workers of a shared queue pick theirs up again when
+        # their job lease expires
+        lease_task = asyncio.create_task(maintain_campaign_leases())
+    # Build the business directory index once, before the first search
+    await asyncio.to_thread(get_business_directory)
     yield
     # Shutdown
     logger.info("Shutting down...")
+    if worker is not None:
+        await worker.stop()
+    if relay_task is not None:
+        relay_task.cancel()
+        await asyncio.gather(relay_task, return_exceptions=True)
+    if lease_task is not None:
+        lease_task.cancel()
+        await asyncio.gather(lease_task, return_exceptions=True)
+    if job_queue is not None:
+        await job_queue.close()
+    await campaign_scheduler.shutdown()
+    if lease_task is not None:
+        # Campaigns cut short by the shutdown are recovered without waiting for their lease
+        await crewai_service.release_campaign_leases()
+    await manager.close_backplane()
+    await campaign_executor.shutdown()
+    shutdown_chunk_pool()
+    http_client.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -59,6 +136,43 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+async def handle_client_message(websocket: WebSocket, message: dict, campaign_id: Optional[int] = None):
+    """Answer a monitoring client's ping, subscribe and unsubscribe messages.
+
+    (Un)subscribe apply to the message's campaign_id, or to the campaign of
+    the endpoint; one socket can follow any number of campaigns.
+    """
+    message_type = message.get("type")
+    
+    if message_type == "ping":
+        await manager.send_to(websocket, {
+            "type": "pong",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    elif message_type in ("subscribe", "unsubscribe"):
+        try:
+            target_id = int(message.get("campaign_id", campaign_id))
+        except (TypeError, ValueError):
+            await manager.send_to(websocket, {
+                "type": "error",
+                "message": f"{message_type} needs a campaign_id",
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            return
+        
+        if message_type == "subscribe":
+            manager.subscribe(websocket, target_id)
+            text = f"Subscribed to campaign {target_id} updates"
+        else:
+            manager.unsubscribe(websocket, target_id)
+            text = f"Unsubscribed from campaign {target_id} updates"
+        await manager.send_to(websocket, {
+            "type": f"{message_type}d",
+            "campaign_id": target_id,
+            "message": text,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+
 # WebSocket endpoint for real-time monitoring
 @app.websocket("/ws/{campaign_id}")
 async def websocket_endpoint(websocket: WebSocket, campaign_id: int):
@@ -68,20 +182,7 @@ async def websocket_endpoint(websocket: WebSocket, campaign_id: int):
             # Keep connection alive and handle incoming messages
             data = await websocket.receive_text()
             message = json.loads(data)
-            
-            # Handle different message types
-            if message.get("type") == "ping":
-                await websocket.send_json({
-                    "type": "pong",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-            elif message.get("type") == "subscribe":
-                await websocket.send_json({
-                    "type": "subscribed",
-                    "campaign_id": campaign_id,
-                    "message": f"Subscribed to campaign {campaign_id} updates",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+            await handle_client_message(websocket, message, campaign_id)
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket, campaign_id)
@@ -95,12 +196,7 @@ async def global_websocket_endpoint(websocket: WebSocket):
         while True:
             data = await websocket.receive_text()
             message = json.loads(data)
-            
-            if message.get("type") == "ping":
-                await websocket.send_json({
-                    "type": "pong",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+            await handle_client_message(websocket, message)
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -114,6 +210,11 @@ async def root():
         "docs_url": "/docs" if settings.DEBUG else None
     }
 
+@app.get("/ws/stats")
+async def websocket_stats():
+    """WebSocket connections of this API process and subscribers per campaign"""
+    return manager.get_stats()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "version": settings.VERSION}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,6 +6,11 @@ from app.core.database import Base
 
 class AgentActivity(Base):
     __tablename__ = "agent_activities"
+    __table_args__ = (
+        # Time-window queries of the stats endpoints, for all campaigns or one
+        Index("ix_agent_activities_started_at", "started_at"),
+        Index("ix_agent_activities_campaign_started", "campaign_id", "started_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
@@ -7,6 +7,7 @@ from app.core.database import Base
 
 class CampaignStatus(str, Enum):
     PENDING = "pending"
+    QUEUED = "queued"
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
@@ -28,10 +29,18 @@ class Campaign(Base):
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
+    # API process whose scheduler holds the campaign, and until when it is
+    # known to be alive; renewed while the campaign is queued or running
+    owner = Column(String(100), nullable=True)
+    owner_lease_until = Column(DateTime, nullable=True)
+    
     # Configuration and results
     config = Column(JSON, default=dict)
     results_summary = Column(JSON, default=dict)
     
     # Relationships
     prospects = relationship("Prospect", back_populates="campaign", cascade="all, delete-orphan")
-    activities = relationship("AgentActivity", back_populates="campaign", cascade="all, delete-orphan")
\ No newline at end of file
+    activities = relationship("AgentActivity", back_populates="campaign", cascade="all, delete-orphan")
+    checkpoints = relationship("CampaignCheckpoint", back_populates="campaign", cascade="all, delete-orphan")
+    activity_rollups = relationship("AgentActivityRollup", back_populates="campaign", cascade="all, delete-orphan")
+    prospect_rollups = relationship("ProspectRollup", back_populates="campaign", cascade="all, delete-orphan")
\ No newline at end of file
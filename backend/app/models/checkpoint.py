@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.core.database import Base
+
+class CampaignCheckpoint(Base):
+    """Output of a finished crew task, used to resume an interrupted campaign"""
+    __tablename__ = "campaign_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "task_name", name="uq_campaign_checkpoints_task"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False, index=True)
+    
+    # Task key of tasks.yaml (market_research_task, ...)
+    task_name = Column(String(255), nullable=False)
+    output = Column(Text, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    campaign = relationship("Campaign", back_populates="checkpoints")
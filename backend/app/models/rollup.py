@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+class AgentActivityRollup(Base):
+    """Agent activity counts and durations by campaign, agent, hour and status.
+
+    Incremented with every batch of activities saved, so that the stats
+    endpoints never re-aggregate the raw agent_activities rows.
+    """
+    __tablename__ = "agent_activity_rollups"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "agent_name", "hour", "status", name="uq_agent_activity_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    agent_name = Column(String(100), nullable=False)
+    # started_at of the activities, truncated to the hour
+    hour = Column(DateTime, nullable=False, index=True)
+    status = Column(String(50), nullable=False)
+
+    activity_count = Column(Integer, nullable=False, default=0)
+    # Sum of completed_at - started_at, in seconds, over timed_count activities
+    duration_sum = Column(Float, nullable=False, default=0.0)
+    timed_count = Column(Integer, nullable=False, default=0)
+
+    # Relationships
+    campaign = relationship("Campaign", back_populates="activity_rollups")
+
+
+class ProspectRollup(Base):
+    """Prospect counts and quality scores by campaign, sector and status"""
+    __tablename__ = "prospect_rollups"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "sector", "status", name="uq_prospect_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    # Empty string for prospects without sector or status
+    sector = Column(String(100), nullable=False)
+    status = Column(String(50), nullable=False)
+
+    prospect_count = Column(Integer, nullable=False, default=0)
+    # Sum over the quality_score_count prospects that have a score
+    quality_score_sum = Column(Float, nullable=False, default=0.0)
+    quality_score_count = Column(Integer, nullable=False, default=0)
+
+    # Relationships
+    campaign = relationship("Campaign", back_populates="prospect_rollups")
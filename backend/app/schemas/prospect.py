@@ -1,6 +1,6 @@
 # app/schemas/prospect.py
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
@@ -25,6 +25,23 @@ class ProspectCreate(ProspectBase):
     extra_data: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
 
+class CrewProspect(ProspectBase):
+    """Prospect as returned by the crew's tasks in structured output mode.
+
+    Same fields as ``ProspectCreate`` minus the campaign, which the crew does
+    not know. Any additional key the agents return is kept in ``extra_data``.
+    """
+    quality_score: float = Field(default=5.0, ge=0.0, le=10.0)
+    extra_data: Dict[str, Any] = Field(default_factory=dict)
+
+    model_config = ConfigDict(extra="allow")
+
+
+class CrewProspectList(BaseModel):
+    """Structured output contract of the crew's prospect tasks"""
+    prospects: List[CrewProspect] = Field(default_factory=list)
+
+
 class ProspectUpdate(BaseModel):
     company_name: Optional[str] = None
     website: Optional[str] = None
@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import asyncio
+
+from sqlalchemy import insert
+
+from app.core.database import AsyncSessionLocal
+from app.models.agent import AgentActivity
+from app.services.metrics_rollups import add_activity_rollups
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Columns written for every activity; missing keys are sent as NULL so that
+# every row of a batch shares the same parameter set
+ACTIVITY_FIELDS = (
+    "agent_name", "agent_role", "task_name", "task_description", "status",
+    "message", "error_message", "started_at", "completed_at", "extra_data"
+)
+
+
+class ActivityRecorder:
+    """Saves the agent activities of a running campaign in batched inserts.
+
+    Activities arrive from the crew's thread (or the process relay) through
+    ``record_threadsafe`` and are buffered on the event loop; the buffer is
+    written with one multi-row INSERT once it holds ``batch_size``
+    activities or ``flush_interval`` seconds after the previous write, so
+    agent steps never cost a transaction each. The hourly activity rollups
+    are updated in the same transaction.
+    """
+
+    def __init__(self, campaign_id: int, batch_size: int = 50, flush_interval: float = 2.0):
+        self.campaign_id = campaign_id
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self.batches_written = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buffer: List[Dict[str, Any]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._full = asyncio.Event()
+        self._writer = asyncio.create_task(self._write())
+
+    def record_threadsafe(self, activity: Dict[str, Any]):
+        """Buffer an activity; safe to call from any thread"""
+        self._loop.call_soon_threadsafe(self.record, activity)
+
+    def record(self, activity: Dict[str, Any]):
+        """Buffer an activity from the event loop"""
+        row = {field: activity.get(field) for field in ACTIVITY_FIELDS}
+        row["campaign_id"] = self.campaign_id
+        row["started_at"] = row["started_at"] or datetime.utcnow()
+        row["extra_data"] = row["extra_data"] or {}
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def close(self):
+        """Write every buffered activity and stop"""
+        if self._writer is None:
+            return
+        self._closing = True
+        self._full.set()
+        await self._writer
+        self._writer = None
+
+    async def _write(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self._flush()
+        await self._flush()
+
+    async def _flush(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(AgentActivity), rows)
+                await add_activity_rollups(db, self.campaign_id, rows)
+                await db.commit()
+            self.recorded += len(rows)
+            self.batches_written += 1
+        except Exception as e:
+            logger.error(
+                f"Error saving {len(rows)} agent activities "
+                f"for campaign {self.campaign_id}: {str(e)}"
+            )
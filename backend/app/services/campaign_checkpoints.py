@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional
+from concurrent.futures import Future
+import asyncio
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.checkpoint import CampaignCheckpoint
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def load_checkpoints(campaign_id: int) -> Dict[str, str]:
+    """Outputs of the campaign's finished crew tasks, by task name, in completion order"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CampaignCheckpoint.task_name, CampaignCheckpoint.output)
+            .where(CampaignCheckpoint.campaign_id == campaign_id)
+            .order_by(CampaignCheckpoint.id)
+        )
+        return dict(result.all())
+
+
+async def clear_checkpoints(db: AsyncSession, campaign_id: int):
+    """Forget the finished tasks, so that the run starts from the first one; does not commit"""
+    await db.execute(
+        delete(CampaignCheckpoint).where(CampaignCheckpoint.campaign_id == campaign_id)
+    )
+
+
+class CheckpointRecorder:
+    """Saves each crew task output of a running campaign as soon as it finishes.
+
+    Outputs arrive from the crew's thread (or the process relay) through
+    ``submit_threadsafe``; each one is written in its own transaction so a
+    crash loses at most the task that was running.
+    """
+
+    def __init__(self, campaign_id: int):
+        self.campaign_id = campaign_id
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Future] = []
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+
+    def submit_threadsafe(self, task_name: str, output: str):
+        """Save a task output; safe to call from any thread"""
+        self._pending.append(
+            asyncio.run_coroutine_threadsafe(self._save(task_name, output), self._loop)
+        )
+
+    async def close(self):
+        """Wait until every submitted output has been saved"""
+        pending, self._pending = self._pending, []
+        await asyncio.gather(*(asyncio.wrap_future(future) for future in pending))
+
+    async def _save(self, task_name: str, output: str):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    delete(CampaignCheckpoint).where(
+                        CampaignCheckpoint.campaign_id == self.campaign_id,
+                        CampaignCheckpoint.task_name == task_name
+                    )
+                )
+                db.add(CampaignCheckpoint(
+                    campaign_id=self.campaign_id, task_name=task_name, output=output
+                ))
+                await db.commit()
+            logger.info(f"Checkpointed task '{task_name}' of campaign {self.campaign_id}")
+        except Exception as e:
+            logger.error(
+                f"Error checkpointing task '{task_name}' "
+                f"for campaign {self.campaign_id}: {str(e)}"
+            )
@@ -0,0 +1,482 @@
+from typing import Any, Callable, Dict, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import threading
+
+from app.core.config import settings
+from app.services.campaign_scheduler import campaign_scheduler
+from app.services.websocket_manager import manager
+from app.utils.logger import setup_logger
+from src.ai_agent_crew.cancellation import CancelToken, CampaignCancelledError
+
+logger = setup_logger(__name__)
+
+# Delay granted to a dead worker's last messages before its campaign is failed
+WORKER_EXIT_GRACE_SECONDS = 2.0
+
+# Receives (task_name, raw_output) for every finished crew task; must be thread-safe
+TaskOutputCallback = Callable[[str, str], None]
+
+# Receives every agent activity of the crew; must be thread-safe
+ActivityCallback = Callable[[Dict[str, Any]], None]
+
+
+class CampaignEventBridge:
+    """Hands crew progress events from the executor thread to the event loop.
+
+    ``emit_threadsafe`` only schedules a queue put on the loop, so the crew
+    never waits for a WebSocket send; a task on the loop drains the queue
+    and broadcasts the events in order.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._drainer = asyncio.create_task(self._drain())
+
+    def emit_threadsafe(self, campaign_id: Optional[int], message: dict):
+        """Queue an event; safe to call from any thread"""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (campaign_id, message))
+
+    async def close(self):
+        """Wait until every emitted event has been broadcast"""
+        if self._drainer is None:
+            return
+        self._queue.put_nowait(None)
+        await self._drainer
+        self._drainer = None
+
+    async def _drain(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            campaign_id, message = item
+            try:
+                if campaign_id:
+                    await manager.broadcast_to_campaign(campaign_id, message)
+                await manager.broadcast(message)
+            except Exception as e:
+                logger.error(f"Error broadcasting event for campaign {campaign_id}: {str(e)}")
+
+
+class ThreadCampaignExecutor:
+    """Runs crew kickoffs on the scheduler threads inside the API process.
+
+    ``thread_headroom`` is the number of pool threads beyond the scheduler's
+    workers, left for cancelled kickoffs that still run until their crew's
+    next step.
+    """
+
+    def __init__(self, thread_pool: ThreadPoolExecutor, thread_headroom: int):
+        self.thread_pool = thread_pool
+        self.thread_headroom = thread_headroom
+        self._tokens: Dict[int, CancelToken] = {}
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._kickoffs: Dict[int, Future] = {}
+        # Kickoffs cancelled while already on a thread, until that thread exits
+        self._lingering: Set[Future] = set()
+
+    @property
+    def lingering_count(self) -> int:
+        """Cancelled kickoffs still holding an executor thread"""
+        return len(self._lingering)
+
+    async def start(self):
+        if settings.CREW_WARMUP_ON_STARTUP:
+            # Load CrewAI and build the shared tools in the background: the
+            # API serves requests meanwhile, a campaign started early waits
+            # for the tools on the registry lock
+            from src.ai_agent_crew.registry import get_crew_registry
+            asyncio.get_running_loop().run_in_executor(None, get_crew_registry().warm_up)
+
+    async def shutdown(self):
+        pass
+
+    async def run(
+        self,
+        campaign_id: int,
+        inputs: Dict[str, Any],
+        on_task_output: Optional[TaskOutputCallback] = None,
+        completed_tasks: Optional[Dict[str, str]] = None,
+        on_activity: Optional[ActivityCallback] = None
+    ) -> str:
+        """Execute the crew for a campaign and return its raw result.
+
+        ``completed_tasks`` holds the outputs of the tasks finished by an
+        interrupted run, by task name; the crew starts after them.
+        """
+        # Imported here so that the process backend never loads CrewAI in the API
+        from src.ai_agent_crew.crew import ProspectingCrewManager
+
+        token = CancelToken()
+        events = CampaignEventBridge()
+        await events.start()
+        crew_manager = ProspectingCrewManager(
+            event_callback=events.emit_threadsafe,
+            campaign_id=campaign_id,
+            cancel_token=token,
+            task_output_callback=on_task_output,
+            structured_output=settings.CREW_STRUCTURED_OUTPUT,
+            completed_tasks=completed_tasks,
+            activity_callback=on_activity
+        )
+        if self.lingering_count >= self.thread_headroom:
+            logger.warning(
+                f"Campaign {campaign_id} waits for an executor thread: "
+                f"{self.lingering_count} cancelled campaigns are still winding down"
+            )
+        kickoff = self.thread_pool.submit(crew_manager.run_prospecting_campaign, inputs)
+        future = asyncio.wrap_future(kickoff)
+        self._tokens[campaign_id] = token
+        self._futures[campaign_id] = future
+        self._kickoffs[campaign_id] = kickoff
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # The future was abandoned by cancel(), not this task
+            if token.cancelled:
+                raise CampaignCancelledError(f"Campaign {campaign_id} was cancelled")
+            raise
+        finally:
+            self._tokens.pop(campaign_id, None)
+            self._futures.pop(campaign_id, None)
+            self._kickoffs.pop(campaign_id, None)
+            await events.close()
+
+    async def cancel(self, campaign_id: int) -> bool:
+        """Ask the crew to stop at its next step and release the caller now.
+
+        The executor thread winds down on its own at the crew's next step or
+        task boundary; the scheduler slot is freed immediately. Until then
+        the thread is counted in ``lingering_count``.
+        """
+        token = self._tokens.get(campaign_id)
+        if token is None:
+            return False
+        token.cancel()
+        kickoff = self._kickoffs[campaign_id]
+        if not kickoff.cancel():
+            # Already running: the set entry goes once the thread returns
+            self._lingering.add(kickoff)
+            kickoff.add_done_callback(self._lingering.discard)
+            logger.info(
+                f"Campaign {campaign_id} cancelled, its crew stops at the next step "
+                f"({self.lingering_count} executor threads winding down)"
+            )
+        self._futures[campaign_id].cancel()
+        return True
+
+
+def _campaign_worker_main(task_conn, event_queue, cancel_event, max_tasks: int):
+    """Entry point of a campaign worker process.
+
+    Receives ``(campaign_id, inputs, completed_tasks)`` jobs over
+    ``task_conn`` and reports progress events and results as
+    ``(kind, campaign_id, payload)`` tuples on ``event_queue``. ``cancel_event`` is set by the parent to stop the current
+    campaign. The process exits after ``max_tasks`` campaigns so that memory
+    held by CrewAI/embeddings is returned to the OS.
+    """
+    from src.ai_agent_crew.crew import ProspectingCrewManager
+    from src.ai_agent_crew.registry import get_crew_registry
+
+    # Tools are shared by every campaign this worker runs
+    get_crew_registry().warm_up()
+
+    for _ in range(max_tasks):
+        job = task_conn.recv()
+        if job is None:
+            return
+
+        campaign_id, inputs, completed_tasks = job
+
+        def relay(target_campaign_id: int, message: dict):
+            event_queue.put(("event", target_campaign_id, message))
+
+        def relay_task_output(task_name: str, output: str, campaign_id=campaign_id):
+            event_queue.put(("task_output", campaign_id, (task_name, output)))
+
+        def relay_activity(activity: dict, campaign_id=campaign_id):
+            event_queue.put(("activity", campaign_id, activity))
+
+        try:
+            crew_manager = ProspectingCrewManager(
+                event_callback=relay,
+                campaign_id=campaign_id,
+                cancel_token=CancelToken(cancel_event),
+                task_output_callback=relay_task_output,
+                structured_output=settings.CREW_STRUCTURED_OUTPUT,
+                completed_tasks=completed_tasks,
+                activity_callback=relay_activity
+            )
+            result = crew_manager.run_prospecting_campaign(inputs)
+            event_queue.put(("result", campaign_id, str(result)))
+        except CampaignCancelledError:
+            event_queue.put(("cancelled", campaign_id, None))
+        except Exception as e:
+            event_queue.put(("error", campaign_id, f"{type(e).__name__}: {e}"))
+
+
+class _WorkerSlot:
+    """One worker process of the campaign pool and its job pipe"""
+
+    def __init__(self, ctx, index: int, event_queue, max_tasks: int):
+        self.index = index
+        receiver, self.task_conn = ctx.Pipe(duplex=False)
+        self.cancel_event = ctx.Event()
+        self.process = ctx.Process(
+            target=_campaign_worker_main,
+            args=(receiver, event_queue, self.cancel_event, max_tasks),
+            name=f"campaign-worker-{index}",
+            daemon=True
+        )
+        self.process.start()
+        receiver.close()
+        self.completed = 0
+
+    def submit(self, campaign_id: int, inputs: Dict[str, Any], completed_tasks: Optional[Dict[str, str]] = None):
+        self.cancel_event.clear()
+        self.task_conn.send((campaign_id, inputs, completed_tasks))
+
+    def kill(self):
+        """Hard-kill the worker process"""
+        self.process.kill()
+        self.process.join()
+        self.task_conn.close()
+
+    def stop(self, timeout: float = 5.0):
+        try:
+            self.task_conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.task_conn.close()
+
+
+class ProcessCampaignExecutor:
+    """Runs crew kickoffs in a reusable pool of worker processes.
+
+    Keeps CrewAI's GIL-bound work (parsing, templating, embeddings) out of
+    the API process. Progress events come back over a multiprocessing queue
+    and are relayed to the ``ConnectionManager``; workers are recycled after
+    ``max_tasks_per_child`` campaigns.
+    """
+
+    def __init__(self, max_workers: int, max_tasks_per_child: int, cancel_grace_seconds: float):
+        self.max_workers = max(1, max_workers)
+        self.max_tasks_per_child = max(1, max_tasks_per_child)
+        self.cancel_grace_seconds = cancel_grace_seconds
+        self._ctx = multiprocessing.get_context("spawn")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event_queue = None
+        self._reader: Optional[threading.Thread] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: Dict[int, _WorkerSlot] = {}
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._acks: Dict[int, asyncio.Future] = {}
+        self._task_output_handlers: Dict[int, TaskOutputCallback] = {}
+        self._activity_handlers: Dict[int, ActivityCallback] = {}
+        self._next_index = 0
+
+    async def start(self):
+        """Spawn the worker processes and the event reader thread"""
+        if self._loop is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._event_queue = self._ctx.Queue()
+        self._idle = asyncio.Queue()
+
+        self._reader = threading.Thread(
+            target=self._read_events, name="campaign-events", daemon=True
+        )
+        self._reader.start()
+
+        for _ in range(self.max_workers):
+            self._idle.put_nowait(await self._spawn_slot())
+
+        logger.info(
+            f"Campaign process pool started with {self.max_workers} workers "
+            f"(recycled every {self.max_tasks_per_child} campaigns)"
+        )
+
+    async def shutdown(self):
+        """Stop the workers and the event reader"""
+        if self._loop is None:
+            return
+
+        slots = list(self._slots.values())
+        while not self._idle.empty():
+            slots.append(self._idle.get_nowait())
+        for slot in slots:
+            await asyncio.to_thread(slot.stop)
+
+        self._event_queue.put(None)
+        self._reader.join(timeout=5)
+        self._loop = None
+
+    async def run(
+        self,
+        campaign_id: int,
+        inputs: Dict[str, Any],
+        on_task_output: Optional[TaskOutputCallback] = None,
+        completed_tasks: Optional[Dict[str, str]] = None,
+        on_activity: Optional[ActivityCallback] = None
+    ) -> str:
+        """Execute the crew for a campaign in a worker process"""
+        await self.start()
+
+        slot: _WorkerSlot = await self._idle.get()
+        future = self._loop.create_future()
+        self._futures[campaign_id] = future
+        self._slots[campaign_id] = slot
+        if on_task_output:
+            self._task_output_handlers[campaign_id] = on_task_output
+        if on_activity:
+            self._activity_handlers[campaign_id] = on_activity
+
+        try:
+            slot.submit(campaign_id, inputs, completed_tasks)
+            return await self._wait_for_result(slot, future)
+        finally:
+            self._futures.pop(campaign_id, None)
+            self._slots.pop(campaign_id, None)
+            self._task_output_handlers.pop(campaign_id, None)
+            self._activity_handlers.pop(campaign_id, None)
+            if campaign_id in self._acks:
+                # Reclaiming a cancelled worker may take the grace period;
+                # do it in the background so the caller is released now.
+                asyncio.create_task(self._reclaim_cancelled_slot(campaign_id, slot))
+            else:
+                await self._release_slot(slot)
+
+    async def cancel(self, campaign_id: int) -> bool:
+        """Cancel a campaign running in a worker process.
+
+        The worker is asked to stop cooperatively at its next crew step; if
+        it has not acknowledged within ``cancel_grace_seconds`` it is killed
+        and replaced. The caller of ``run`` is released immediately.
+        """
+        slot = self._slots.get(campaign_id)
+        future = self._futures.get(campaign_id)
+        if slot is None or future is None or future.done():
+            return False
+
+        slot.cancel_event.set()
+        self._acks[campaign_id] = self._loop.create_future()
+        future.set_exception(CampaignCancelledError(f"Campaign {campaign_id} was cancelled"))
+        return True
+
+    async def _reclaim_cancelled_slot(self, campaign_id: int, slot: _WorkerSlot):
+        """Return a cancelled worker to the pool, hard-killing it if it does not stop"""
+        ack = self._acks[campaign_id]
+        await asyncio.wait({ack}, timeout=self.cancel_grace_seconds)
+        self._acks.pop(campaign_id, None)
+        if ack.done() and slot.process.is_alive():
+            await self._release_slot(slot)
+            return
+
+        logger.warning(f"Campaign worker {slot.index} did not stop in time, killing it")
+        await asyncio.to_thread(slot.kill)
+        self._idle.put_nowait(await self._spawn_slot())
+
+    async def _release_slot(self, slot: _WorkerSlot):
+        """Put a worker back in the pool, recycling it when it has served enough campaigns"""
+        slot.completed += 1
+        if slot.completed >= self.max_tasks_per_child or not slot.process.is_alive():
+            await asyncio.to_thread(slot.stop)
+            slot = await self._spawn_slot()
+        self._idle.put_nowait(slot)
+
+    async def _wait_for_result(self, slot: _WorkerSlot, future: asyncio.Future) -> str:
+        """Wait for the worker's answer, failing if the process dies first"""
+        while not future.done():
+            await asyncio.wait({future}, timeout=1.0)
+            if not future.done() and not slot.process.is_alive():
+                # Its last message may still be in flight on the queue
+                await asyncio.wait({future}, timeout=WORKER_EXIT_GRACE_SECONDS)
+                if not future.done():
+                    raise RuntimeError(
+                        f"Campaign worker {slot.index} exited with code {slot.process.exitcode}"
+                    )
+        return future.result()
+
+    async def _spawn_slot(self) -> _WorkerSlot:
+        index = self._next_index
+        self._next_index += 1
+        return await asyncio.to_thread(
+            _WorkerSlot, self._ctx, index, self._event_queue, self.max_tasks_per_child
+        )
+
+    def _read_events(self):
+        """Reader thread: forward worker messages to the event loop"""
+        while True:
+            item = self._event_queue.get()
+            if item is None:
+                return
+            kind, campaign_id, payload = item
+            self._loop.call_soon_threadsafe(self._dispatch, kind, campaign_id, payload)
+
+    def _dispatch(self, kind: str, campaign_id: int, payload: Any):
+        if kind == "event":
+            asyncio.create_task(self._relay_event(campaign_id, payload))
+            return
+
+        if kind == "task_output":
+            handler = self._task_output_handlers.get(campaign_id)
+            if handler:
+                handler(*payload)
+            return
+
+        if kind == "activity":
+            handler = self._activity_handlers.get(campaign_id)
+            if handler:
+                handler(payload)
+            return
+
+        # Any final message acknowledges a pending cancellation
+        ack = self._acks.get(campaign_id)
+        if ack is not None and not ack.done():
+            ack.set_result(kind)
+
+        future = self._futures.get(campaign_id)
+        if future is None or future.done():
+            return
+        if kind == "result":
+            future.set_result(payload)
+        elif kind == "cancelled":
+            future.set_exception(CampaignCancelledError(f"Campaign {campaign_id} was cancelled"))
+        else:
+            future.set_exception(RuntimeError(payload))
+
+    async def _relay_event(self, campaign_id: int, message: dict):
+        await manager.broadcast_to_campaign(campaign_id, message)
+        await manager.broadcast(message)
+
+
+def create_campaign_executor():
+    """Build the execution backend selected by CAMPAIGN_EXECUTION_BACKEND"""
+    backend = settings.CAMPAIGN_EXECUTION_BACKEND.lower()
+    if backend == "process":
+        return ProcessCampaignExecutor(
+            max_workers=settings.CAMPAIGN_MAX_WORKERS,
+            max_tasks_per_child=settings.CAMPAIGN_PROCESS_MAX_TASKS_PER_CHILD,
+            cancel_grace_seconds=settings.CAMPAIGN_CANCEL_GRACE_SECONDS
+        )
+    if backend != "thread":
+        logger.warning(f"Unknown campaign execution backend '{backend}', using threads")
+    return ThreadCampaignExecutor(campaign_scheduler.executor, campaign_scheduler.thread_headroom)
+
+
+# Global executor instance
+campaign_executor = create_campaign_executor()
@@ -0,0 +1,180 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+import asyncio
+import itertools
+
+from app.core.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CampaignQueueFullError(Exception):
+    """Raised when the pending campaign queue has reached its capacity"""
+
+
+class CampaignAlreadyScheduledError(ValueError):
+    """Raised when a campaign is submitted while it is still queued or running"""
+
+
+@dataclass(order=True)
+class QueuedCampaign:
+    """Entry of the pending campaign queue, ordered by priority then FIFO"""
+    sort_key: int
+    sequence: int
+    campaign_id: int = field(compare=False)
+    job: Callable[[], Awaitable[None]] = field(compare=False)
+    priority: int = field(compare=False, default=0)
+    enqueued_at: datetime = field(compare=False, default_factory=datetime.utcnow)
+    cancelled: bool = field(compare=False, default=False)
+
+
+class CampaignScheduler:
+    """Bounded pool of campaign workers fed by a priority queue.
+
+    At most ``max_workers`` campaigns execute at the same time, each one on a
+    dedicated executor thread; the others wait in the queue (higher priority
+    first, FIFO within the same priority). Once ``max_queue_size`` campaigns
+    are pending, new submissions are rejected instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(1, max_queue_size)
+        # Each running campaign holds one executor thread. A cancelled kickoff
+        # frees its worker slot at once but keeps its thread until the crew's
+        # next step checks the cancel token, so the pool has as many threads
+        # again for kickoffs winding down. Once that headroom is used up, new
+        # kickoffs wait for a thread (ThreadCampaignExecutor warns about it).
+        self.thread_headroom = self.max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers + self.thread_headroom,
+            thread_name_prefix="campaign"
+        )
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Dict[int, QueuedCampaign] = {}
+        self._running: Set[int] = set()
+        self._sequence = itertools.count()
+
+    def start(self):
+        """Start the worker tasks (must be called from the running event loop)"""
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.max_workers)
+        ]
+        logger.info(f"Campaign scheduler started with {self.max_workers} workers")
+
+    async def shutdown(self):
+        """Stop the workers and release the executor threads"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(
+        self,
+        campaign_id: int,
+        job: Callable[[], Awaitable[None]],
+        priority: int = 0
+    ) -> int:
+        """Queue a campaign job and return its 1-based position in the queue"""
+        if campaign_id in self._pending or campaign_id in self._running:
+            raise CampaignAlreadyScheduledError(f"Campaign {campaign_id} is already scheduled")
+
+        if len(self._pending) >= self.max_queue_size:
+            raise CampaignQueueFullError(
+                f"Campaign queue is full ({self.max_queue_size} pending campaigns)"
+            )
+
+        self.start()
+
+        entry = QueuedCampaign(
+            sort_key=-priority,
+            sequence=next(self._sequence),
+            campaign_id=campaign_id,
+            job=job,
+            priority=priority
+        )
+        self._pending[campaign_id] = entry
+        await self._queue.put(entry)
+
+        position = self.get_position(campaign_id)
+        logger.info(f"Campaign {campaign_id} queued at position {position} (priority {priority})")
+        return position
+
+    def remove(self, campaign_id: int) -> bool:
+        """Drop a pending campaign from the queue; returns False if it is not pending"""
+        entry = self._pending.pop(campaign_id, None)
+        if entry is None:
+            return False
+        # The entry stays in the heap and is skipped once a worker pops it
+        entry.cancelled = True
+        return True
+
+    def is_queued(self, campaign_id: int) -> bool:
+        return campaign_id in self._pending
+
+    def is_running(self, campaign_id: int) -> bool:
+        return campaign_id in self._running
+
+    def get_position(self, campaign_id: int) -> Optional[int]:
+        """1-based position of a pending campaign, None if it is not queued"""
+        entry = self._pending.get(campaign_id)
+        if entry is None:
+            return None
+        return 1 + sum(1 for other in self._pending.values() if other < entry)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self.queue_depth,
+            "running": self.running_count,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size
+        }
+
+    async def _worker(self, index: int):
+        """Pop queued campaigns and run them one at a time"""
+        while True:
+            entry: QueuedCampaign = await self._queue.get()
+            if entry.cancelled:
+                # Left in the heap by remove(); the campaign may have been
+                # resubmitted since, so its running state is not touched
+                self._queue.task_done()
+                continue
+
+            try:
+                self._pending.pop(entry.campaign_id, None)
+                self._running.add(entry.campaign_id)
+                logger.info(f"Worker {index} picked up campaign {entry.campaign_id}")
+                await entry.job()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {index} failed running campaign {entry.campaign_id}: {str(e)}")
+            finally:
+                self._running.discard(entry.campaign_id)
+                self._queue.task_done()
+
+
+# Global scheduler instance
+campaign_scheduler = CampaignScheduler(
+    max_workers=settings.CAMPAIGN_MAX_WORKERS,
+    max_queue_size=settings.CAMPAIGN_QUEUE_MAX_SIZE
+)
@@ -0,0 +1,109 @@
+from typing import List, Optional
+import asyncio
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.campaign import Campaign, CampaignStatus
+from app.services.crewai_service import crewai_service
+from app.services.job_queue import CampaignJob, JobQueue
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Seconds a consumer waits for a job before polling again
+DEQUEUE_TIMEOUT_SECONDS = 5.0
+
+
+class CampaignWorker:
+    """Consumes campaign jobs from the job queue and runs them.
+
+    Up to ``concurrency`` campaigns run at the same time through
+    ``crewai_service``, on the configured execution backend. While a
+    campaign runs, its lease is renewed and its status is polled every
+    ``poll_seconds``: a stop request made through the API marks it
+    cancelled, and the worker then stops the crew. A job is acknowledged
+    once its run is over; a worker stopped mid-run leaves it to another
+    worker when the lease expires.
+    """
+
+    def __init__(self, queue: JobQueue, concurrency: int, poll_seconds: float = 2.0):
+        self.queue = queue
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self._consumers: List[asyncio.Task] = []
+
+    async def start(self):
+        if self._consumers:
+            return
+        await self.queue.start()
+        self._consumers = [
+            asyncio.create_task(self._consume(index))
+            for index in range(self.concurrency)
+        ]
+        logger.info(f"Campaign worker started with {self.concurrency} consumers")
+
+    async def stop(self):
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+    async def _consume(self, index: int):
+        while True:
+            try:
+                job = await self.queue.dequeue(timeout=DEQUEUE_TIMEOUT_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Consumer {index} failed to read the campaign queue: {str(e)}")
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            if job is None:
+                continue
+
+            logger.info(f"Consumer {index} picked up campaign {job.campaign_id} (attempt {job.attempts})")
+            await self._run(job)
+
+    async def _run(self, job: CampaignJob):
+        watcher = asyncio.create_task(self._watch(job))
+        try:
+            await crewai_service.run_queued_campaign(job)
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+        # Not reached when the worker is stopped mid-run: the job is handed
+        # out again once its lease expires
+        await self.queue.ack(job)
+
+    async def _watch(self, job: CampaignJob):
+        """Renew the job's lease and stop the crew once the campaign is cancelled"""
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.queue.heartbeat(job)
+                status = await self._campaign_status(job.campaign_id)
+            except Exception as e:
+                logger.error(f"Error watching campaign {job.campaign_id}: {str(e)}")
+                continue
+
+            if status == CampaignStatus.CANCELLED:
+                logger.info(f"Campaign {job.campaign_id} was cancelled, stopping its crew")
+                await crewai_service.cancel_execution(job.campaign_id)
+                return
+
+    async def _campaign_status(self, campaign_id: int) -> Optional[CampaignStatus]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Campaign.status).where(Campaign.id == campaign_id))
+            return result.scalar_one_or_none()
+
+
+def create_campaign_worker(queue: JobQueue) -> CampaignWorker:
+    """Worker consuming ``queue`` with the application settings"""
+    return CampaignWorker(
+        queue,
+        concurrency=settings.CAMPAIGN_MAX_WORKERS,
+        poll_seconds=settings.CAMPAIGN_WORKER_POLL_SECONDS
+    )
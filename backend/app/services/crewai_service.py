@@ -1,34 +1,51 @@
-from typing import Dict, Any, Optional
-import asyncio
-from datetime import datetime
+from typing import Dict, Any, Optional, Set
+from datetime import datetime, timedelta
 import traceback
-import sys
 import os
+import socket
+import sys
+import uuid
 from pathlib import Path
 
 # Add src to path for CrewAI imports
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.ai_agent_crew.crew import ProspectingCrewManager
 from app.models.campaign import Campaign, CampaignStatus
-from app.models.prospect import Prospect
-from app.models.agent import AgentActivity
 from app.services.websocket_manager import manager
 from app.services.prospect_parser import ProspectParser
+from app.services.campaign_scheduler import (
+    campaign_scheduler, CampaignAlreadyScheduledError, CampaignQueueFullError
+)
+from app.services.campaign_executor import campaign_executor
+from app.services.prospect_ingestor import ProspectIngestor, bulk_insert_prospects
+from app.services.job_queue import CampaignJob, job_queue
+from app.services.campaign_checkpoints import CheckpointRecorder, clear_checkpoints, load_checkpoints
+from app.services.activity_recorder import ActivityRecorder
+from src.ai_agent_crew.cancellation import CampaignCancelledError
+from src.ai_agent_crew.registry import get_crew_registry
 from app.core.database import AsyncSessionLocal
+from app.core.config import settings
 from app.utils.logger import setup_logger
 from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = setup_logger(__name__)
 
+# Owner recorded on the campaigns scheduled by this API process
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+ACTIVE_STATUSES = [CampaignStatus.QUEUED, CampaignStatus.RUNNING]
+
 class CrewAIService:
     def __init__(self):
-        self.running_campaigns: Dict[int, ProspectingCrewManager] = {}
+        self.running_campaigns: Set[int] = set()
+        # Stop requests that arrived before the crew was handed to the executor
+        self._cancel_requested: Set[int] = set()
         self.prospect_parser = ProspectParser()
     
     async def start_campaign(self, campaign_id: int) -> Dict[str, Any]:
-        """Start a prospecting campaign"""
+        """Queue a prospecting campaign on the campaign scheduler"""
         try:
             async with AsyncSessionLocal() as db:
                 # Get campaign details
@@ -47,70 +64,250 @@ class CrewAIService:
                         "message": "Campaign is already running"
                     }
                 
-                # Prepare inputs for CrewAI
-                inputs = {
-                    'product': campaign.product_description,
-                    'current_year': str(datetime.now().year),
-                    'target_location': campaign.target_location,
-                    'target_sectors': campaign.target_sectors or [],
-                    'prospect_count': campaign.prospect_count
-                }
-                
-                # Update campaign status
-                await db.execute(
-                    update(Campaign)
-                    .where(Campaign.id == campaign_id)
-                    .values(
-                        status=CampaignStatus.RUNNING,
-                        started_at=datetime.utcnow()
-                    )
-                )
-                await db.commit()
+                if campaign.status == CampaignStatus.QUEUED:
+                    return {
+                        "campaign_id": campaign_id,
+                        "status": "already_queued",
+                        "message": "Campaign is already queued",
+                        "queue_position": await self._queue_position(campaign_id)
+                    }
                 
-                # Create crew manager with WebSocket callback
-                crew_manager = ProspectingCrewManager(
-                    websocket_callback=manager.broadcast_to_campaign,
-                    campaign_id=campaign_id
-                )
-                self.running_campaigns[campaign_id] = crew_manager
+                return await self._queue_campaign(db, campaign)
                 
-                # Run campaign in background
-                asyncio.create_task(
-                    self._run_campaign_background(campaign_id, crew_manager, inputs)
+        except CampaignQueueFullError:
+            logger.warning(f"Campaign {campaign_id} rejected: queue is full")
+            raise
+        except CampaignAlreadyScheduledError:
+            # Still queued or running (e.g. restarted right after a stop): not a failure
+            logger.warning(f"Campaign {campaign_id} rejected: already scheduled")
+            raise
+        except Exception as e:
+            logger.error(f"Error starting campaign {campaign_id}: {str(e)}")
+            await self._mark_campaign_failed(campaign_id, str(e))
+            raise
+    
+    async def resume_campaign(self, campaign_id: int) -> Dict[str, Any]:
+        """Queue an interrupted campaign again, from its last checkpointed task"""
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Campaign).where(Campaign.id == campaign_id)
                 )
+                campaign = result.scalar_one_or_none()
                 
-                # Notify via WebSocket (both global and campaign-specific)
-                message = {
-                    "type": "campaign_status",
-                    "campaign_id": campaign_id,
-                    "status": "started",
-                    "message": "Campaign started successfully",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                await manager.broadcast_to_campaign(campaign_id, message)
-                await manager.broadcast(message)  # Also send globally
-                
-                logger.info(f"Campaign {campaign_id} started successfully")
+                if not campaign:
+                    raise ValueError(f"Campaign {campaign_id} not found")
                 
-                return {
-                    "campaign_id": campaign_id,
-                    "status": "started",
-                    "message": "Campaign started successfully"
-                }
+                return await self._queue_campaign(db, campaign, resume=True)
                 
+        except (CampaignQueueFullError, CampaignAlreadyScheduledError) as e:
+            logger.warning(f"Campaign {campaign_id} rejected: {str(e)}")
+            raise
         except Exception as e:
-            logger.error(f"Error starting campaign {campaign_id}: {str(e)}")
-            await self._mark_campaign_failed(campaign_id, str(e))
+            logger.error(f"Error resuming campaign {campaign_id}: {str(e)}")
+            raise
+    
+    async def renew_campaign_leases(self):
+        """Extend the owner lease of the campaigns this process has queued or running"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.owner == PROCESS_OWNER, Campaign.status.in_(ACTIVE_STATUSES))
+                .values(owner_lease_until=self._lease_end())
+            )
+            await db.commit()
+    
+    async def release_campaign_leases(self):
+        """Let other processes recover this process' campaigns right away (on shutdown)"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.owner == PROCESS_OWNER, Campaign.status.in_(ACTIVE_STATUSES))
+                .values(owner_lease_until=datetime.utcnow())
+            )
+            await db.commit()
+    
+    async def recover_interrupted_campaigns(self) -> int:
+        """Deal with the campaigns of API processes that are gone.
+
+        A campaign queued or running whose owner stopped renewing its lease
+        lost its scheduler queue and crew with that process: the first
+        process to take over its lease queues it again, resuming from its
+        last checkpointed task, or marks it failed when
+        CAMPAIGN_RESUME_ON_STARTUP is off. Campaigns of live sibling API
+        processes are left alone.
+        """
+        now = datetime.utcnow()
+        expired = Campaign.status.in_(ACTIVE_STATUSES) & (
+            Campaign.owner_lease_until.is_(None) | (Campaign.owner_lease_until < now)
+        )
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Campaign.id).where(expired))
+            candidates = result.scalars().all()
+            
+            # Taken over one by one: only one process wins each campaign
+            campaign_ids = []
+            for campaign_id in candidates:
+                if campaign_id in self.running_campaigns or campaign_scheduler.is_queued(campaign_id):
+                    # Ours, only late renewing its lease
+                    continue
+                taken = await db.execute(
+                    update(Campaign)
+                    .where(Campaign.id == campaign_id, expired)
+                    .values(owner=PROCESS_OWNER, owner_lease_until=self._lease_end())
+                )
+                if taken.rowcount:
+                    campaign_ids.append(campaign_id)
+            await db.commit()
+        
+        for campaign_id in campaign_ids:
+            if not settings.CAMPAIGN_RESUME_ON_STARTUP:
+                await self._mark_campaign_failed(campaign_id, "Interrupted by a server restart")
+                continue
+            try:
+                await self.resume_campaign(campaign_id)
+            except Exception as e:
+                await self._mark_campaign_failed(campaign_id, f"Could not resume after a server restart: {str(e)}")
+        
+        if campaign_ids:
+            logger.info(f"Recovered {len(campaign_ids)} interrupted campaigns")
+        return len(campaign_ids)
+    
+    def _lease_end(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=settings.CAMPAIGN_OWNER_LEASE_SECONDS)
+    
+    async def _queue_campaign(self, db: AsyncSession, campaign: Campaign, resume: bool = False) -> Dict[str, Any]:
+        """Mark a campaign queued and hand it to the scheduler or the job queue.
+
+        Unless it resumes, the campaign goes through every task again: its
+        checkpoints are dropped when the run claims it, so they survive a
+        start that could not be queued.
+        """
+        campaign_id = campaign.id
+        # The run itself skips every checkpointed task; listed here for the caller
+        completed_tasks = list(await load_checkpoints(campaign_id)) if resume else []
+        queued_message = (
+            f"Campaign queued to resume after {len(completed_tasks)} completed tasks"
+            if completed_tasks else "Campaign queued for execution"
+        )
+        
+        # Prepare inputs for CrewAI
+        inputs = {
+            'product': campaign.product_description,
+            'current_year': str(datetime.now().year),
+            'target_location': campaign.target_location,
+            'target_sectors': campaign.target_sectors or [],
+            'prospect_count': campaign.prospect_count
+        }
+        priority = int((campaign.config or {}).get("priority", 0))
+        previous_status = campaign.status
+        
+        # Update campaign status before a worker can claim it. Campaigns run
+        # by this process are leased to it; shared queue jobs have their own
+        if job_queue is not None and job_queue.shared:
+            owner, lease_until = None, None
+        else:
+            owner, lease_until = PROCESS_OWNER, self._lease_end()
+        await db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(status=CampaignStatus.QUEUED, owner=owner, owner_lease_until=lease_until)
+        )
+        await db.commit()
+        
+        try:
+            if job_queue is not None:
+                # Picked up by a campaign worker (app.worker)
+                queue_position = await job_queue.enqueue(
+                    CampaignJob(campaign_id, inputs, priority=priority, restart=not resume)
+                )
+            else:
+                queue_position = await campaign_scheduler.submit(
+                    campaign_id,
+                    lambda: self._run_campaign_background(campaign_id, inputs, restart=not resume),
+                    priority=priority
+                )
+        except (CampaignQueueFullError, CampaignAlreadyScheduledError):
+            # Leave the campaign as it was so it can be started later
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(status=previous_status)
+            )
+            await db.commit()
             raise
+        
+        # Notify via WebSocket (both global and campaign-specific)
+        message = {
+            "type": "campaign_status",
+            "campaign_id": campaign_id,
+            "status": "queued",
+            "queue_position": queue_position,
+            "message": queued_message,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        await manager.broadcast_to_campaign(campaign_id, message)
+        await manager.broadcast(message)  # Also send globally
+        
+        logger.info(f"Campaign {campaign_id} queued at position {queue_position}")
+        
+        return {
+            "campaign_id": campaign_id,
+            "status": "queued",
+            "queue_position": queue_position,
+            "queue_depth": await self._queue_depth(),
+            "completed_tasks": completed_tasks,
+            "message": queued_message
+        }
+    
+    async def _queue_position(self, campaign_id: int) -> Optional[int]:
+        if job_queue is not None:
+            return await job_queue.position(campaign_id)
+        return campaign_scheduler.get_position(campaign_id)
+    
+    async def _queue_depth(self) -> int:
+        if job_queue is not None:
+            return await job_queue.depth()
+        return campaign_scheduler.queue_depth
+    
+    async def run_queued_campaign(self, job: CampaignJob):
+        """Run a campaign taken from the job queue by a campaign worker"""
+        await self._run_campaign_background(
+            job.campaign_id, job.inputs, redelivered=job.attempts > 1, restart=job.restart
+        )
     
     async def _run_campaign_background(
         self, 
         campaign_id: int, 
-        crew_manager: ProspectingCrewManager, 
-        inputs: Dict[str, Any]
+        inputs: Dict[str, Any],
+        redelivered: bool = False,
+        restart: bool = False
     ):
-        """Run campaign in background"""
+        """Run campaign once a scheduler worker picks it up"""
+        # Registered before the first await so a stop request always finds it
+        self.running_campaigns.add(campaign_id)
         try:
+            # Claim the campaign; a stop request while it was queued wins.
+            # A job handed out again after its worker was lost finds it running.
+            claim = (
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(status=CampaignStatus.RUNNING, started_at=datetime.utcnow())
+            )
+            async with AsyncSessionLocal() as db:
+                claimed = await db.execute(claim.where(Campaign.status == CampaignStatus.QUEUED))
+                if claimed.rowcount and restart:
+                    # Same transaction as the claim: a redelivered job finds
+                    # them cleared only if its first run got this far
+                    await clear_checkpoints(db, campaign_id)
+                elif not claimed.rowcount and redelivered:
+                    claimed = await db.execute(claim.where(Campaign.status == CampaignStatus.RUNNING))
+                await db.commit()
+            
+            if claimed.rowcount == 0:
+                logger.info(f"Campaign {campaign_id} is no longer queued, skipping execution")
+                return
+            
             logger.info(f"Starting background execution for campaign {campaign_id}")
             
             # Notify start of execution
@@ -124,19 +321,68 @@ class CrewAIService:
             await manager.broadcast_to_campaign(campaign_id, message)
             await manager.broadcast(message)
             
-            # Execute the crew
-            result = await asyncio.get_event_loop().run_in_executor(
-                None, crew_manager.run_prospecting_campaign, inputs
+            if campaign_id in self._cancel_requested:
+                raise CampaignCancelledError(f"Campaign {campaign_id} was cancelled")
+            
+            # Tasks finished before an interruption are not run again
+            completed_tasks = await load_checkpoints(campaign_id)
+            crew_task_names = list(get_crew_registry().tasks_config)
+            if completed_tasks:
+                logger.info(f"Resuming campaign {campaign_id} after tasks {', '.join(completed_tasks)}")
+            
+            # Prospects are saved task by task while the crew runs
+            ingestor = ProspectIngestor(
+                campaign_id,
+                self.prospect_parser,
+                batch_size=settings.PROSPECT_INGEST_BATCH_SIZE
             )
+            checkpoints = CheckpointRecorder(campaign_id)
+            activities = ActivityRecorder(
+                campaign_id,
+                batch_size=settings.ACTIVITY_BATCH_SIZE,
+                flush_interval=settings.ACTIVITY_FLUSH_SECONDS
+            )
+            await ingestor.start()
+            await checkpoints.start()
+            await activities.start()
+            
+            def on_task_output(task_name: str, output: str):
+                checkpoints.submit_threadsafe(task_name, output)
+                ingestor.submit_threadsafe(task_name, output)
             
-            # Process and save results
-            await self._process_campaign_results(campaign_id, result)
+            try:
+                if all(name in completed_tasks for name in crew_task_names):
+                    # Interrupted after its last task, before being marked completed
+                    result = completed_tasks[crew_task_names[-1]]
+                else:
+                    # Execute the crew on the configured backend (threads or worker processes)
+                    result = await campaign_executor.run(
+                        campaign_id,
+                        inputs,
+                        on_task_output=on_task_output,
+                        completed_tasks=completed_tasks,
+                        on_activity=activities.record_threadsafe
+                    )
+            finally:
+                await ingestor.close()
+                await checkpoints.close()
+                await activities.close()
+            
+            # On resume, the prospects of the completed tasks are already saved
+            if ingestor.batches_written or (completed_tasks and ingestor.prospects_count):
+                await self._record_results_summary(campaign_id, ingestor.prospects_count)
+            else:
+                # Nothing usable was streamed: parse the final output with all strategies
+                await self._process_campaign_results(campaign_id, result)
             
-            # Update campaign status to completed
+            # Update campaign status to completed, unless it was stopped meanwhile
             async with AsyncSessionLocal() as db:
-                await db.execute(
+                completed = await db.execute(
                     update(Campaign)
-                    .where(Campaign.id == campaign_id)
+                    .where(
+                        Campaign.id == campaign_id,
+                        Campaign.status == CampaignStatus.RUNNING
+                    )
                     .values(
                         status=CampaignStatus.COMPLETED,
                         completed_at=datetime.utcnow()
@@ -144,6 +390,10 @@ class CrewAIService:
                 )
                 await db.commit()
             
+            if completed.rowcount == 0:
+                logger.info(f"Campaign {campaign_id} finished after being stopped, keeping its status")
+                return
+            
             # Notify completion
             message = {
                 "type": "campaign_status",
@@ -157,6 +407,9 @@ class CrewAIService:
             
             logger.info(f"Campaign {campaign_id} completed successfully")
             
+        except CampaignCancelledError:
+            logger.info(f"Campaign {campaign_id} execution stopped after cancellation")
+            
         except Exception as e:
             logger.error(f"Campaign {campaign_id} failed: {str(e)}")
             logger.error(traceback.format_exc())
@@ -164,8 +417,8 @@ class CrewAIService:
             
         finally:
             # Cleanup
-            if campaign_id in self.running_campaigns:
-                del self.running_campaigns[campaign_id]
+            self.running_campaigns.discard(campaign_id)
+            self._cancel_requested.discard(campaign_id)
     
     async def _mark_campaign_failed(self, campaign_id: int, error_message: str):
         """Mark campaign as failed"""
@@ -173,7 +426,10 @@ class CrewAIService:
             async with AsyncSessionLocal() as db:
                 await db.execute(
                     update(Campaign)
-                    .where(Campaign.id == campaign_id)
+                    .where(
+                        Campaign.id == campaign_id,
+                        Campaign.status != CampaignStatus.CANCELLED
+                    )
                     .values(
                         status=CampaignStatus.FAILED,
                         completed_at=datetime.utcnow(),
@@ -200,50 +456,69 @@ class CrewAIService:
             # Parse prospects from the result
             prospects_data = await self.prospect_parser.parse_crewai_result(result)
             
+            # Prospects and results summary are written in a single transaction
             async with AsyncSessionLocal() as db:
-                saved_prospects = []
-                
-                for prospect_data in prospects_data:
-                    prospect = Prospect(
-                        campaign_id=campaign_id,
-                        **prospect_data
-                    )
-                    db.add(prospect)
-                    saved_prospects.append(prospect)
-                
-                await db.commit()
-                
-                # Update campaign results summary
-                await db.execute(
-                    update(Campaign)
-                    .where(Campaign.id == campaign_id)
-                    .values(
-                        results_summary={
-                            "prospects_found": len(saved_prospects),
-                            "processing_completed": True,
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-                    )
+                prospect_ids = await bulk_insert_prospects(
+                    db,
+                    campaign_id,
+                    prospects_data,
+                    chunk_size=settings.PROSPECT_INSERT_CHUNK_SIZE
                 )
+                await db.execute(self._results_summary_update(campaign_id, len(prospect_ids)))
                 await db.commit()
-                
-                logger.info(f"Processed {len(saved_prospects)} prospects for campaign {campaign_id}")
-                
-                # Notify results processed
-                await manager.broadcast_to_campaign(campaign_id, {
-                    "type": "results_processed",
-                    "campaign_id": campaign_id,
-                    "prospects_count": len(saved_prospects),
-                    "message": f"Found and saved {len(saved_prospects)} prospects",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+            
+            await self._notify_results_processed(campaign_id, len(prospect_ids))
                 
         except Exception as e:
             logger.error(f"Error processing results for campaign {campaign_id}: {str(e)}")
     
+    def _results_summary_update(self, campaign_id: int, prospects_count: int):
+        """UPDATE statement storing the campaign results summary"""
+        return (
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(
+                results_summary={
+                    "prospects_found": prospects_count,
+                    "processing_completed": True,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+            )
+        )
+    
+    async def _record_results_summary(self, campaign_id: int, prospects_count: int):
+        """Store the campaign results summary and notify clients"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(self._results_summary_update(campaign_id, prospects_count))
+            await db.commit()
+        
+        await self._notify_results_processed(campaign_id, prospects_count)
+    
+    async def _notify_results_processed(self, campaign_id: int, prospects_count: int):
+        logger.info(f"Processed {prospects_count} prospects for campaign {campaign_id}")
+        
+        await manager.broadcast_to_campaign(campaign_id, {
+            "type": "results_processed",
+            "campaign_id": campaign_id,
+            "prospects_count": prospects_count,
+            "message": f"Found and saved {prospects_count} prospects",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    
     async def stop_campaign(self, campaign_id: int) -> Dict[str, Any]:
-        """Stop a running campaign"""
+        """Stop a queued or running campaign"""
         try:
+            if job_queue is not None:
+                return await self._stop_queued_job(campaign_id)
+            
+            if campaign_scheduler.remove(campaign_id):
+                await self._mark_campaign_cancelled(campaign_id)
+                return {
+                    "campaign_id": campaign_id,
+                    "status": "cancelled",
+                    "message": "Queued campaign removed from the queue"
+                }
+            
             if campaign_id not in self.running_campaigns:
                 return {
                     "campaign_id": campaign_id,
@@ -251,29 +526,16 @@ class CrewAIService:
                     "message": "Campaign is not currently running"
                 }
             
-            # Remove from running campaigns
-            del self.running_campaigns[campaign_id]
-            
-            # Update database status
-            async with AsyncSessionLocal() as db:
-                await db.execute(
-                    update(Campaign)
-                    .where(Campaign.id == campaign_id)
-                    .values(
-                        status=CampaignStatus.CANCELLED,
-                        completed_at=datetime.utcnow()
-                    )
-                )
-                await db.commit()
+            # Record the cancellation first so the run cannot complete over it
+            if not await self._mark_campaign_cancelled(campaign_id):
+                return {
+                    "campaign_id": campaign_id,
+                    "status": "not_running",
+                    "message": "Campaign already finished"
+                }
             
-            # Notify via WebSocket
-            await manager.broadcast_to_campaign(campaign_id, {
-                "type": "campaign_status",
-                "campaign_id": campaign_id,
-                "status": "cancelled",
-                "message": "Campaign was cancelled",
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            # Stop the crew and free its execution slot right away
+            await self.cancel_execution(campaign_id)
             
             return {
                 "campaign_id": campaign_id,
@@ -285,6 +547,62 @@ class CrewAIService:
             logger.error(f"Error stopping campaign {campaign_id}: {str(e)}")
             raise
     
+    async def _stop_queued_job(self, campaign_id: int) -> Dict[str, Any]:
+        """Stop a campaign dispatched through the job queue"""
+        removed = await job_queue.remove(campaign_id)
+        
+        # The worker running it sees the cancelled status and stops its crew
+        if not await self._mark_campaign_cancelled(campaign_id):
+            return {
+                "campaign_id": campaign_id,
+                "status": "not_running",
+                "message": "Campaign is not currently running"
+            }
+        
+        return {
+            "campaign_id": campaign_id,
+            "status": "cancelled",
+            "message": "Queued campaign removed from the queue" if removed else "Campaign stopped successfully"
+        }
+    
+    async def cancel_execution(self, campaign_id: int):
+        """Stop the crew of a campaign running in this process and free its slot"""
+        if campaign_id not in self.running_campaigns:
+            return
+        self.running_campaigns.discard(campaign_id)
+        if not await campaign_executor.cancel(campaign_id):
+            # Not handed to the executor yet; checked right before kickoff
+            self._cancel_requested.add(campaign_id)
+    
+    async def _mark_campaign_cancelled(self, campaign_id: int) -> bool:
+        """Mark a queued or running campaign as cancelled and notify clients"""
+        async with AsyncSessionLocal() as db:
+            cancelled = await db.execute(
+                update(Campaign)
+                .where(
+                    Campaign.id == campaign_id,
+                    Campaign.status.in_([CampaignStatus.QUEUED, CampaignStatus.RUNNING])
+                )
+                .values(
+                    status=CampaignStatus.CANCELLED,
+                    completed_at=datetime.utcnow()
+                )
+            )
+            await db.commit()
+        
+        if cancelled.rowcount == 0:
+            return False
+        
+        # Notify via WebSocket
+        await manager.broadcast_to_campaign(campaign_id, {
+            "type": "campaign_status",
+            "campaign_id": campaign_id,
+            "status": "cancelled",
+            "message": "Campaign was cancelled",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        return True
+    
     async def get_campaign_status(self, campaign_id: int) -> Dict[str, Any]:
         """Get current status of a campaign"""
         try:
@@ -297,12 +615,20 @@ class CrewAIService:
                 if not campaign:
                     return {"status": "not_found", "campaign_id": campaign_id}
                 
-                is_running = campaign_id in self.running_campaigns
+                if job_queue is not None:
+                    # Runs in a campaign worker, possibly on another box
+                    is_running = campaign.status == CampaignStatus.RUNNING
+                else:
+                    is_running = campaign_id in self.running_campaigns
                 
                 return {
                     "campaign_id": campaign_id,
                     "status": campaign.status.value,
                     "is_running": is_running,
+                    "queue_position": await self._queue_position(campaign_id),
+                    "queue_depth": await self._queue_depth(),
+                    "running_campaigns": campaign_scheduler.running_count,
+                    "max_concurrent_campaigns": campaign_scheduler.max_workers,
                     "created_at": campaign.created_at.isoformat() if campaign.created_at else None,
                     "started_at": campaign.started_at.isoformat() if campaign.started_at else None,
                     "completed_at": campaign.completed_at.isoformat() if campaign.completed_at else None,
@@ -316,8 +642,8 @@ class CrewAIService:
     def get_crew_info(self) -> Dict[str, Any]:
         """Get information about CrewAI configuration"""
         try:
-            crew_manager = ProspectingCrewManager()
-            return crew_manager.get_crew_info()
+            # Served from the registry, without building a crew
+            return get_crew_registry().get_crew_info()
         except Exception as e:
             logger.error(f"Error getting crew info: {str(e)}")
             return {"error": str(e)}
@@ -0,0 +1,204 @@
+from typing import Any, Callable, Dict, List, Optional
+from abc import ABC, abstractmethod
+from pathlib import Path
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+
+from app.core.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Receives (campaign_id or None for global, message) published by another process
+DeliverCallback = Callable[[Optional[int], Dict[str, Any]], None]
+
+
+class EventBackplane(ABC):
+    """Carries WebSocket broadcasts between the processes serving clients.
+
+    Each process fans messages out to its own clients; the backplane only
+    forwards what a process broadcasts to the other processes, which then
+    fan it out locally. Messages never come back to their publisher.
+    """
+
+    def __init__(self):
+        # Identifies this process' messages on shared channels
+        self.origin = uuid.uuid4().hex
+        self._deliver: Optional[DeliverCallback] = None
+
+    async def start(self, deliver: DeliverCallback):
+        self._deliver = deliver
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        """Forward a broadcast of this process to the other processes"""
+
+    def _encode(self, campaign_id: Optional[int], message: Dict[str, Any]) -> str:
+        return json.dumps(
+            {"origin": self.origin, "campaign_id": campaign_id, "message": message}, default=str
+        )
+
+    def _receive(self, payload) -> None:
+        try:
+            event = json.loads(payload)
+            if event.get("origin") == self.origin:
+                return
+            self._deliver(event.get("campaign_id"), event["message"])
+        except Exception as e:
+            logger.error(f"Error delivering backplane message: {str(e)}")
+
+
+class MemoryBackplane(EventBackplane):
+    """Backplane between the managers of a single process (one API worker, tests)"""
+
+    _members: List["MemoryBackplane"] = []
+
+    async def start(self, deliver: DeliverCallback):
+        await super().start(deliver)
+        self._members.append(self)
+
+    async def close(self):
+        if self in self._members:
+            self._members.remove(self)
+
+    async def publish(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        for member in self._members:
+            if member is not self:
+                member._deliver(campaign_id, message)
+
+
+class RedisBackplane(EventBackplane):
+    """Backplane over a Redis pub/sub channel, for API workers on one or several boxes"""
+
+    def __init__(self, url: str, channel: str = "websocket_events"):
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: DeliverCallback):
+        await super().start(deliver)
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.url)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        await self._redis.publish(self.channel, self._encode(campaign_id, message))
+
+    async def _listen(self):
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        self._receive(item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket backplane lost its Redis subscription: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+class LocalSocketBackplane(EventBackplane):
+    """Backplane over Unix datagram sockets, for API workers of one box, without a broker.
+
+    Each process binds a socket in ``directory`` and publishes by sending
+    a datagram to every other socket found there; sockets left behind by
+    dead processes are removed. Messages larger than the system datagram
+    limit (about 200 KB on Linux) are not forwarded.
+    """
+
+    # Seconds between two scans of the directory for peers
+    PEER_REFRESH_SECONDS = 1.0
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = Path(directory)
+        self.path = self.directory / f"{os.getpid()}-{self.origin[:8]}.sock"
+        self._sock: Optional[socket.socket] = None
+        self._peers: List[str] = []
+        self._peers_at = 0.0
+
+    async def start(self, deliver: DeliverCallback):
+        await super().start(deliver)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(str(self.path))
+        self._sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
+
+    async def close(self):
+        if self._sock is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self.path.unlink(missing_ok=True)
+
+    def _on_readable(self):
+        while True:
+            try:
+                payload = self._sock.recv(1 << 20)
+            except (BlockingIOError, InterruptedError):
+                return
+            self._receive(payload)
+
+    def _current_peers(self) -> List[str]:
+        now = time.monotonic()
+        if now - self._peers_at >= self.PEER_REFRESH_SECONDS:
+            own = str(self.path)
+            self._peers = [
+                entry.path for entry in os.scandir(self.directory)
+                if entry.name.endswith(".sock") and entry.path != own
+            ]
+            self._peers_at = now
+        return self._peers
+
+    async def publish(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        payload = self._encode(campaign_id, message).encode()
+        for peer in self._current_peers():
+            try:
+                self._sock.sendto(payload, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Socket of a process that is gone
+                Path(peer).unlink(missing_ok=True)
+                self._peers_at = 0.0
+            except BlockingIOError:
+                logger.warning(f"WebSocket backplane peer {peer} is not reading, message dropped")
+            except OSError as e:
+                logger.error(f"Error publishing to backplane peer {peer}: {str(e)}")
+
+
+def create_event_backplane() -> Optional[EventBackplane]:
+    """Backplane selected by WEBSOCKET_BACKPLANE, None when this process serves every client"""
+    backend = settings.WEBSOCKET_BACKPLANE.lower()
+    if backend == "memory":
+        return MemoryBackplane()
+    if backend == "redis":
+        return RedisBackplane(settings.REDIS_URL, settings.WEBSOCKET_BACKPLANE_CHANNEL)
+    if backend == "socket":
+        return LocalSocketBackplane(settings.WEBSOCKET_BACKPLANE_SOCKET_DIR)
+    if backend != "none":
+        logger.warning(f"Unknown WebSocket backplane '{backend}', broadcasting to local clients only")
+    return None
@@ -0,0 +1,531 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import asyncio
+import heapq
+import itertools
+import json
+import sqlite3
+import threading
+import time
+
+from app.core.config import settings
+from app.services.campaign_scheduler import CampaignAlreadyScheduledError, CampaignQueueFullError
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (campaign_id, message) relayed to the API's WebSocket clients; campaign_id
+# is None for global broadcasts
+JobEvent = Tuple[Optional[int], Dict[str, Any]]
+
+
+@dataclass
+class CampaignJob:
+    """A campaign waiting for, or claimed by, a worker"""
+    campaign_id: int
+    inputs: Dict[str, Any]
+    priority: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    # Deliveries so far; above 1 the previous worker was lost mid-run
+    attempts: int = 0
+    # New run: the checkpoints of a previous run are dropped when it starts
+    restart: bool = False
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "CampaignJob":
+        return cls(**json.loads(payload))
+
+
+class JobQueue(ABC):
+    """Campaign jobs from the API to the workers, progress events back.
+
+    Jobs are handed out by priority, then in FIFO order. A claimed job is
+    leased to its worker for ``lease_seconds`` and the worker renews the
+    lease with ``heartbeat`` while it runs. A job whose lease expires,
+    because its worker was killed or its box restarted, is handed out
+    again.
+    """
+
+    # Whether workers in other processes can consume the queue
+    shared = True
+
+    def __init__(self, max_size: int, lease_seconds: float):
+        self.max_size = max(1, max_size)
+        self.lease_seconds = lease_seconds
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def enqueue(self, job: CampaignJob) -> int:
+        """Queue a job and return its 1-based position"""
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> Optional[CampaignJob]:
+        """Claim the next job, waiting up to ``timeout`` seconds for one"""
+
+    @abstractmethod
+    async def heartbeat(self, job: CampaignJob):
+        """Renew the lease of a claimed job"""
+
+    @abstractmethod
+    async def ack(self, job: CampaignJob):
+        """Drop a job once its worker is done with it"""
+
+    @abstractmethod
+    async def remove(self, campaign_id: int) -> bool:
+        """Drop a pending job; returns False if it is not pending"""
+
+    @abstractmethod
+    async def position(self, campaign_id: int) -> Optional[int]:
+        """1-based position of a pending job, None if it is not pending"""
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """Number of pending jobs"""
+
+    @abstractmethod
+    async def publish_event(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        """Relay a progress event to the API processes"""
+
+    @abstractmethod
+    def events(self) -> AsyncIterator[JobEvent]:
+        """Events published by the workers, from now on"""
+
+    def _check_capacity(self, depth: int):
+        if depth >= self.max_size:
+            raise CampaignQueueFullError(f"Campaign queue is full ({self.max_size} pending campaigns)")
+
+
+class InProcessJobQueue(JobQueue):
+    """Jobs kept in memory, consumed by a worker embedded in the API process"""
+
+    shared = False
+
+    def __init__(self, max_size: int, lease_seconds: float):
+        super().__init__(max_size, lease_seconds)
+        self._heap: List[list] = []
+        self._pending: Dict[int, list] = {}
+        self._running: Dict[int, Tuple[CampaignJob, float]] = {}
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._events: asyncio.Queue = asyncio.Queue()
+
+    async def enqueue(self, job: CampaignJob) -> int:
+        if job.campaign_id in self._pending or job.campaign_id in self._running:
+            raise CampaignAlreadyScheduledError(f"Campaign {job.campaign_id} is already scheduled")
+        self._check_capacity(len(self._pending))
+
+        entry = [-job.priority, next(self._sequence), job]
+        self._pending[job.campaign_id] = entry
+        heapq.heappush(self._heap, entry)
+        self._wakeup.set()
+        return await self.position(job.campaign_id)
+
+    def _requeue_expired(self):
+        now = time.monotonic()
+        for campaign_id, (job, lease_until) in list(self._running.items()):
+            if lease_until < now:
+                del self._running[campaign_id]
+                entry = [-job.priority, next(self._sequence), job]
+                self._pending[campaign_id] = entry
+                heapq.heappush(self._heap, entry)
+
+    async def dequeue(self, timeout: float) -> Optional[CampaignJob]:
+        deadline = time.monotonic() + timeout
+        while True:
+            self._requeue_expired()
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                job: CampaignJob = entry[2]
+                # Entries of removed jobs stay in the heap and are skipped here
+                if self._pending.get(job.campaign_id) is not entry:
+                    continue
+                del self._pending[job.campaign_id]
+                job.attempts += 1
+                self._running[job.campaign_id] = (job, time.monotonic() + self.lease_seconds)
+                return job
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), min(remaining, self.lease_seconds))
+            except asyncio.TimeoutError:
+                pass
+
+    async def heartbeat(self, job: CampaignJob):
+        if job.campaign_id in self._running:
+            self._running[job.campaign_id] = (job, time.monotonic() + self.lease_seconds)
+
+    async def ack(self, job: CampaignJob):
+        self._running.pop(job.campaign_id, None)
+
+    async def remove(self, campaign_id: int) -> bool:
+        return self._pending.pop(campaign_id, None) is not None
+
+    async def position(self, campaign_id: int) -> Optional[int]:
+        entry = self._pending.get(campaign_id)
+        if entry is None:
+            return None
+        return 1 + sum(1 for other in self._pending.values() if other < entry)
+
+    async def depth(self) -> int:
+        return len(self._pending)
+
+    async def publish_event(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        self._events.put_nowait((campaign_id, message))
+
+    async def events(self) -> AsyncIterator[JobEvent]:
+        while True:
+            yield await self._events.get()
+
+
+class SQLiteJobQueue(JobQueue):
+    """Jobs and events in a local SQLite file shared by the API and the workers of one box"""
+
+    # Seconds an event is kept for the API to read it
+    EVENT_RETENTION_SECONDS = 300
+
+    def __init__(self, path: str, max_size: int, lease_seconds: float, poll_interval: float = 0.2):
+        super().__init__(max_size, lease_seconds)
+        self.path = path
+        self.poll_interval = poll_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS campaign_jobs ("
+                "campaign_id INTEGER PRIMARY KEY, payload TEXT NOT NULL, "
+                "priority INTEGER NOT NULL, enqueued_at REAL NOT NULL, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, lease_until REAL);"
+                "CREATE INDEX IF NOT EXISTS ix_campaign_jobs_order "
+                "ON campaign_jobs (status, priority DESC, enqueued_at);"
+                "CREATE TABLE IF NOT EXISTS campaign_events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, campaign_id INTEGER, "
+                "message TEXT NOT NULL, created_at REAL NOT NULL);"
+            )
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    async def _run(self, func, *args):
+        return await asyncio.to_thread(func, *args)
+
+    def _open(self):
+        with self._lock:
+            self._connect()
+
+    async def start(self):
+        await self._run(self._open)
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _enqueue(self, job: CampaignJob) -> int:
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM campaign_jobs WHERE campaign_id = ?", (job.campaign_id,)).fetchone():
+                raise CampaignAlreadyScheduledError(f"Campaign {job.campaign_id} is already scheduled")
+            self._check_capacity(conn.execute(
+                "SELECT COUNT(*) FROM campaign_jobs WHERE status = 'pending'"
+            ).fetchone()[0])
+            conn.execute(
+                "INSERT INTO campaign_jobs (campaign_id, payload, priority, enqueued_at, status) "
+                "VALUES (?, ?, ?, ?, 'pending')",
+                (job.campaign_id, job.to_json(), job.priority, job.enqueued_at)
+            )
+            return self._position(conn, job.campaign_id)
+
+    async def enqueue(self, job: CampaignJob) -> int:
+        return await self._run(self._enqueue, job)
+
+    def _claim(self) -> Optional[CampaignJob]:
+        now = time.time()
+        with self._transaction() as conn:
+            # Jobs of lost workers are handed out again, ahead of newer ones
+            conn.execute(
+                "UPDATE campaign_jobs SET status = 'pending' WHERE status = 'running' AND lease_until < ?",
+                (now,)
+            )
+            row = conn.execute(
+                "SELECT campaign_id, payload, attempts FROM campaign_jobs WHERE status = 'pending' "
+                "ORDER BY priority DESC, enqueued_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE campaign_jobs SET status = 'running', attempts = attempts + 1, lease_until = ? "
+                "WHERE campaign_id = ?",
+                (now + self.lease_seconds, row[0])
+            )
+        job = CampaignJob.from_json(row[1])
+        job.attempts = row[2] + 1
+        return job
+
+    async def dequeue(self, timeout: float) -> Optional[CampaignJob]:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self._run(self._claim)
+            remaining = deadline - time.monotonic()
+            if job is not None or remaining <= 0:
+                return job
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._transaction() as conn:
+            return conn.execute(sql, params).rowcount
+
+    async def heartbeat(self, job: CampaignJob):
+        await self._run(
+            self._execute,
+            "UPDATE campaign_jobs SET lease_until = ? WHERE campaign_id = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job.campaign_id)
+        )
+
+    async def ack(self, job: CampaignJob):
+        await self._run(self._execute, "DELETE FROM campaign_jobs WHERE campaign_id = ?", (job.campaign_id,))
+
+    async def remove(self, campaign_id: int) -> bool:
+        return await self._run(
+            self._execute,
+            "DELETE FROM campaign_jobs WHERE campaign_id = ? AND status = 'pending'",
+            (campaign_id,)
+        ) > 0
+
+    def _position(self, conn: sqlite3.Connection, campaign_id: int) -> Optional[int]:
+        row = conn.execute(
+            "SELECT priority, enqueued_at FROM campaign_jobs WHERE campaign_id = ? AND status = 'pending'",
+            (campaign_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        ahead = conn.execute(
+            "SELECT COUNT(*) FROM campaign_jobs WHERE status = 'pending' "
+            "AND (priority > ? OR (priority = ? AND enqueued_at < ?))",
+            (row[0], row[0], row[1])
+        ).fetchone()[0]
+        return 1 + ahead
+
+    async def position(self, campaign_id: int) -> Optional[int]:
+        def read():
+            with self._transaction() as conn:
+                return self._position(conn, campaign_id)
+        return await self._run(read)
+
+    async def depth(self) -> int:
+        def read():
+            with self._transaction() as conn:
+                return conn.execute("SELECT COUNT(*) FROM campaign_jobs WHERE status = 'pending'").fetchone()[0]
+        return await self._run(read)
+
+    async def publish_event(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        await self._run(
+            self._execute,
+            "INSERT INTO campaign_events (campaign_id, message, created_at) VALUES (?, ?, ?)",
+            (campaign_id, json.dumps(message, default=str), time.time())
+        )
+
+    def _last_event_id(self) -> int:
+        with self._transaction() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM campaign_events").fetchone()[0]
+
+    def _read_events(self, after_id: int) -> List[tuple]:
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM campaign_events WHERE created_at < ?",
+                (time.time() - self.EVENT_RETENTION_SECONDS,)
+            )
+            return conn.execute(
+                "SELECT id, campaign_id, message FROM campaign_events WHERE id > ? ORDER BY id LIMIT 500",
+                (after_id,)
+            ).fetchall()
+
+    async def events(self) -> AsyncIterator[JobEvent]:
+        # Start after the events already in the table
+        last_id = await self._run(self._last_event_id)
+        while True:
+            rows = await self._run(self._read_events, last_id)
+            for event_id, campaign_id, message in rows:
+                last_id = event_id
+                yield campaign_id, json.loads(message)
+            if not rows:
+                await asyncio.sleep(self.poll_interval)
+
+
+# Moves the jobs of expired leases back to the pending set, keeping their
+# original score so they are handed out first
+REQUEUE_EXPIRED_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[2], id)
+    local payload = redis.call('HGET', KEYS[3], id)
+    if payload then
+        redis.call('ZADD', KEYS[1], cjson.decode(payload)['score'], id)
+    end
+end
+return #ids
+"""
+
+# Pops the best pending job and leases it in one step
+CLAIM_SCRIPT = """
+local item = redis.call('ZPOPMIN', KEYS[1])
+if #item == 0 then
+    return nil
+end
+redis.call('ZADD', KEYS[2], ARGV[1], item[1])
+return redis.call('HGET', KEYS[3], item[1])
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """Jobs and events in Redis, for workers spread over several boxes"""
+
+    def __init__(self, url: str, max_size: int, lease_seconds: float, prefix: str = "campaign_queue",
+                 poll_interval: float = 0.5):
+        super().__init__(max_size, lease_seconds)
+        self.url = url
+        self.poll_interval = poll_interval
+        self.pending_key = f"{prefix}:pending"
+        self.running_key = f"{prefix}:running"
+        self.jobs_key = f"{prefix}:jobs"
+        self.events_channel = f"{prefix}:events"
+        self._redis = None
+
+    async def start(self):
+        if self._redis is None:
+            # Only this backend needs the redis client
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.url, decode_responses=True)
+            self._requeue_expired = self._redis.register_script(REQUEUE_EXPIRED_SCRIPT)
+            self._claim = self._redis.register_script(CLAIM_SCRIPT)
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    @staticmethod
+    def _score(job: CampaignJob) -> float:
+        # Higher priority first, then oldest first
+        return -job.priority * 1e10 + job.enqueued_at
+
+    async def enqueue(self, job: CampaignJob) -> int:
+        await self.start()
+        self._check_capacity(await self._redis.zcard(self.pending_key))
+        payload = {**json.loads(job.to_json()), "score": self._score(job)}
+        if not await self._redis.hsetnx(self.jobs_key, job.campaign_id, json.dumps(payload)):
+            raise CampaignAlreadyScheduledError(f"Campaign {job.campaign_id} is already scheduled")
+        await self._redis.zadd(self.pending_key, {job.campaign_id: payload["score"]})
+        return await self.position(job.campaign_id)
+
+    async def dequeue(self, timeout: float) -> Optional[CampaignJob]:
+        await self.start()
+        keys = [self.pending_key, self.running_key, self.jobs_key]
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.time()
+            await self._requeue_expired(keys=keys, args=[now])
+            payload = await self._claim(keys=keys, args=[now + self.lease_seconds])
+            if payload is not None:
+                data = json.loads(payload)
+                data["attempts"] += 1
+                await self._redis.hset(self.jobs_key, data["campaign_id"], json.dumps(data))
+                data.pop("score")
+                return CampaignJob(**data)
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+    async def heartbeat(self, job: CampaignJob):
+        await self._redis.zadd(self.running_key, {job.campaign_id: time.time() + self.lease_seconds}, xx=True)
+
+    async def ack(self, job: CampaignJob):
+        async with self._redis.pipeline(transaction=True) as pipe:
+            await pipe.zrem(self.running_key, job.campaign_id).hdel(self.jobs_key, job.campaign_id).execute()
+
+    async def remove(self, campaign_id: int) -> bool:
+        await self.start()
+        if not await self._redis.zrem(self.pending_key, campaign_id):
+            return False
+        await self._redis.hdel(self.jobs_key, campaign_id)
+        return True
+
+    async def position(self, campaign_id: int) -> Optional[int]:
+        await self.start()
+        rank = await self._redis.zrank(self.pending_key, campaign_id)
+        return None if rank is None else rank + 1
+
+    async def depth(self) -> int:
+        await self.start()
+        return await self._redis.zcard(self.pending_key)
+
+    async def publish_event(self, campaign_id: Optional[int], message: Dict[str, Any]):
+        await self.start()
+        await self._redis.publish(
+            self.events_channel, json.dumps({"campaign_id": campaign_id, "message": message}, default=str)
+        )
+
+    async def events(self) -> AsyncIterator[JobEvent]:
+        await self.start()
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self.events_channel)
+        try:
+            async for item in pubsub.listen():
+                if item.get("type") != "message":
+                    continue
+                event = json.loads(item["data"])
+                yield event["campaign_id"], event["message"]
+        finally:
+            await pubsub.aclose()
+
+
+def create_job_queue() -> Optional[JobQueue]:
+    """Job queue selected by CAMPAIGN_QUEUE_BACKEND, None for the in-API scheduler"""
+    backend = settings.CAMPAIGN_QUEUE_BACKEND.lower()
+    if backend == "inprocess":
+        return InProcessJobQueue(settings.CAMPAIGN_QUEUE_MAX_SIZE, settings.CAMPAIGN_JOB_LEASE_SECONDS)
+    if backend == "sqlite":
+        return SQLiteJobQueue(
+            settings.CAMPAIGN_QUEUE_PATH, settings.CAMPAIGN_QUEUE_MAX_SIZE, settings.CAMPAIGN_JOB_LEASE_SECONDS
+        )
+    if backend == "redis":
+        return RedisJobQueue(
+            settings.REDIS_URL, settings.CAMPAIGN_QUEUE_MAX_SIZE, settings.CAMPAIGN_JOB_LEASE_SECONDS
+        )
+    if backend != "scheduler":
+        logger.warning(f"Unknown campaign queue backend '{backend}', using the in-API scheduler")
+    return None
+
+
+# Global job queue, None when campaigns run on the in-API scheduler
+job_queue = create_job_queue()
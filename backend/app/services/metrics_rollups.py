@@ -0,0 +1,135 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.rollup import AgentActivityRollup, ProspectRollup
+
+
+class CampaignStatsCache:
+    """Campaign stats of the last ``ttl`` seconds, by campaign id.
+
+    Dropped as soon as prospects of the campaign are written in this
+    process; writes made by other processes (campaign workers, other API
+    workers) show up once the entry expires.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, campaign_id: int) -> Optional[Any]:
+        entry = self._entries.get(campaign_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(campaign_id, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, campaign_id: int, stats: Any):
+        if self.ttl <= 0:
+            return
+        self._entries[campaign_id] = (time.monotonic() + self.ttl, stats)
+        self._entries.move_to_end(campaign_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, campaign_id: int):
+        self._entries.pop(campaign_id, None)
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    """Start of the hour holding ``moment``"""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+async def _increment(db: AsyncSession, model, keys: Tuple[str, ...], rows: List[Dict[str, Any]]):
+    """Add the counters of ``rows`` to the rollup rows with the same keys, creating missing ones"""
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    statement = insert(model)
+    counters = [name for name in rows[0] if name not in keys]
+    statement = statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: getattr(model, name) + statement.excluded[name] for name in counters}
+    )
+    await db.execute(statement, rows)
+
+
+async def add_activity_rollups(db: AsyncSession, campaign_id: int, activities: Iterable[Dict[str, Any]]):
+    """Count saved agent activities in the hourly rollups; does not commit"""
+    totals: Dict[Tuple[str, datetime, str], List[float]] = {}
+    for activity in activities:
+        started_at = activity.get("started_at") or datetime.utcnow()
+        key = (activity["agent_name"], hour_bucket(started_at), activity.get("status") or "")
+        total = totals.setdefault(key, [0, 0.0, 0])
+        total[0] += 1
+        if activity.get("completed_at"):
+            total[1] += (activity["completed_at"] - started_at).total_seconds()
+            total[2] += 1
+
+    await _increment(db, AgentActivityRollup, ("campaign_id", "agent_name", "hour", "status"), [
+        {
+            "campaign_id": campaign_id, "agent_name": agent_name, "hour": hour, "status": status,
+            "activity_count": count, "duration_sum": duration, "timed_count": timed
+        }
+        for (agent_name, hour, status), (count, duration, timed) in totals.items()
+    ])
+
+
+def prospect_rollup_values(prospect) -> Dict[str, Any]:
+    """Fields of a Prospect the rollups are keyed or summed on"""
+    return {"sector": prospect.sector, "status": prospect.status, "quality_score": prospect.quality_score}
+
+
+async def move_prospect_rollups(
+    db: AsyncSession,
+    campaign_id: int,
+    removed: Iterable[Dict[str, Any]] = (),
+    added: Iterable[Dict[str, Any]] = ()
+):
+    """Update the prospect rollups for prospects removed, added or changed (old values
+    in ``removed``, new ones in ``added``); does not commit"""
+    # Again after the commit, in case the stats were read in between
+    campaign_stats_cache.invalidate(campaign_id)
+    event.listen(
+        db.sync_session, "after_commit",
+        lambda session: campaign_stats_cache.invalidate(campaign_id),
+        once=True
+    )
+
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for sign, prospects in ((-1, removed), (1, added)):
+        for prospect in prospects:
+            key = (prospect.get("sector") or "", prospect.get("status") or "")
+            total = totals.setdefault(key, [0, 0.0, 0])
+            total[0] += sign
+            if prospect.get("quality_score") is not None:
+                total[1] += sign * prospect["quality_score"]
+                total[2] += sign
+
+    await _increment(db, ProspectRollup, ("campaign_id", "sector", "status"), [
+        {
+            "campaign_id": campaign_id, "sector": sector, "status": status,
+            "prospect_count": count, "quality_score_sum": score_sum, "quality_score_count": scored
+        }
+        for (sector, status), (count, score_sum, scored) in totals.items()
+        if count or scored
+    ])
+
+
+# Global instance
+campaign_stats_cache = CampaignStatsCache(ttl=settings.CAMPAIGN_STATS_CACHE_SECONDS)
@@ -0,0 +1,82 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.prospect import Prospect
+from app.services.prospect_ingestor import PLACEHOLDER_VALUES, normalize_company_name
+from app.utils.logger import setup_logger
+from src.ai_agent_crew.tools.contacts import resolve_contacts
+from src.ai_agent_crew.tools.http_client import http_client
+
+logger = setup_logger(__name__)
+
+# Prospect columns filled from a resolved contact (same attribute names)
+ENRICHED_FIELDS = ("website", "contact_name", "contact_position", "email", "phone")
+
+
+async def enrich_campaign_prospects(
+    db: AsyncSession,
+    campaign_id: int,
+    overwrite: bool = False
+) -> Dict[str, Any]:
+    """Resolve the contacts of a campaign's stored prospects in one batch.
+
+    Each company is looked up once (directory, then Hunter.io when
+    configured), concurrently, outside the crew. Only empty fields are
+    filled unless ``overwrite`` is set. Commits the updates.
+    """
+    result = await db.execute(
+        select(Prospect.id, Prospect.company_name, Prospect.extra_data, *[
+            getattr(Prospect, field) for field in ENRICHED_FIELDS
+        ]).where(Prospect.campaign_id == campaign_id)
+    )
+    rows = result.mappings().all()
+
+    companies: Dict[str, str] = {}
+    for row in rows:
+        companies.setdefault(normalize_company_name(row["company_name"]), row["company_name"])
+
+    contacts = await http_client.run_async(resolve_contacts(list(companies.values())))
+    resolved = dict(zip(companies.keys(), contacts))
+
+    updates: List[Dict[str, Any]] = []
+    failed = not_found = 0
+    for row in rows:
+        contact = resolved[normalize_company_name(row["company_name"])]
+        if isinstance(contact, Exception):
+            failed += 1
+            continue
+        if contact is None:
+            not_found += 1
+            continue
+
+        values = {
+            field: getattr(contact, field)
+            for field in ENRICHED_FIELDS
+            if getattr(contact, field) and (overwrite or row[field] in PLACEHOLDER_VALUES or row[field] is None)
+        }
+        if contact.linkedin and (overwrite or not (row["extra_data"] or {}).get("linkedin")):
+            values["extra_data"] = {**(row["extra_data"] or {}), "linkedin": contact.linkedin}
+        if values:
+            updates.append({"id": row["id"], **values})
+
+    if updates:
+        # ORM bulk UPDATE by primary key (executemany)
+        await db.execute(update(Prospect), updates)
+        await db.commit()
+
+    failures = [contact for contact in contacts if isinstance(contact, Exception)]
+    if failures:
+        logger.error(
+            f"Contact lookup failed for {len(failures)} companies of campaign {campaign_id}: {str(failures[0])}"
+        )
+
+    return {
+        "campaign_id": campaign_id,
+        "prospects": len(rows),
+        "companies": len(companies),
+        "enriched": len(updates),
+        "not_found": not_found,
+        "failed": failed
+    }
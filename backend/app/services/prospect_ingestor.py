@@ -0,0 +1,203 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.prospect import Prospect
+from app.services.metrics_rollups import move_prospect_rollups
+from app.services.prospect_parser import ProspectParser
+from app.services.websocket_manager import manager
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Values the parser uses when a field could not be extracted
+PLACEHOLDER_VALUES = {"", "Non spécifié"}
+
+# Fields a later task output may fill in on an already ingested prospect
+MERGEABLE_FIELDS = (
+    "website", "description", "sector", "location",
+    "contact_name", "contact_position", "email", "phone", "whatsapp"
+)
+
+# Columns written by the bulk insert; missing keys are sent as NULL so that
+# every row of a chunk shares the same parameter set
+INSERT_FIELDS = ("company_name", "quality_score", "status", "extra_data") + MERGEABLE_FIELDS
+
+
+def normalize_company_name(name: str) -> str:
+    """Key used to recognise the same company across task outputs"""
+    return " ".join(name.casefold().split())
+
+
+async def bulk_insert_prospects(
+    db: AsyncSession,
+    campaign_id: int,
+    prospects_data: List[Dict[str, Any]],
+    chunk_size: int = 500
+) -> List[int]:
+    """Insert parsed prospects with one multi-row INSERT per chunk.
+
+    Does not commit, so callers can group the insert with related writes in
+    a single transaction; the prospect rollups are updated with it. Returns
+    the new ids in the order of ``prospects_data``.
+    """
+    prospect_ids: List[int] = []
+    chunk_size = max(1, chunk_size)
+
+    for start in range(0, len(prospects_data), chunk_size):
+        rows = [
+            {
+                "campaign_id": campaign_id,
+                **{field: prospect_data.get(field) for field in INSERT_FIELDS}
+            }
+            for prospect_data in prospects_data[start:start + chunk_size]
+        ]
+        result = await db.execute(
+            insert(Prospect).returning(Prospect.id, sort_by_parameter_order=True),
+            rows
+        )
+        prospect_ids.extend(result.scalars().all())
+        await move_prospect_rollups(db, campaign_id, added=rows)
+
+    return prospect_ids
+
+
+class ProspectIngestor:
+    """Streams crew task outputs into the prospects table while a campaign runs.
+
+    Task outputs are handed over from the crew's thread (or the process
+    relay) with ``submit_threadsafe``, parsed on the event loop and upserted
+    in batches of ``batch_size``; each batch is announced to the campaign's
+    WebSocket clients as a ``results_processed`` delta.
+    """
+
+    def __init__(self, campaign_id: int, parser: ProspectParser, batch_size: int = 25):
+        self.campaign_id = campaign_id
+        self.parser = parser
+        self.batch_size = max(1, batch_size)
+        self.prospects_count = 0
+        self.batches_written = 0
+        self._known: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Load the campaign's existing prospects and start consuming outputs"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Prospect.id, Prospect.company_name)
+                .where(Prospect.campaign_id == self.campaign_id)
+            )
+            for prospect_id, company_name in result.all():
+                self._known[normalize_company_name(company_name)] = prospect_id
+        self.prospects_count = len(self._known)
+
+        self._consumer = asyncio.create_task(self._consume())
+
+    def submit_threadsafe(self, task_name: str, output: str):
+        """Queue a task output; safe to call from any thread"""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (task_name, output))
+
+    async def close(self):
+        """Wait until every submitted output has been ingested"""
+        if self._consumer is None:
+            return
+        self._queue.put_nowait(None)
+        await self._consumer
+        self._consumer = None
+
+    async def _consume(self):
+        while True:
+            item: Optional[Tuple[str, str]] = await self._queue.get()
+            if item is None:
+                return
+            task_name, output = item
+            try:
+                await self._ingest(task_name, output)
+            except Exception as e:
+                logger.error(
+                    f"Error ingesting output of task '{task_name}' "
+                    f"for campaign {self.campaign_id}: {str(e)}"
+                )
+
+    async def _ingest(self, task_name: str, output: str):
+        prospects_data = await self.parser.parse_crewai_result(output, use_fallback=False)
+        if not prospects_data:
+            return
+
+        for start in range(0, len(prospects_data), self.batch_size):
+            batch = prospects_data[start:start + self.batch_size]
+            created, updated = await self._upsert_batch(batch)
+            self.prospects_count += created
+            self.batches_written += 1
+
+            await manager.broadcast_to_campaign(self.campaign_id, {
+                "type": "results_processed",
+                "campaign_id": self.campaign_id,
+                "partial": True,
+                "task_name": task_name,
+                "new_prospects": created,
+                "updated_prospects": updated,
+                "prospects_count": self.prospects_count,
+                "message": f"{created} new prospects saved, {updated} updated",
+                "timestamp": datetime.utcnow().isoformat()
+            })
+
+    async def _upsert_batch(self, batch: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Insert new companies and complete the known ones, in one transaction"""
+        new_prospects: Dict[str, Dict[str, Any]] = {}
+        updates: List[Dict[str, Any]] = []
+
+        for prospect_data in batch:
+            key = normalize_company_name(prospect_data["company_name"])
+
+            if key in new_prospects:
+                continue
+
+            prospect_id = self._known.get(key)
+            if prospect_id is None:
+                new_prospects[key] = prospect_data
+                continue
+
+            values = {
+                field: prospect_data[field]
+                for field in MERGEABLE_FIELDS
+                if field in prospect_data and prospect_data[field] not in PLACEHOLDER_VALUES
+            }
+            if values:
+                updates.append({"id": prospect_id, **values})
+
+        async with AsyncSessionLocal() as db:
+            prospect_ids = await bulk_insert_prospects(
+                db, self.campaign_id, list(new_prospects.values()), self.batch_size
+            )
+            if updates:
+                await self._move_sector_rollups(db, updates)
+                # ORM bulk UPDATE by primary key (executemany)
+                await db.execute(update(Prospect), updates)
+            await db.commit()
+
+        self._known.update(zip(new_prospects.keys(), prospect_ids))
+
+        return len(new_prospects), len(updates)
+
+    async def _move_sector_rollups(self, db: AsyncSession, updates: List[Dict[str, Any]]):
+        """Count the prospects whose sector a later task output changes under their new sector"""
+        sectors = {values["id"]: values["sector"] for values in updates if "sector" in values}
+        if not sectors:
+            return
+        result = await db.execute(
+            select(Prospect.id, Prospect.sector, Prospect.status, Prospect.quality_score)
+            .where(Prospect.id.in_(sectors))
+        )
+        removed = [row._asdict() for row in result.all() if row.sector != sectors[row.id]]
+        added = [{**row, "sector": sectors[row["id"]]} for row in removed]
+        await move_prospect_rollups(db, self.campaign_id, removed=removed, added=added)
@@ -1,94 +1,385 @@
 import re
-from typing import Dict, Any, List
+import json
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from pydantic import TypeAdapter, ValidationError
+from app.core.config import settings
+from app.schemas.prospect import CrewProspect, CrewProspectList
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Patterns are compiled once at import time instead of on every call
+
+# JSON task output, possibly wrapped in a markdown code fence by the LLM
+JSON_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL | re.IGNORECASE)
+
+CREW_PROSPECT_ADAPTER = TypeAdapter(CrewProspect)
+CREW_PROSPECT_LIST_ADAPTER = TypeAdapter(List[CrewProspect])
+
+# Structured prospect blocks, tried in order; the first pattern that finds a
+# block gives every block of the result
+STRUCTURED_PATTERNS = [
+    re.compile(pattern, re.DOTALL | re.IGNORECASE)
+    for pattern in (
+        # Pattern 1: Numbered prospect blocks
+        r'(?:Prospect|Entreprise|Company)\s*(?:#|\d+)[:\s]*([^:]+):\s*\n(.*?)(?=\n(?:Prospect|Entreprise|Company)\s*(?:#|\d+)|$)',
+        
+        # Pattern 2: Header-based blocks
+        r'## (?:Prospect|Entreprise|Company).*?\n(.*?)(?=\n## |$)',
+        
+        # Pattern 3: Simple company blocks
+        r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|SARL|SA|SAS|CI)?)\s*\n(.*?)(?=\n[A-Z][A-Za-z\s&]+(?:Ltd|Limited|SARL|SA|SAS|CI)?|\n\n|$)'
+    )
+]
+
+# Simple company blocks match almost any line followed by text, so only the
+# first block found by that pattern is kept
+SIMPLE_BLOCK_STRATEGY = 2
+
+# International company name families, scanned one after the other: a
+# name of one family may overlap a name of another, and each is kept
+COMPANY_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corp|GmbH|SA|SAS|SARL|AG|SpA|BV))',
+        r'([A-Z][A-Za-z\s]+(?:Bank|Banking|Financial|Finance))',
+        r'([A-Z][A-Za-z\s]+(?:Telecom|Digital|Solutions|Services|Technology|Tech))',
+        r'([A-Z][A-Za-z\s]+(?:Group|Holdings|International|Global))',
+        r'([A-Z][A-Za-z\s]+(?:Systems|Software|Consulting|Partners))'
+    )
+]
+
+# Prospect fields. Each pattern is searched on its own from the start of
+# the block, so a value never hides another field it overlaps; a field
+# with several patterns takes the first one that matches.
+WEBSITE_PATTERNS = [
+    re.compile(r'(?:site|web|website)[:\s]*([www\.]?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', re.IGNORECASE)
+]
+SECTOR_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(?:secteur|domain|industry)[:\s]*([^.\n]+)',
+        r'(?:télécommunications|banque|finance|commerce|technologie|distribution|industrie)'
+    )
+]
+DESCRIPTION_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(?:description|activité)[:\s]*([^.\n]+)',
+        r'([A-Z][^.]+(?:entreprise|société|company)[^.]*\.)'
+    )
+]
+CONTACT_PATTERNS = {
+    field: [re.compile(pattern, re.IGNORECASE)]
+    for field, pattern in (
+        ('email', r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'),
+        ('phone', r'(?:\+225\s*)?(?:\d{2}\s*){4,5}'),
+        ('contact_name', r'(?:contact|directeur|manager)[:\s]*([A-Z][a-zA-Z\s]+)')
+    )
+}
+# International cities first, then "City, Country"
+LOCATION_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(?:Paris|London|Berlin|Madrid|Rome|Amsterdam|Brussels|Zurich|Vienna|Stockholm)[^,\n]*',
+        r'(?:New York|Toronto|Montreal|Los Angeles|Chicago|Boston)[^,\n]*',
+        r'(?:Tokyo|Singapore|Hong Kong|Sydney|Mumbai|Dubai)[^,\n]*',
+        r'(?:Johannesburg|Lagos|Nairobi|Casablanca|Cairo)[^,\n]*',
+        r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'
+    )
+]
+
+# Where a large result can be cut without splitting a prospect block: before
+# each numbered header for the numbered strategy, on blank lines otherwise
+NUMBERED_BLOCK_BOUNDARY = re.compile(r'\n(?=(?:Prospect|Entreprise|Company)\s*(?:#|\d+))', re.IGNORECASE)
+PARAGRAPH_BOUNDARY = re.compile(r'\n\s*\n')
+
+COMPANY_PREFIX_PATTERN = re.compile(r'^(Prospect|Entreprise|Company)\s*\d*[:\s]*', re.IGNORECASE)
+COMPANY_SUFFIX_PATTERN = re.compile(r'\s*[:\-]\s*$')
+
+# Sample international companies for demonstration
+SAMPLE_COMPANIES = [
+    {
+        "company_name": "Microsoft France",
+        "sector": "Technology/Software",
+        "location": "Paris, France",
+        "website": "www.microsoft.fr"
+    },
+    {
+        "company_name": "SAP Deutschland",
+        "sector": "Enterprise Software",
+        "location": "Walldorf, Germany",
+        "website": "www.sap.de"
+    },
+    {
+        "company_name": "Shopify Inc.",
+        "sector": "E-commerce Platform",
+        "location": "Ottawa, Canada",
+        "website": "www.shopify.com"
+    },
+    {
+        "company_name": "BNP Paribas",
+        "sector": "Banking/Finance",
+        "location": "Paris, France",
+        "website": "www.bnpparibas.com"
+    }
+]
+
+
+def _first_match(patterns: List[re.Pattern], text: str) -> Optional[str]:
+    """Value found by the first of ``patterns`` matching ``text``: its group
+    if it has one, the whole match otherwise"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1 if pattern.groups else 0)
+    return None
+
+
+def _validate_prospect_item(item: Any) -> Optional[CrewProspect]:
+    """Validate one prospect; fields that fail validation move to extra_data"""
+    try:
+        return CREW_PROSPECT_ADAPTER.validate_python(item)
+    except ValidationError as e:
+        if not isinstance(item, dict):
+            return None
+        invalid_fields = {error["loc"][0] for error in e.errors() if error["loc"]}
+        if "company_name" in invalid_fields:
+            return None
+        logger.warning(f"Invalid fields {sorted(invalid_fields)} in prospect '{item.get('company_name')}'")
+        valid_item = {key: value for key, value in item.items() if key not in invalid_fields}
+        valid_item["extra_data"] = {
+            **(valid_item.get("extra_data") or {}),
+            "unvalidated": {key: item[key] for key in invalid_fields if key in item}
+        }
+        try:
+            return CREW_PROSPECT_ADAPTER.validate_python(valid_item)
+        except ValidationError:
+            return None
+
+
+def parse_structured_output(text: str) -> Optional[List[CrewProspect]]:
+    """Validate a structured (JSON) task output.
+
+    Returns None when ``text`` is not JSON, so that the caller can fall back
+    on the regex strategies. A document that fails as a whole is validated
+    prospect by prospect, keeping every prospect that can be saved.
+    """
+    text = text.strip()
+    fence_match = JSON_FENCE_PATTERN.match(text)
+    if fence_match:
+        text = fence_match.group(1)
+    if not text.startswith(("{", "[")):
+        return None
+    
+    # Fast path: the whole document in one pass
+    try:
+        if text.startswith("["):
+            return CREW_PROSPECT_LIST_ADAPTER.validate_json(text)
+        return CrewProspectList.model_validate_json(text).prospects
+    except ValidationError:
+        pass
+    
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    items = data.get("prospects") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None
+    
+    prospects = [_validate_prospect_item(item) for item in items]
+    return [prospect for prospect in prospects if prospect is not None]
+
+
+def select_strategy(text: str) -> Optional[int]:
+    """Index of the first structured pattern that finds a block, None for free text"""
+    for index, pattern in enumerate(STRUCTURED_PATTERNS):
+        if pattern.groups >= 2 and pattern.search(text):
+            return index
+    return None
+
+
+def split_text(text: str, strategy: Optional[int], chunk_count: int) -> List[str]:
+    """Cut ``text`` into about ``chunk_count`` pieces on prospect block boundaries"""
+    boundary = NUMBERED_BLOCK_BOUNDARY if strategy == 0 else PARAGRAPH_BOUNDARY
+    target = max(1, len(text) // max(1, chunk_count))
+    chunks = []
+    start = 0
+    
+    while len(text) - start > target:
+        match = boundary.search(text, start + target)
+        if not match:
+            break
+        chunks.append(text[start:match.start()])
+        start = match.end()
+    chunks.append(text[start:])
+    
+    return chunks
+
+
+def parse_chunk(text: str, strategy: Optional[int]) -> List[Dict[str, Any]]:
+    """Parse one piece of a large result (runs in the parser process pool)"""
+    return ProspectParser()._parse_text(text, strategy)
+
+
+_chunk_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_chunk_pool() -> ProcessPoolExecutor:
+    global _chunk_pool
+    if _chunk_pool is None:
+        _chunk_pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.PARSER_MAX_WORKERS),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _chunk_pool
+
+
+def shutdown_chunk_pool():
+    """Stop the parser worker processes, if they were started"""
+    global _chunk_pool
+    if _chunk_pool is not None:
+        _chunk_pool.shutdown(wait=False, cancel_futures=True)
+        _chunk_pool = None
+
+
 class ProspectParser:
     """Parse prospects from CrewAI output"""
     
-    async def parse_crewai_result(self, result: Any) -> List[Dict[str, Any]]:
-        """Parse CrewAI result and extract prospect information"""
+    def __init__(self, parallel_min_size: Optional[int] = None):
+        self.parallel_min_size = (
+            settings.PARSER_PARALLEL_MIN_SIZE if parallel_min_size is None else parallel_min_size
+        )
+    
+    async def parse_crewai_result(self, result: Any, use_fallback: bool = True) -> List[Dict[str, Any]]:
+        """Parse CrewAI result and extract prospect information
+
+        JSON results of the structured output mode are validated against
+        ``CrewProspectList``; the regex strategies below only handle prose.
+        Parsing never runs on the event loop: results shorter than
+        ``parallel_min_size`` characters are parsed on a thread, larger ones
+        are cut on block boundaries and parsed across the parser process
+        pool, keeping the original order. ``use_fallback`` enables the
+        sample-company matching used when no prospect could be extracted;
+        partial task outputs disable it.
+        """
         try:
             # Convert result to string if needed
             result_text = str(result) if not isinstance(result, str) else result
             
-            # Extract prospect information using multiple parsing strategies
-            prospects = []
-            
-            # Strategy 1: Look for structured prospect sections
-            prospects.extend(self._extract_structured_prospects(result_text))
+            # Structured output mode: JSON validated against the crew schema
+            structured = await asyncio.to_thread(parse_structured_output, result_text)
+            if structured is not None:
+                prospects = self._clean_prospects([
+                    self._from_crew_prospect(prospect) for prospect in structured
+                ])
+                logger.info(f"Validated {len(prospects)} prospects from structured CrewAI result")
+                return prospects
             
-            # Strategy 2: Look for company names and details
-            if not prospects:
-                prospects.extend(self._extract_company_details(result_text))
+            # Strategies 1 and 2: structured prospect sections, then company
+            # names and details in free text
+            if len(result_text) < self.parallel_min_size:
+                prospects = await asyncio.to_thread(self._parse_sequential, result_text)
+            else:
+                prospects = await self._parse_parallel(result_text)
             
             # Strategy 3: Fallback to basic extraction
-            if not prospects:
-                prospects.extend(self._extract_basic_info(result_text))
+            if not prospects and use_fallback:
+                prospects = self._clean_prospects(self._extract_basic_info(result_text))
             
-            # Clean and validate prospects
-            cleaned_prospects = []
-            for prospect in prospects:
-                cleaned = self._clean_prospect_data(prospect)
-                if cleaned.get('company_name'):
-                    cleaned_prospects.append(cleaned)
-            
-            logger.info(f"Extracted {len(cleaned_prospects)} prospects from CrewAI result")
-            return cleaned_prospects
+            logger.info(f"Extracted {len(prospects)} prospects from CrewAI result")
+            return prospects
             
         except Exception as e:
             logger.error(f"Error parsing CrewAI result: {str(e)}")
             return []
     
-    def _extract_structured_prospects(self, text: str) -> List[Dict[str, Any]]:
+    def _from_crew_prospect(self, prospect: CrewProspect) -> Dict[str, Any]:
+        """Prospect data from a validated crew prospect, unknown keys in extra_data"""
+        data = prospect.model_dump(exclude_none=True, exclude=set(prospect.model_extra or {}))
+        data['extra_data'] = {**(prospect.model_extra or {}), **prospect.extra_data}
+        return data
+    
+    def _parse_sequential(self, text: str) -> List[Dict[str, Any]]:
+        return self._parse_text(text, select_strategy(text))
+    
+    async def _parse_parallel(self, text: str) -> List[Dict[str, Any]]:
+        """Parse a large result in ordered chunks on the process pool"""
+        strategy = await asyncio.to_thread(select_strategy, text)
+        if strategy == SIMPLE_BLOCK_STRATEGY:
+            # Single block, nothing to spread
+            return await asyncio.to_thread(self._parse_text, text, strategy)
+        
+        # A few chunks per worker so that uneven chunks still balance out
+        chunks = await asyncio.to_thread(
+            split_text, text, strategy, settings.PARSER_MAX_WORKERS * 4
+        )
+        
+        loop = asyncio.get_running_loop()
+        pool = get_chunk_pool()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, parse_chunk, chunk, strategy)
+            for chunk in chunks
+        ])
+        logger.debug(f"Parsed {len(text)} characters in {len(chunks)} chunks")
+        
+        prospects = []
+        found_companies = set()
+        for chunk_prospects in results:
+            for prospect in chunk_prospects:
+                # Free-text extraction dedupes company names, across chunks too
+                if strategy is None:
+                    if prospect['company_name'] in found_companies:
+                        continue
+                    found_companies.add(prospect['company_name'])
+                prospects.append(prospect)
+        
+        return prospects
+    
+    def _parse_text(self, text: str, strategy: Optional[int]) -> List[Dict[str, Any]]:
+        """Extract and clean the prospects of ``text`` with the given strategy"""
+        if strategy is None:
+            prospects = self._extract_company_details(text)
+        else:
+            prospects = self._extract_structured_prospects(text, strategy)
+        return self._clean_prospects(prospects)
+    
+    def _clean_prospects(self, prospects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Clean and validate prospects, dropping those without a usable name"""
+        cleaned_prospects = []
+        for prospect in prospects:
+            cleaned = self._clean_prospect_data(prospect)
+            if cleaned.get('company_name'):
+                cleaned_prospects.append(cleaned)
+        return cleaned_prospects
+    
+    def _extract_structured_prospects(self, text: str, strategy: int) -> List[Dict[str, Any]]:
         """Extract prospects from structured output"""
         prospects = []
         
-        # Pattern for structured prospect blocks
-        patterns = [
-            # Pattern 1: Numbered prospect blocks
-            r'(?:Prospect|Entreprise|Company)\s*(?:#|\d+)[:\s]*([^:]+):\s*\n(.*?)(?=\n(?:Prospect|Entreprise|Company)\s*(?:#|\d+)|$)',
+        for match in STRUCTURED_PATTERNS[strategy].finditer(text):
+            company_name = match.group(1).strip()
+            details = match.group(2).strip()
             
-            # Pattern 2: Header-based blocks
-            r'## (?:Prospect|Entreprise|Company).*?\n(.*?)(?=\n## |$)',
-            
-            # Pattern 3: Simple company blocks
-            r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|SARL|SA|SAS|CI)?)\s*\n(.*?)(?=\n[A-Z][A-Za-z\s&]+(?:Ltd|Limited|SARL|SA|SAS|CI)?|\n\n|$)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                if len(match.groups()) >= 2:
-                    company_name = match.group(1).strip()
-                    details = match.group(2).strip()
-                    
-                    prospect = self._parse_prospect_details(company_name, details)
-                    if prospect:
-                        prospects.append(prospect)
-                break  # Use first successful pattern
+            prospect = self._parse_prospect_details(company_name, details)
+            if prospect:
+                prospects.append(prospect)
+            if strategy == SIMPLE_BLOCK_STRATEGY:
+                break
         
         return prospects
     
     def _extract_company_details(self, text: str) -> List[Dict[str, Any]]:
         """Extract company information from free text"""
         prospects = []
-        
-        # Look for international company patterns
-        company_patterns = [
-            r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corp|GmbH|SA|SAS|SARL|AG|SpA|BV))',
-            r'([A-Z][A-Za-z\s]+(?:Bank|Banking|Financial|Finance))',
-            r'([A-Z][A-Za-z\s]+(?:Telecom|Digital|Solutions|Services|Technology|Tech))',
-            r'([A-Z][A-Za-z\s]+(?:Group|Holdings|International|Global))',
-            r'([A-Z][A-Za-z\s]+(?:Systems|Software|Consulting|Partners))'
-        ]
-        
         found_companies = set()
         
-        for pattern in company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in COMPANY_PATTERNS:
+            for match in pattern.finditer(text):
                 company_name = match.group(1).strip()
                 if len(company_name) > 3 and company_name not in found_companies:
                     found_companies.add(company_name)
@@ -107,37 +398,9 @@ class ProspectParser:
         """Basic extraction as fallback"""
         prospects = []
         
-        # Sample international companies for demonstration
-        sample_companies = [
-            {
-                "company_name": "Microsoft France",
-                "sector": "Technology/Software",
-                "location": "Paris, France",
-                "website": "www.microsoft.fr"
-            },
-            {
-                "company_name": "SAP Deutschland",
-                "sector": "Enterprise Software",
-                "location": "Walldorf, Germany",
-                "website": "www.sap.de"
-            },
-            {
-                "company_name": "Shopify Inc.",
-                "sector": "E-commerce Platform",
-                "location": "Ottawa, Canada",
-                "website": "www.shopify.com"
-            },
-            {
-                "company_name": "BNP Paribas",
-                "sector": "Banking/Finance",
-                "location": "Paris, France",
-                "website": "www.bnpparibas.com"
-            }
-        ]
-        
-        # Check if text mentions any of these companies
+        # Check if text mentions any of the sample companies
         text_lower = text.lower()
-        for company in sample_companies:
+        for company in SAMPLE_COMPANIES:
             company_name_lower = company["company_name"].lower()
             if any(word in text_lower for word in company_name_lower.split()):
                 prospects.append({
@@ -158,62 +421,29 @@ class ProspectParser:
             "location": "Non spécifié"
         }
         
-        # Extract website
-        website_match = re.search(r'(?:site|web|website)[:\s]*([www\.]?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', details, re.IGNORECASE)
-        if website_match:
-            website = website_match.group(1)
+        website = _first_match(WEBSITE_PATTERNS, details)
+        if website:
             if not website.startswith('www.'):
                 website = 'www.' + website
             prospect['website'] = website
         
-        # Extract sector
-        sector_patterns = [
-            r'(?:secteur|domain|industry)[:\s]*([^.\n]+)',
-            r'(?:télécommunications|banque|finance|commerce|technologie|distribution|industrie)'
-        ]
-        for pattern in sector_patterns:
-            sector_match = re.search(pattern, details, re.IGNORECASE)
-            if sector_match:
-                prospect['sector'] = sector_match.group(1 if sector_match.groups() else 0).strip()
-                break
-        
-        # Extract description
-        desc_patterns = [
-            r'(?:description|activité)[:\s]*([^.\n]+)',
-            r'([A-Z][^.]+(?:entreprise|société|company)[^.]*\.)'
-        ]
-        for pattern in desc_patterns:
-            desc_match = re.search(pattern, details, re.IGNORECASE)
-            if desc_match:
-                prospect['description'] = desc_match.group(1).strip()
-                break
-        
-        # Extract contact information
-        contact_patterns = {
-            'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-            'phone': r'(?:\+225\s*)?(?:\d{2}\s*){4,5}',
-            'contact_name': r'(?:contact|directeur|manager)[:\s]*([A-Z][a-zA-Z\s]+)'
-        }
+        sector = _first_match(SECTOR_PATTERNS, details)
+        if sector:
+            prospect['sector'] = sector.strip()
         
-        for field, pattern in contact_patterns.items():
-            match = re.search(pattern, details, re.IGNORECASE)
-            if match:
-                prospect[field] = match.group(1 if match.groups() else 0).strip()
+        description = _first_match(DESCRIPTION_PATTERNS, details)
+        if description:
+            prospect['description'] = description.strip()
         
-        # Extract location - look for international locations
-        location_patterns = [
-            r'(?:Paris|London|Berlin|Madrid|Rome|Amsterdam|Brussels|Zurich|Vienna|Stockholm)[^,\n]*',
-            r'(?:New York|Toronto|Montreal|Los Angeles|Chicago|Boston)[^,\n]*',
-            r'(?:Tokyo|Singapore|Hong Kong|Sydney|Mumbai|Dubai)[^,\n]*',
-            r'(?:Johannesburg|Lagos|Nairobi|Casablanca|Cairo)[^,\n]*',
-            r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'
-        ]
+        # Contact information
+        for field, patterns in CONTACT_PATTERNS.items():
+            value = _first_match(patterns, details)
+            if value:
+                prospect[field] = value.strip()
         
-        for pattern in location_patterns:
-            location_match = re.search(pattern, details, re.IGNORECASE)
-            if location_match:
-                prospect['location'] = location_match.group(0).strip()
-                break
+        location = _first_match(LOCATION_PATTERNS, details)
+        if location:
+            prospect['location'] = location.strip()
         
         return prospect
     
@@ -225,8 +455,8 @@ class ProspectParser:
         if 'company_name' in prospect:
             company_name = str(prospect['company_name']).strip()
             # Remove common prefixes/suffixes that might be parsing artifacts
-            company_name = re.sub(r'^(Prospect|Entreprise|Company)\s*\d*[:\s]*', '', company_name, flags=re.IGNORECASE)
-            company_name = re.sub(r'\s*[:\-]\s*$', '', company_name)
+            company_name = COMPANY_PREFIX_PATTERN.sub('', company_name)
+            company_name = COMPANY_SUFFIX_PATTERN.sub('', company_name)
             
             if len(company_name) > 2:
                 cleaned['company_name'] = company_name
@@ -1,87 +1,337 @@
 from fastapi import WebSocket
-from typing import List, Dict, Optional
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Set
+from collections import deque
+import itertools
 import json
 import asyncio
 from datetime import datetime
 
+from app.core.config import settings
+from app.services.event_backplane import EventBackplane
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# What a client's full send queue does with a new message
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+def serialize_message(message: dict) -> str:
+    """Encode a message once for every recipient, as WebSocket.send_json would"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def coalesce_key(message: dict) -> Optional[str]:
+    """Messages sharing a key supersede each other: agent_activity of one agent"""
+    if message.get("type") != "agent_activity":
+        return None
+    data = message.get("data")
+    if not isinstance(data, dict) or not data.get("agent_name"):
+        return None
+    return f"{data.get('campaign_id')}:{data['agent_name']}"
+
+
+class ClientConnection:
+    """A WebSocket client and the writer task draining its send queue.
+
+    Broadcasts only append to the queue, which holds at most ``max_queue``
+    messages. When it is full, ``overflow_policy`` drops the oldest
+    message ("drop_oldest"), replaces the queued message of the same agent
+    and falls back to dropping the oldest ("coalesce"), or gives up on the
+    client ("disconnect"). A send taking longer than ``send_timeout`` also
+    gives up on the client.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_failure: Callable[["ClientConnection"], None],
+        max_queue: int = 100,
+        overflow_policy: str = "coalesce",
+        send_timeout: float = 5.0
+    ):
+        self.websocket = websocket
+        self.on_failure = on_failure
+        # Set by the manager: connection id, campaigns followed
+        self.id = 0
+        self.campaigns: Set[int] = set()
+        self.max_queue = max(1, max_queue)
+        self.overflow_policy = overflow_policy if overflow_policy in OVERFLOW_POLICIES else "drop_oldest"
+        self.send_timeout = send_timeout
+        # [coalesce key, encoded message]; lists so that coalescing can update them in place
+        self._queue: Deque[list] = deque()
+        self._queued_by_key: Dict[str, list] = {}
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closer: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write())
+
+    def stop(self):
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+
+    def abort(self):
+        """Stop writing and close the socket in the background"""
+        if self._closer is not None:
+            return
+        self.stop()
+        self._closer = asyncio.create_task(self._close())
+
+    async def _close(self):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=1013), self.send_timeout)
+        except Exception:
+            pass
+
+    def push(self, text: str, key: Optional[str] = None) -> bool:
+        """Queue an encoded message; False when the client has to be disconnected"""
+        if self.closed:
+            return False
+
+        if len(self._queue) >= self.max_queue:
+            if self.overflow_policy == "disconnect":
+                return False
+            pending = self._queued_by_key.get(key) if key is not None else None
+            if pending is not None and self.overflow_policy == "coalesce":
+                # Keeps its place in the queue with the latest content
+                pending[1] = text
+                self.coalesced += 1
+                return True
+            self._forget(self._queue.popleft())
+            self.dropped += 1
+
+        entry = [key, text]
+        self._queue.append(entry)
+        if key is not None:
+            self._queued_by_key[key] = entry
+        self._ready.set()
+        return True
+
+    def _forget(self, entry: list):
+        key = entry[0]
+        if key is not None and self._queued_by_key.get(key) is entry:
+            del self._queued_by_key[key]
+
+    async def _write(self):
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            entry = self._queue.popleft()
+            self._forget(entry)
+            try:
+                await asyncio.wait_for(self.websocket.send_text(entry[1]), self.send_timeout)
+                self.sent += 1
+            except asyncio.TimeoutError:
+                logger.warning(f"WebSocket client too slow (no send within {self.send_timeout}s), disconnecting it")
+                break
+            except Exception as e:
+                logger.error(f"Error sending WebSocket message: {e}")
+                break
+
+        self.closed = True
+        self.on_failure(self)
+
+
 class ConnectionManager:
-    def __init__(self):
-        # Active connections by campaign_id
-        self.campaign_connections: Dict[int, List[WebSocket]] = {}
+    """WebSocket clients and their campaign subscriptions, each fed by its own writer task.
+
+    Clients are kept in dicts and sets, and every client knows the campaigns
+    it follows, so connecting, subscribing and disconnecting take constant
+    time however many dashboards are open. A broadcast serializes its
+    message once and appends it to the bounded send queue of every
+    recipient without waiting for the sends: a slow browser never holds up
+    the others or the campaign that produced the event, and the memory held
+    for it stays bounded (see ``ClientConnection``).
+
+    With several API processes, ``backplane`` forwards each broadcast to the
+    other processes, which deliver it to their own clients.
+    """
+
+    def __init__(self, send_timeout: float = 5.0, max_queue: int = 100, overflow_policy: str = "coalesce"):
+        self.send_timeout = send_timeout
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
         # All active connections
-        self.active_connections: List[WebSocket] = []
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        # Subscribers by campaign_id
+        self.campaign_connections: Dict[int, Set[ClientConnection]] = {}
+        self._ids = itertools.count(1)
+        # Set in campaign worker processes: messages are forwarded to the
+        # API's clients, (campaign_id or None for global, message)
+        self.relay: Optional[Callable[[Optional[int], dict], Awaitable[None]]] = None
+        self.backplane: Optional[EventBackplane] = None
+
+    async def start_backplane(self, backplane: EventBackplane):
+        """Share broadcasts with the other API processes through ``backplane``"""
+        await backplane.start(self.deliver)
+        self.backplane = backplane
+
+    async def close_backplane(self):
+        backplane, self.backplane = self.backplane, None
+        if backplane is not None:
+            await backplane.close()
 
     async def connect(self, websocket: WebSocket, campaign_id: Optional[int] = None):
         """Connect a client to WebSocket"""
         await websocket.accept()
-        self.active_connections.append(websocket)
-        
+        client = ClientConnection(
+            websocket,
+            on_failure=self._drop,
+            max_queue=self.max_queue,
+            overflow_policy=self.overflow_policy,
+            send_timeout=self.send_timeout
+        )
+        client.id = next(self._ids)
+        client.start()
+        self.clients[websocket] = client
+
         if campaign_id:
-            if campaign_id not in self.campaign_connections:
-                self.campaign_connections[campaign_id] = []
-            self.campaign_connections[campaign_id].append(websocket)
+            self.subscribe(websocket, campaign_id)
             logger.info(f"Client connected to campaign {campaign_id}")
 
+    def subscribe(self, websocket: WebSocket, campaign_id: int) -> bool:
+        """Add a campaign to the ones a connected client follows"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return False
+        self.campaign_connections.setdefault(campaign_id, set()).add(client)
+        client.campaigns.add(campaign_id)
+        return True
+
+    def unsubscribe(self, websocket: WebSocket, campaign_id: int):
+        """Stop sending a campaign's updates to a client"""
+        client = self.clients.get(websocket)
+        if client is not None:
+            self._unsubscribe(client, campaign_id)
+
+    def _unsubscribe(self, client: ClientConnection, campaign_id: int):
+        client.campaigns.discard(campaign_id)
+        subscribers = self.campaign_connections.get(campaign_id)
+        if subscribers is None:
+            return
+        subscribers.discard(client)
+        # Remove empty campaign subscriber sets
+        if not subscribers:
+            del self.campaign_connections[campaign_id]
+
     def disconnect(self, websocket: WebSocket, campaign_id: Optional[int] = None):
-        """Disconnect a client from WebSocket"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        
-        if campaign_id and campaign_id in self.campaign_connections:
-            if websocket in self.campaign_connections[campaign_id]:
-                self.campaign_connections[campaign_id].remove(websocket)
-                
-            # Remove empty campaign connection lists
-            if not self.campaign_connections[campaign_id]:
-                del self.campaign_connections[campaign_id]
-                
+        """Disconnect a client from WebSocket, with all its campaign subscriptions"""
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        client.stop()
+        for subscribed_id in list(client.campaigns):
+            self._unsubscribe(client, subscribed_id)
+
         logger.info(f"Client disconnected from campaign {campaign_id}")
 
+    def _drop(self, client: ClientConnection):
+        """Close a client the server gave up on and forget it"""
+        client.abort()
+        if self.clients.get(client.websocket) is client:
+            self.disconnect(client.websocket)
+
+    async def send_to(self, websocket: WebSocket, message: dict):
+        """Send a message to one client, after the messages already queued for it"""
+        client = self.clients.get(websocket)
+        if client is not None and not client.push(serialize_message(message), coalesce_key(message)):
+            self._drop(client)
+
     async def broadcast_to_campaign(self, campaign_id: int, message: dict):
         """Broadcast message to all clients connected to specific campaign"""
-        if campaign_id not in self.campaign_connections:
+        if self.relay is not None:
+            await self._relay(campaign_id, message)
             return
-            
-        connections = self.campaign_connections[campaign_id].copy()
-        disconnected = []
-        
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending message to campaign {campaign_id}: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection, campaign_id)
+
+        await self._publish(campaign_id, message)
+        self.deliver(campaign_id, message)
 
     async def broadcast(self, message: dict):
         """Broadcast message to all active connections globally"""
-        if not self.active_connections:
+        if self.relay is not None:
+            await self._relay(None, message)
             return
-            
-        connections = self.active_connections.copy()
-        disconnected = []
-        
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending global message: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection)
+
+        await self._publish(None, message)
+        self.deliver(None, message)
+
+    def deliver(self, campaign_id: Optional[int], message: dict):
+        """Send a message to the clients of this process only: a campaign's subscribers, or everyone for None"""
+        if campaign_id is None:
+            if self.clients:
+                self._push_all(self.clients.values(), message)
+            return
+
+        subscribers = self.campaign_connections.get(campaign_id)
+        if subscribers:
+            self._push_all(subscribers, message)
+
+    async def _publish(self, campaign_id: Optional[int], message: dict):
+        if self.backplane is None:
+            return
+        try:
+            await self.backplane.publish(campaign_id, message)
+        except Exception as e:
+            # The local clients still get it
+            logger.error(f"Error publishing message for campaign {campaign_id} to the backplane: {e}")
+
+    def _push_all(self, clients: Iterable[ClientConnection], message: dict):
+        """Queue a message for every client, dropping the ones that cannot take it"""
+        text = serialize_message(message)
+        key = coalesce_key(message)
+        failed = [client for client in clients if not client.push(text, key)]
+        for client in failed:
+            logger.warning(f"WebSocket client {client.id} send queue is full, disconnecting it")
+            self._drop(client)
+
+    async def _relay(self, campaign_id: Optional[int], message: dict):
+        try:
+            await self.relay(campaign_id, message)
+        except Exception as e:
+            logger.error(f"Error relaying message for campaign {campaign_id}: {e}")
 
     def get_total_connection_count(self) -> int:
         """Get total number of active connections"""
-        return len(self.active_connections)
+        return len(self.clients)
+
+    def get_campaign_subscriber_count(self, campaign_id: int) -> int:
+        return len(self.campaign_connections.get(campaign_id, ()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connections, subscribers per campaign and send queue totals"""
+        clients = list(self.clients.values())
+        return {
+            "connections": len(clients),
+            "subscriptions": sum(len(client.campaigns) for client in clients),
+            "subscribers_by_campaign": {
+                campaign_id: len(subscribers)
+                for campaign_id, subscribers in self.campaign_connections.items()
+            },
+            "queued_messages": sum(client.queued for client in clients),
+            "sent_messages": sum(client.sent for client in clients),
+            "dropped_messages": sum(client.dropped for client in clients),
+            "coalesced_messages": sum(client.coalesced for client in clients),
+            "overflow_policy": self.overflow_policy,
+            "max_queue": self.max_queue
+        }
 
 # Global instance
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager(
+    send_timeout=settings.WEBSOCKET_SEND_TIMEOUT,
+    max_queue=settings.WEBSOCKET_SEND_QUEUE_SIZE,
+    overflow_policy=settings.WEBSOCKET_OVERFLOW_POLICY
+)
@@ -0,0 +1,77 @@
+"""
+Campaign worker: runs the campaigns queued by the API.
+
+Usage: python -m app.worker [--concurrency N]
+
+Requires a shared job queue (CAMPAIGN_QUEUE_BACKEND="sqlite" or "redis").
+Start as many workers as needed, on one or several boxes; the progress of
+each campaign is sent back to the API, which relays it to its WebSocket
+clients.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+
+from app.core.config import settings
+from app.core.database import init_db
+from app.services.websocket_manager import manager
+from app.services.campaign_executor import campaign_executor
+from app.services.campaign_worker import CampaignWorker
+from app.services.job_queue import job_queue
+from app.services.prospect_parser import shutdown_chunk_pool
+from app.utils.logger import setup_logger
+from src.ai_agent_crew.tools.directory import get_business_directory
+from src.ai_agent_crew.tools.http_client import http_client
+
+logger = setup_logger(__name__)
+
+
+async def run_worker(concurrency: int):
+    await init_db()
+    await job_queue.start()
+    # Campaign progress goes back to the API's WebSocket clients
+    manager.relay = job_queue.publish_event
+    await campaign_executor.start()
+    await asyncio.to_thread(get_business_directory)
+
+    worker = CampaignWorker(job_queue, concurrency, poll_seconds=settings.CAMPAIGN_WORKER_POLL_SECONDS)
+    await worker.start()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    try:
+        await stopping.wait()
+    finally:
+        logger.info("Stopping campaign worker...")
+        # Campaigns still running are handed to another worker once their lease expires
+        await worker.stop()
+        await campaign_executor.shutdown()
+        await job_queue.close()
+        shutdown_chunk_pool()
+        http_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the campaigns queued by the API")
+    parser.add_argument("--concurrency", type=int, default=settings.CAMPAIGN_MAX_WORKERS,
+                        help="campaigns run at the same time")
+    args = parser.parse_args()
+
+    if job_queue is None or not job_queue.shared:
+        logger.error(
+            f"CAMPAIGN_QUEUE_BACKEND='{settings.CAMPAIGN_QUEUE_BACKEND}' cannot be consumed by a worker, "
+            "use 'sqlite' or 'redis'"
+        )
+        sys.exit(1)
+
+    logger.info(f"Starting campaign worker ({settings.CAMPAIGN_QUEUE_BACKEND} queue)")
+    asyncio.run(run_worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
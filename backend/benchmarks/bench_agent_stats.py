@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+Benchmark de l'endpoint /agents/stats.
+
+Remplit une base SQLite temporaire avec N activités d'agents (1 000 000 par
+défaut) sur deux semaines et plusieurs centaines de campagnes, avec leurs
+agrégats horaires, puis compare trois calculs : chargement de toutes les
+lignes de la fenêtre et comptage en Python, GROUP BY sur les activités, et
+lecture des agrégats horaires complétée par les activités de l'heure où
+commence la fenêtre (l'endpoint), sur la dernière semaine, le dernier jour
+et pour une campagne. Les activités sont réparties uniformément, y compris
+autour des bornes des fenêtres ; les écarts avec le calcul Python sont
+affichés.
+
+Usage: python benchmarks/bench_agent_stats.py [--activities 1000000] [--repeat 3]
+"""
+
+import sys
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import agent, campaign, checkpoint, prospect, rollup, user  # noqa: F401 - registers the tables
+from app.models.agent import AgentActivity
+from app.models.campaign import Campaign
+from app.api.v1.endpoints import agents as agents_endpoint
+from app.api.v1.endpoints.agents import get_agent_stats
+from app.services.metrics_rollups import add_activity_rollups
+
+AGENTS = ["Global Market Researcher", "International Prospecting Specialist", "Global Content Writer"]
+STATUSES = ["started", "running", "running", "running", "running", "completed", "failed"]
+
+
+class FrozenClock(datetime):
+    """datetime whose utcnow() stays at the seeding time, so that every
+    implementation computes the same window"""
+    frozen_at = datetime.utcnow()
+
+    @classmethod
+    def utcnow(cls):
+        return cls.frozen_at
+
+
+async def seed(session_factory, count: int, campaigns: int, chunk_size: int = 20_000):
+    rng = random.Random(3)
+    now = FrozenClock.utcnow()
+    # Each campaign runs for two hours somewhere in the last two weeks
+    campaign_ages = [rng.uniform(7200, 14 * 86400) for _ in range(campaigns)]
+    async with session_factory() as db:
+        await db.execute(insert(Campaign), [
+            {"name": f"Campagne {index}", "product_description": "Produit"} for index in range(campaigns)
+        ])
+        for start in range(0, count, chunk_size):
+            rows = []
+            for _ in range(min(chunk_size, count - start)):
+                campaign_id = rng.randint(1, campaigns)
+                age = campaign_ages[campaign_id - 1] - rng.uniform(0, 7200)
+                started_at = now - timedelta(seconds=age)
+                status = rng.choice(STATUSES)
+                finished = status in ("completed", "failed")
+                rows.append({
+                    "campaign_id": campaign_id,
+                    "agent_name": rng.choice(AGENTS),
+                    "task_name": "market_research_task",
+                    "status": status,
+                    "message": "Étape de l'agent",
+                    "started_at": started_at,
+                    "completed_at": started_at + timedelta(seconds=rng.uniform(5, 600)) if finished else None,
+                    "extra_data": {}
+                })
+            await db.execute(insert(AgentActivity), rows)
+            for campaign_id in {row["campaign_id"] for row in rows}:
+                await add_activity_rollups(db, campaign_id, [row for row in rows if row["campaign_id"] == campaign_id])
+        await db.commit()
+
+
+async def legacy_agent_stats(db: AsyncSession, campaign_id, hours: int):
+    """Previous implementation: every activity of the window loaded as an ORM object"""
+    since = FrozenClock.utcnow() - timedelta(hours=hours)
+    query = select(AgentActivity).where(AgentActivity.started_at >= since)
+    if campaign_id:
+        query = query.where(AgentActivity.campaign_id == campaign_id)
+    activities = (await db.execute(query)).scalars().all()
+
+    stats = {"total_activities": len(activities), "activities_by_agent": {},
+             "activities_by_status": {}, "average_task_duration": 0.0, "success_rate": 0.0}
+    for activity in activities:
+        stats["activities_by_agent"][activity.agent_name] = stats["activities_by_agent"].get(activity.agent_name, 0) + 1
+        stats["activities_by_status"][activity.status] = stats["activities_by_status"].get(activity.status, 0) + 1
+    completed = stats["activities_by_status"].get("completed", 0)
+    failed = stats["activities_by_status"].get("failed", 0)
+    if completed + failed > 0:
+        stats["success_rate"] = completed / (completed + failed) * 100
+    completed_activities = [a for a in activities if a.status == "completed" and a.completed_at]
+    if completed_activities:
+        stats["average_task_duration"] = sum(
+            (a.completed_at - a.started_at).total_seconds() for a in completed_activities
+        ) / len(completed_activities)
+    return stats
+
+
+async def grouped_agent_stats(db: AsyncSession, campaign_id, hours: int):
+    """GROUP BY agent and status over the raw activities"""
+    since = FrozenClock.utcnow() - timedelta(hours=hours)
+    duration = (func.julianday(AgentActivity.completed_at) - func.julianday(AgentActivity.started_at)) * 86400.0
+    query = (
+        select(AgentActivity.agent_name, AgentActivity.status, func.count(AgentActivity.id),
+               func.sum(duration), func.count(AgentActivity.completed_at))
+        .where(AgentActivity.started_at >= since)
+        .group_by(AgentActivity.agent_name, AgentActivity.status)
+    )
+    if campaign_id:
+        query = query.where(AgentActivity.campaign_id == campaign_id)
+
+    stats = {"total_activities": 0, "activities_by_agent": {},
+             "activities_by_status": {}, "average_task_duration": 0.0, "success_rate": 0.0}
+    duration_sum, timed = 0.0, 0
+    for agent_name, status, count, group_duration, group_timed in (await db.execute(query)).all():
+        stats["total_activities"] += count
+        stats["activities_by_agent"][agent_name] = stats["activities_by_agent"].get(agent_name, 0) + count
+        stats["activities_by_status"][status] = stats["activities_by_status"].get(status, 0) + count
+        if status == "completed":
+            duration_sum += group_duration or 0.0
+            timed += group_timed
+    completed = stats["activities_by_status"].get("completed", 0)
+    failed = stats["activities_by_status"].get("failed", 0)
+    if completed + failed > 0:
+        stats["success_rate"] = completed / (completed + failed) * 100
+    if timed:
+        stats["average_task_duration"] = duration_sum / timed
+    return stats
+
+
+def same_stats(left: dict, right: dict) -> bool:
+    return all(
+        abs(left[key] - right[key]) < 1e-3 if isinstance(left[key], float) else left[key] == right[key]
+        for key in left
+    )
+
+
+async def measure(session_factory, compute, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            stats = await compute(db)
+            timings.append(time.perf_counter() - start)
+    return min(timings), stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--activities", type=int, default=1_000_000)
+    parser.add_argument("--campaigns", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # The endpoint reads the same clock as the implementations it is compared with
+    agents_endpoint.datetime = FrozenClock
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/bench.db")
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        start = time.perf_counter()
+        await seed(session_factory, args.activities, args.campaigns)
+        print(f"{args.activities} activities seeded in {time.perf_counter() - start:.1f}s")
+
+        async with session_factory() as db:
+            rollups = (await db.execute(select(func.count(rollup.AgentActivityRollup.id)))).scalar()
+        print(f"{rollups} hourly rollup rows")
+
+        print(f"{'window':<22}{'rows':>10}{'python (ms)':>14}{'GROUP BY (ms)':>16}{'rollups (ms)':>15}{'same':>6}")
+        for label, campaign_id, hours in (("168h, all campaigns", None, 168), ("24h, all campaigns", None, 24),
+                                          ("168h, one campaign", 7, 168)):
+            legacy, expected = await measure(
+                session_factory, lambda db: legacy_agent_stats(db, campaign_id, hours), args.repeat
+            )
+            grouped, grouped_stats = await measure(
+                session_factory, lambda db: grouped_agent_stats(db, campaign_id, hours), args.repeat
+            )
+            rolled, stats = await measure(
+                session_factory, lambda db: get_agent_stats(campaign_id=campaign_id, hours=hours, db=db), args.repeat
+            )
+            same = same_stats(expected, grouped_stats) and same_stats(expected, stats)
+            print(f"{label:<22}{stats['total_activities']:>10}{legacy * 1000:>14.0f}{grouped * 1000:>16.0f}"
+                  f"{rolled * 1000:>15.1f}{'yes' if same else 'NO':>6}")
+            for name, other in (("GROUP BY", grouped_stats), ("rollups", stats)):
+                for key in expected:
+                    if not same_stats({key: expected[key]}, {key: other[key]}):
+                        print(f"    {name} {key}: {other[key]} instead of {expected[key]}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark de l'annuaire d'entreprises indexé.
+
+Construit un annuaire synthétique (300 000 entreprises par défaut), mesure
+le temps de construction de l'index puis la latence des recherches typiques
+des agents et des recherches de contact.
+
+Usage: python benchmarks/bench_business_directory.py [--companies 300000]
+"""
+
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ai_agent_crew.tools.directory import CompanyRecord, InMemoryBusinessDirectory
+
+SECTORS = ["Banque", "Distribution", "Logiciels", "Télécommunications", "Agroalimentaire",
+           "BTP", "Transport", "Assurance", "Énergie", "Santé", "Éducation", "Immobilier"]
+CITIES = ["Abidjan, Côte d'Ivoire", "Dakar, Sénégal", "Paris, France", "Lagos, Nigeria",
+          "Casablanca, Maroc", "Douala, Cameroun", "Lyon, France", "Bamako, Mali"]
+WORDS = ["Atlantique", "Sahel", "Lagune", "Ivoire", "Baobab", "Horizon", "Delta", "Savane",
+         "Ebène", "Kola", "Akwaba", "Plateau", "Cocody", "Zenith", "Nova", "Alpha"]
+SUFFIXES = ["SARL", "SA", "Group", "Holdings", "Services", "Solutions", "Industries"]
+
+QUERIES = [
+    "banque Abidjan",
+    "entreprises de logiciels à Dakar",
+    "Baobab Solutions",
+    "Ivoire Horizon SARL",
+    "assurance",
+    "transport logistique Lagos",
+    "Kola Delta 4711",
+]
+
+
+def build_records(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for index in range(count):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index} {rng.choice(SUFFIXES)}"
+        yield CompanyRecord(
+            name=name,
+            sector=rng.choice(SECTORS),
+            location=rng.choice(CITIES),
+            website=f"www.company{index}.com",
+            description="Entreprise synthétique",
+            contact_name="Awa Koné" if index % 3 == 0 else "",
+            email=f"contact@company{index}.com" if index % 3 == 0 else ""
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    directory = InMemoryBusinessDirectory(build_records(args.companies))
+    print(f"Index of {len(directory)} companies built in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'query':<36}{'matches':>9}{'median':>12}")
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            page = directory.search(query, limit=5, offset=5)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{query:<36}{page.total:>9}{timings[len(timings) // 2] * 1000:>10.3f}ms")
+
+    timings = []
+    for index in range(args.repeat):
+        start = time.perf_counter()
+        directory.find_contact(f"Ivoire Baobab {index * 3} SARL")
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{'find_contact':<36}{'':>9}{timings[len(timings) // 2] * 1000:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
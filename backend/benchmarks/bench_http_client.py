@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Benchmark du client HTTP partagé des outils de la crew.
+
+Lance un serveur stub local (latence simulée, une erreur 503 sur N), puis
+compare des lookups lancés depuis des threads d'exécution, comme les outils
+CrewAI : une connexion par appel (httpx.get) contre le client partagé
+(connexions keep-alive, limites par hôte, retries). Mesure aussi le débit
+d'un fournisseur limité par token bucket.
+
+Usage: python benchmarks/bench_http_client.py [--lookups 400] [--threads 8]
+"""
+
+import sys
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ai_agent_crew.tools.http_client import ToolHttpClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.005
+    fail_every = 25
+    requests = 0
+    connections = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            StubHandler.requests += 1
+            StubHandler.connections.add(self.client_address)
+            failing = self.fail_every and StubHandler.requests % self.fail_every == 0
+        time.sleep(self.latency)
+        body = json.dumps({"data": {"path": self.path}}).encode()
+        self.send_response(503 if failing else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def reset_stub():
+    StubHandler.requests = 0
+    StubHandler.connections = set()
+
+
+def run_lookups(lookup, count: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lookup, range(count)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=50.0, help="provider rate limit, requests per second")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{args.lookups} lookups from {args.threads} threads, stub latency "
+          f"{StubHandler.latency * 1000:.0f}ms, one 503 every {StubHandler.fail_every} requests")
+    print(f"{'client':<28}{'time':>10}{'lookups/s':>12}{'connections':>13}{'errors':>8}")
+
+    def report(name, elapsed, errors):
+        print(f"{name:<28}{elapsed * 1000:>8.0f}ms{args.lookups / elapsed:>12.0f}"
+              f"{len(StubHandler.connections):>13}{errors:>8}")
+
+    # One connection per lookup, no retry
+    reset_stub()
+    errors = []
+
+    def fresh_lookup(index):
+        response = httpx.get(f"{base_url}/contacts/{index}")
+        if response.status_code != 200:
+            errors.append(index)
+
+    report("connection per lookup", run_lookups(fresh_lookup, args.lookups, args.threads), len(errors))
+
+    # Shared pooled client
+    reset_stub()
+    client = ToolHttpClient(per_host_limit=args.threads, backoff_base=0.01, backoff_max=0.1)
+    errors = []
+
+    def pooled_lookup(index):
+        try:
+            client.get_json(f"{base_url}/contacts/{index}")
+        except httpx.HTTPError:
+            errors.append(index)
+
+    report("shared client", run_lookups(pooled_lookup, args.lookups, args.threads), len(errors))
+    print(f"  client stats: {client.stats}")
+
+    # Same client, provider limited by its token bucket
+    reset_stub()
+    client.rate_limits = {"stub": args.rate}
+    count = int(args.rate * 2)
+
+    def limited_lookup(index):
+        client.get_json(f"{base_url}/contacts/{index}", provider="stub")
+
+    elapsed = run_lookups(limited_lookup, count, args.threads)
+    print(f"rate limited to {args.rate:.0f}/s: {count} lookups in {elapsed:.2f}s "
+          f"({count / elapsed:.0f}/s, burst of {args.rate:.0f} included)")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
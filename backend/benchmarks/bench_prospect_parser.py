@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark du ProspectParser.
+
+Compare le parser actuel (patterns compilés une fois) avec l'ancienne
+implémentation (re.search par champ, patterns recompilés à chaque appel)
+sur une sortie CrewAI synthétique volumineuse, et vérifie que les deux
+extraient les mêmes champs, y compris sur des blocs où les valeurs se
+chevauchent ("Capgemini Consulting, industry: services").
+
+Mesure aussi parse_crewai_result en séquentiel et réparti sur le pool de
+processus du parser, sur une sortie numérotée (Prospect 1: ...), et la même
+liste en sortie structurée (JSON validé par CrewProspectList).
+
+Usage: python benchmarks/bench_prospect_parser.py [--blocks 2000] [--repeat 5]
+"""
+
+import sys
+import re
+import json
+import asyncio
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.prospect_parser import ProspectParser, shutdown_chunk_pool
+
+
+class LegacyProspectParser(ProspectParser):
+    """Implementation before the precompiled patterns, kept for comparison"""
+
+    def _extract_company_details(self, text: str) -> List[Dict[str, Any]]:
+        prospects = []
+        company_patterns = [
+            r'([A-Z][A-Za-z\s&]+(?:Ltd|Limited|Inc|Corp|GmbH|SA|SAS|SARL|AG|SpA|BV))',
+            r'([A-Z][A-Za-z\s]+(?:Bank|Banking|Financial|Finance))',
+            r'([A-Z][A-Za-z\s]+(?:Telecom|Digital|Solutions|Services|Technology|Tech))',
+            r'([A-Z][A-Za-z\s]+(?:Group|Holdings|International|Global))',
+            r'([A-Z][A-Za-z\s]+(?:Systems|Software|Consulting|Partners))'
+        ]
+        found_companies = set()
+        for pattern in company_patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                company_name = match.group(1).strip()
+                if len(company_name) > 3 and company_name not in found_companies:
+                    found_companies.add(company_name)
+                    start = max(0, match.start() - 200)
+                    end = min(len(text), match.end() + 200)
+                    prospects.append(self._parse_prospect_details(company_name, text[start:end]))
+        return prospects
+
+    def _parse_prospect_details(self, company_name: str, details: str) -> Dict[str, Any]:
+        prospect = {
+            "company_name": company_name,
+            "quality_score": 5.0,
+            "status": "identified",
+            "location": "Non spécifié"
+        }
+
+        website_match = re.search(r'(?:site|web|website)[:\s]*([www\.]?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', details, re.IGNORECASE)
+        if website_match:
+            website = website_match.group(1)
+            if not website.startswith('www.'):
+                website = 'www.' + website
+            prospect['website'] = website
+
+        for pattern in [
+            r'(?:secteur|domain|industry)[:\s]*([^.\n]+)',
+            r'(?:télécommunications|banque|finance|commerce|technologie|distribution|industrie)'
+        ]:
+            sector_match = re.search(pattern, details, re.IGNORECASE)
+            if sector_match:
+                prospect['sector'] = sector_match.group(1 if sector_match.groups() else 0).strip()
+                break
+
+        for pattern in [
+            r'(?:description|activité)[:\s]*([^.\n]+)',
+            r'([A-Z][^.]+(?:entreprise|société|company)[^.]*\.)'
+        ]:
+            desc_match = re.search(pattern, details, re.IGNORECASE)
+            if desc_match:
+                prospect['description'] = desc_match.group(1).strip()
+                break
+
+        contact_patterns = {
+            'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+            'phone': r'(?:\+225\s*)?(?:\d{2}\s*){4,5}',
+            'contact_name': r'(?:contact|directeur|manager)[:\s]*([A-Z][a-zA-Z\s]+)'
+        }
+        for field, pattern in contact_patterns.items():
+            match = re.search(pattern, details, re.IGNORECASE)
+            if match:
+                prospect[field] = match.group(1 if match.groups() else 0).strip()
+
+        for pattern in [
+            r'(?:Paris|London|Berlin|Madrid|Rome|Amsterdam|Brussels|Zurich|Vienna|Stockholm)[^,\n]*',
+            r'(?:New York|Toronto|Montreal|Los Angeles|Chicago|Boston)[^,\n]*',
+            r'(?:Tokyo|Singapore|Hong Kong|Sydney|Mumbai|Dubai)[^,\n]*',
+            r'(?:Johannesburg|Lagos|Nairobi|Casablanca|Cairo)[^,\n]*',
+            r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'
+        ]:
+            location_match = re.search(pattern, details, re.IGNORECASE)
+            if location_match:
+                prospect['location'] = location_match.group(0).strip()
+                break
+
+        return prospect
+
+
+CITIES = ["Paris", "London", "Berlin", "Toronto", "Singapore", "Lagos", "Abidjan, Cote"]
+SECTORS = ["commerce", "distribution", "technologie", "finance", "industrie"]
+SUFFIXES = ["SARL", "Group", "Solutions", "Holdings", "Services"]
+
+
+def build_blocks(count: int, seed: int = 42, numbered: bool = False) -> List[str]:
+    """Prospect blocks shaped like the crew's prose output"""
+    rng = random.Random(seed)
+    blocks = []
+    for index in range(count):
+        name = f"Entreprise{index} {rng.choice(SUFFIXES)}"
+        header = f"Prospect {index + 1}: {name}:" if numbered else name
+        blocks.append(
+            f"{header}\n"
+            f"Secteur: {rng.choice(SECTORS)} et services associés\n"
+            f"Description: Cette entreprise accompagne les PME dans leur croissance. "
+            f"Elle emploie {rng.randint(10, 500)} personnes.\n"
+            f"Localisation: {rng.choice(CITIES)}\n"
+            f"Site web: entreprise{index}.com\n"
+            f"Contact: Jean Kouassi, directeur commercial\n"
+            f"Email: contact@entreprise{index}.com\n"
+            f"Téléphone: +225 07 {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)} 00\n"
+        )
+    return blocks
+
+
+# Realistic fragments whose values overlap other fields' patterns
+ADVERSARIAL_FRAGMENTS = [
+    "Capgemini Consulting, industry: services",
+    "industry: banque", "Industry: télécommunications et médias",
+    "Secteur: finance, London office", "domain: distribution",
+    "Abidjan, Cote d'Ivoire", "Finance, Paris", "New York, USA", "Dakar, Senegal",
+    "contact@orange.ci", "12345678@mail.com", "Tél: 07 08 09 10 11", "+225 27 20 30 40 50",
+    "site: www.orange.ci", "website:sgci.com", "Site web: entreprise.co",
+    "Contact: Awa Traore, manager Paris", "directeur: Koffi Yao", "manager Lagos team",
+    "Description: Société de commerce", "activité: distribution de produits",
+    "Entreprise leader du commerce en ligne.", "La société industrie textile.",
+]
+
+
+def build_adversarial_blocks(count: int, seed: int = 7) -> List[str]:
+    """Blocks of randomly ordered fragments, with values running into labels"""
+    rng = random.Random(seed)
+    return [
+        "".join(
+            fragment + rng.choice([", ", "\n", " ", ". "])
+            for fragment in rng.sample(ADVERSARIAL_FRAGMENTS, rng.randint(3, 8))
+        )
+        for _ in range(count)
+    ]
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    blocks = build_blocks(args.blocks)
+    text = "\n\n".join(blocks)
+    current, legacy = ProspectParser(), LegacyProspectParser()
+
+    print(f"Synthetic output: {args.blocks} blocks, {len(text) / 1024:.0f} KiB")
+    print(f"{'case':<28}{'legacy':>12}{'current':>12}{'speedup':>10}")
+
+    cases = {
+        "_parse_prospect_details": lambda p: [
+            p._parse_prospect_details(f"Entreprise{i}", block) for i, block in enumerate(blocks)
+        ],
+        "_extract_company_details": lambda p: p._extract_company_details(text),
+    }
+    for name, case in cases.items():
+        legacy_time = timed(lambda: case(legacy), args.repeat)
+        current_time = timed(lambda: case(current), args.repeat)
+        print(f"{name:<28}{legacy_time * 1000:>10.1f}ms{current_time * 1000:>10.1f}ms"
+              f"{legacy_time / current_time:>9.1f}x")
+
+    # Same fields must come out of both implementations
+    mismatches = sum(
+        1 for i, block in enumerate(blocks)
+        if legacy._parse_prospect_details(f"Entreprise{i}", block)
+        != current._parse_prospect_details(f"Entreprise{i}", block)
+    )
+    print(f"Blocks parsed differently: {mismatches}/{len(blocks)}")
+
+    adversarial = build_adversarial_blocks(3000)
+    mismatches = sum(
+        1 for block in adversarial
+        if legacy._parse_prospect_details("Entreprise", block)
+        != current._parse_prospect_details("Entreprise", block)
+    )
+    print(f"Overlapping-value blocks parsed differently: {mismatches}/{len(adversarial)}")
+
+    # Names of one family overlapping names of another are all kept
+    overlapping = text + "\nOrange Digital Services Group SA signed with Ecobank Financial Holdings."
+    print(f"Same companies from free text: "
+          f"{legacy._extract_company_details(overlapping) == current._extract_company_details(overlapping)}")
+
+    text = "\n".join(build_blocks(args.blocks, numbered=True))
+    sequential = ProspectParser(parallel_min_size=len(text) + 1)
+    parallel = ProspectParser(parallel_min_size=0)
+    # Start the worker processes before timing
+    asyncio.run(parallel.parse_crewai_result(text))
+
+    sequential_time = timed(lambda: asyncio.run(sequential.parse_crewai_result(text)), args.repeat)
+    parallel_time = timed(lambda: asyncio.run(parallel.parse_crewai_result(text)), args.repeat)
+    print(f"{'parse_crewai_result':<28}{sequential_time * 1000:>10.1f}ms{parallel_time * 1000:>10.1f}ms"
+          f"{sequential_time / parallel_time:>9.1f}x  (sequential / parallel)")
+
+    sequential_result = asyncio.run(sequential.parse_crewai_result(text))
+    parallel_result = asyncio.run(parallel.parse_crewai_result(text))
+    print(f"Prospects: {len(sequential_result)} sequential, {len(parallel_result)} parallel, "
+          f"same order: {sequential_result == parallel_result}")
+
+    # Same prospects in structured output mode
+    json_text = json.dumps({"prospects": [
+        {key: value for key, value in prospect.items() if value not in ("", "Non spécifié")}
+        for prospect in sequential_result
+    ]})
+    json_time = timed(lambda: asyncio.run(sequential.parse_crewai_result(json_text)), args.repeat)
+    print(f"{'structured JSON':<28}{'':>12}{json_time * 1000:>10.1f}ms")
+    shutdown_chunk_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark du temps de démarrage de l'API.
+
+Importe app.main dans un interpréteur neuf avec ``python -X importtime``
+et affiche le temps d'import cumulé des modules les plus lents, le temps
+propre par paquet de premier niveau, et si la pile CrewAI (crewai,
+crewai_tools, chromadb, embedchain) a été chargée par l'import.
+
+Usage: python benchmarks/bench_startup_imports.py [--module app.main] [--top 25] [--repeat 3]
+"""
+
+import sys
+import argparse
+import json
+import re
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+
+CREW_STACK = ("crewai", "crewai_tools", "chromadb", "embedchain")
+MARKER = "LOADED_CREW_MODULES="
+
+# "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$')
+
+
+def profile_import(module: str) -> Tuple[List[Tuple[str, int, int, int]], List[str]]:
+    """(name, depth, self_us, cumulative_us) per imported module, and the crew modules loaded"""
+    code = (
+        f"import sys, json; import {module}; "
+        f"print({MARKER!r} + json.dumps([m for m in {CREW_STACK!r} if m in sys.modules]))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=project_root, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+
+    loaded = []
+    for line in completed.stdout.splitlines():
+        if line.startswith(MARKER):
+            loaded = json.loads(line[len(MARKER):])
+    return entries, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.repeat)]
+    # Keep the median run by total import time
+    totals = [sum(cumulative for _, depth, _, cumulative in entries if depth == 0) for entries, _ in runs]
+    median = sorted(range(len(runs)), key=totals.__getitem__)[len(runs) // 2]
+    entries, loaded = runs[median]
+
+    print(f"import {args.module}: {totals[median] / 1000:.0f}ms "
+          f"(median of {args.repeat}, {len(entries)} modules)")
+    print(f"CrewAI stack loaded: {', '.join(loaded) if loaded else 'no'}")
+
+    print(f"\n{'module (cumulative)':<56}{'ms':>9}")
+    for name, _, _, cumulative in sorted(entries, key=lambda entry: -entry[3])[:args.top]:
+        print(f"{name:<56}{cumulative / 1000:>9.1f}")
+
+    packages: Dict[str, int] = defaultdict(int)
+    for name, _, self_us, _ in entries:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'package (self)':<56}{'ms':>9}")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<56}{self_us / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""
+Benchmark de la diffusion WebSocket du ConnectionManager.
+
+Connecte N clients simulés (latence d'envoi de quelques millisecondes, une
+fraction de clients lents) et mesure, message par message, le temps pendant
+lequel le producteur est bloqué et la latence de livraison par client :
+envoi séquentiel (un client après l'autre, comme avant) contre files
+d'envoi par client. Envoie ensuite une rafale d'agent_activity à un client
+lent avec chaque politique de débordement et affiche la taille maximale de
+sa file. Mesure enfin le coût de connexion/déconnexion de milliers de
+clients abonnés à la même campagne.
+
+Usage: python benchmarks/bench_websocket_broadcast.py [--clients 1000] [--messages 5] [--slow 0.01] [--burst 2000]
+"""
+
+import sys
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import List
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from app.services.websocket_manager import OVERFLOW_POLICIES, ConnectionManager
+
+# One log line per dropped client would swamp the results
+logger.disable("app")
+
+
+class SimulatedClient:
+    """Stands in for a FastAPI WebSocket; records when each message arrives"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received: List[float] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.latency)
+        self.received.append(time.perf_counter())
+
+    async def send_json(self, message: dict):
+        await asyncio.sleep(self.latency)
+        self.received.append(time.perf_counter())
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def make_clients(count: int, slow_fraction: float, slow_latency: float) -> List[SimulatedClient]:
+    rng = random.Random(42)
+    return [
+        SimulatedClient(slow_latency if rng.random() < slow_fraction else rng.uniform(0.001, 0.005))
+        for _ in range(count)
+    ]
+
+
+async def sequential_broadcast(clients: List[SimulatedClient], message: dict):
+    """Previous behaviour: one client after the other"""
+    for client in clients:
+        await client.send_json(message)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name: str, durations: List[float], latencies: List[float], connected: int):
+    print(f"{name:<22}{statistics.median(durations) * 1000:>11.1f}ms"
+          f"{percentile(latencies, 0.5) * 1000:>9.1f}{percentile(latencies, 0.95) * 1000:>9.1f}"
+          f"{percentile(latencies, 0.99) * 1000:>9.1f}{max(latencies) * 1000:>9.1f}{connected:>11}")
+
+
+async def run(broadcast, clients: List[SimulatedClient], messages: int, connected=lambda client: True):
+    """Producer time per broadcast, and delivery latency of each message to each client"""
+    durations, latencies = [], []
+    for index in range(messages):
+        message = {"type": "agent_activity", "data": {"index": index, "status": "in_progress"}}
+        for client in clients:
+            client.received.clear()
+        start = time.perf_counter()
+        await broadcast(message)
+        durations.append(time.perf_counter() - start)
+        # Writer tasks deliver after the broadcast returned
+        while any(not client.received and connected(client) for client in clients):
+            await asyncio.sleep(0.001)
+        latencies.extend(arrival - start for client in clients for arrival in client.received)
+    return durations, latencies
+
+
+async def burst(policy: str, count: int, queue_size: int):
+    """One client taking 1ms per send receives a burst of agent_activity from 5 agents"""
+    manager = ConnectionManager(send_timeout=1.0, max_queue=queue_size, overflow_policy=policy)
+    client = SimulatedClient(0.001)
+    await manager.connect(client)
+    connection = manager.clients[client]
+    max_queued = 0
+    for index in range(count):
+        await manager.broadcast({
+            "type": "agent_activity",
+            "data": {"agent_name": f"agent-{index % 5}", "campaign_id": 1, "step": index}
+        })
+        max_queued = max(max_queued, connection.queued)
+    while connection.sent + connection.dropped + connection.coalesced < count and not connection.closed:
+        await asyncio.sleep(0.001)
+    print(f"{policy:<14}{max_queued:>12}{connection.sent:>8}{connection.dropped:>9}"
+          f"{connection.coalesced:>11}{'yes' if client in manager.clients else 'no':>11}")
+    connection.stop()
+
+
+async def churn(count: int):
+    """Connect ``count`` clients to one campaign, then disconnect them in random order"""
+    manager = ConnectionManager()
+    clients = [SimulatedClient(0.001) for _ in range(count)]
+    start = time.perf_counter()
+    for client in clients:
+        await manager.connect(client, campaign_id=1)
+    connected = time.perf_counter() - start
+    random.Random(7).shuffle(clients)
+    start = time.perf_counter()
+    for client in clients:
+        manager.disconnect(client, campaign_id=1)
+    disconnected = time.perf_counter() - start
+    # Let the cancelled writer tasks finish
+    await asyncio.sleep(0)
+    print(f"{count:>8}{connected / count * 1e6:>14.1f}{disconnected / count * 1e6:>17.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--slow", type=float, default=0.01, help="fraction of slow clients")
+    parser.add_argument("--slow-latency", type=float, default=0.5, help="seconds per send for slow clients")
+    parser.add_argument("--timeout", type=float, default=0.2, help="send timeout of the manager")
+    parser.add_argument("--burst", type=int, default=2000, help="messages of the burst")
+    parser.add_argument("--queue-size", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients ({args.slow:.0%} taking {args.slow_latency * 1000:.0f}ms per send), "
+          f"{args.messages} messages, send timeout {args.timeout * 1000:.0f}ms")
+    print(f"{'broadcast':<22}{'duration':>13}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'connected':>11}")
+
+    clients = make_clients(args.clients, args.slow, args.slow_latency)
+    durations, latencies = await run(lambda message: sequential_broadcast(clients, message), clients, args.messages)
+    report("sequential", durations, latencies, len(clients))
+
+    manager = ConnectionManager(send_timeout=args.timeout)
+    clients = make_clients(args.clients, args.slow, args.slow_latency)
+    for client in clients:
+        await manager.connect(client)
+    durations, latencies = await run(
+        manager.broadcast, clients, args.messages, connected=lambda client: client in manager.clients
+    )
+    report("per-client queues", durations, latencies, manager.get_total_connection_count())
+
+    # A broadcast never waits for the client: the whole burst is produced
+    # before the writer task sends anything
+    print(f"\nburst of {args.burst} agent_activity to one client, queue of {args.queue_size}")
+    print(f"{'policy':<14}{'max queued':>12}{'sent':>8}{'dropped':>9}{'coalesced':>11}{'connected':>11}")
+    for policy in OVERFLOW_POLICIES:
+        await burst(policy, args.burst, args.queue_size)
+
+    print(f"\n{'clients':>8}{'connect (us)':>14}{'disconnect (us)':>17}")
+    for count in (1_000, 10_000, 50_000):
+        await churn(count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,33 @@
+import threading
+from typing import Any, Optional
+
+
+class CampaignCancelledError(BaseException):
+    """Raised inside a running crew once its campaign has been cancelled.
+
+    Derives from BaseException on purpose: CrewAI retries agent executions
+    on any ``Exception``, which would keep calling the LLM after a stop.
+    """
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared between a campaign and its crew.
+
+    Wraps any event object exposing ``set``/``is_set`` so that the same token
+    works with a ``threading.Event`` in-process and a ``multiprocessing``
+    event in worker processes.
+    """
+
+    def __init__(self, event: Optional[Any] = None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CampaignCancelledError("Campaign was cancelled")
@@ -1,15 +1,27 @@
 from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool, WebsiteSearchTool
 import yaml
-import os
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
 
-from .tools.custom_tool import (
-    GlobalBusinessSearchTool, 
-    ContactFinderTool, 
-    GlobalMarketAnalysisTool
-)
+from .cancellation import CancelToken
+from .registry import get_crew_registry
+from app.schemas.prospect import CrewProspectList
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Receives (campaign_id, message) for each progress event; called from the
+# crew thread, so it must be thread-safe and return without waiting
+EventCallback = Callable[[Optional[int], Dict[str, Any]], None]
+
+# Receives an agent activity (agent_name, task_name, status, message and
+# optionally error_message, started_at, completed_at, extra_data) for each
+# task start, agent step and task end; called from the crew thread
+ActivityCallback = Callable[[Dict[str, Any]], None]
+
+# Characters of a step or task output kept in an activity message
+ACTIVITY_MESSAGE_MAX_CHARS = 2000
 
 @CrewBase
 class AiAgentCrew():
@@ -18,18 +30,28 @@ class AiAgentCrew():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
     
-    def __init__(self):
-        # Initialize custom tools
-        self.business_search_tool = GlobalBusinessSearchTool()
-        self.contact_finder_tool = ContactFinderTool()
-        self.market_analysis_tool = GlobalMarketAnalysisTool()
-        
-        # Initialize web search tools if API keys available
-        self.web_tools = []
-        if os.getenv('SERPER_API_KEY'):
-            self.web_tools.append(SerperDevTool())
+    def __init__(
+        self,
+        step_callback: Optional[Callable[[Any], None]] = None,
+        task_callback: Optional[Callable[[Any], None]] = None,
+        structured_output: bool = False,
+        completed_tasks: Optional[Dict[str, str]] = None
+    ):
+        # Callbacks invoked by CrewAI after each agent step and each task
+        self.step_callback = step_callback
+        self.task_callback = task_callback
+        # Outputs of the tasks finished by a previous run, by task name
+        self.completed_tasks = completed_tasks or {}
+        # Prospect tasks return JSON validated against CrewProspectList
+        self.prospect_output_model = CrewProspectList if structured_output else None
         
-        self.website_search_tool = WebsiteSearchTool()
+        # Tools are built once per process and shared by every crew
+        tools = get_crew_registry().get_tools()
+        self.business_search_tool = tools.business_search
+        self.contact_finder_tool = tools.contact_finder
+        self.market_analysis_tool = tools.market_analysis
+        self.web_tools = list(tools.web_tools)
+        self.website_search_tool = tools.website_search
 
     @agent
     def market_researcher(self) -> Agent:
@@ -82,7 +104,8 @@ class AiAgentCrew():
         """Market Research Task"""
         return Task(
             config=self.tasks_config['market_research_task'],
-            agent=self.market_researcher()
+            agent=self.market_researcher(),
+            output_pydantic=self.prospect_output_model
         )
 
     @task
@@ -90,7 +113,8 @@ class AiAgentCrew():
         """Prospect Analysis Task"""
         return Task(
             config=self.tasks_config['prospect_analysis_task'],
-            agent=self.prospecting_specialist()
+            agent=self.prospecting_specialist(),
+            output_pydantic=self.prospect_output_model
         )
 
     @task
@@ -106,9 +130,11 @@ class AiAgentCrew():
         """Create the AI Agent Prospecting Crew"""
         return Crew(
             agents=self.agents,
-            tasks=self.tasks,
+            tasks=self._remaining_tasks(),
             process=Process.sequential,
             verbose=True,
+            step_callback=self.step_callback,
+            task_callback=self.task_callback,
             memory=True,
             embedder={
                 "provider": "openai",
@@ -118,38 +144,137 @@ class AiAgentCrew():
             }
         )
 
+    def _remaining_tasks(self) -> List[Task]:
+        """Tasks left to run, after the leading ones already completed.
+
+        Completed tasks get their saved output back and every remaining task
+        reads all the tasks before it as context, as in a full sequential run.
+        """
+        if not self.completed_tasks:
+            return self.tasks
+        
+        from crewai.tasks.task_output import TaskOutput
+        
+        previous: List[Task] = []
+        remaining: List[Task] = []
+        for task in self.tasks:
+            output = self.completed_tasks.get(task.name)
+            if output is not None and not remaining:
+                task.output = TaskOutput(
+                    name=task.name,
+                    description=task.description,
+                    agent=task.agent.role,
+                    raw=output
+                )
+            else:
+                task.context = list(previous)
+                remaining.append(task)
+            previous.append(task)
+        return remaining
+
 class ProspectingCrewManager:
     """Manager class for easier crew execution"""
     
-    def __init__(self, websocket_callback=None, campaign_id=None):
-        self.crew_instance = AiAgentCrew()
-        self.websocket_callback = websocket_callback
+    def __init__(
+        self,
+        event_callback: Optional[EventCallback] = None,
+        campaign_id=None,
+        cancel_token: Optional[CancelToken] = None,
+        task_output_callback: Optional[Callable[[str, str], None]] = None,
+        structured_output: bool = False,
+        completed_tasks: Optional[Dict[str, str]] = None,
+        activity_callback: Optional[ActivityCallback] = None
+    ):
+        self.cancel_token = cancel_token or CancelToken()
+        # Receives (task_name, raw_output) as soon as each task finishes
+        self.task_output_callback = task_output_callback
+        self.activity_callback = activity_callback
+        # Tasks of the sequential run not finished yet; the first one is running
+        self._pending_tasks: List[Task] = []
+        self._task_started_at: Optional[datetime] = None
+        self._steps = 0
+        self.crew_instance = AiAgentCrew(
+            step_callback=self._on_step,
+            task_callback=self._on_task,
+            structured_output=structured_output,
+            completed_tasks=completed_tasks
+        )
+        self.event_callback = event_callback
         self.campaign_id = campaign_id
-        
-    async def send_websocket_message(self, message_type: str, data: Dict[str, Any]):
-        """Send WebSocket message if callback is available"""
-        if self.websocket_callback:
+    
+    def _on_step(self, step_output: Any):
+        """Called by CrewAI after every agent step (LLM call or tool call)"""
+        self._steps += 1
+        tool = getattr(step_output, "tool", None)
+        self._record_activity(
+            "running",
+            message=getattr(step_output, "thought", None) or str(step_output),
+            extra_data={"step": self._steps, "tool": tool} if tool else {"step": self._steps}
+        )
+        self.cancel_token.raise_if_cancelled()
+    
+    def _on_task(self, task_output: Any):
+        """Called by CrewAI after every completed task"""
+        if self.task_output_callback:
             try:
-                from datetime import datetime
-                message = {
-                    "type": message_type,
-                    "data": data,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                # Send to campaign-specific clients if campaign_id is available
-                if self.campaign_id:
-                    await self.websocket_callback(self.campaign_id, message)
-                
-                # Also send globally - import manager directly
-                try:
-                    from app.services.websocket_manager import manager
-                    await manager.broadcast(message)
-                except Exception as broadcast_error:
-                    print(f"Error broadcasting globally: {broadcast_error}")
-                    
+                task_name = getattr(task_output, "name", None) or str(getattr(task_output, "description", ""))[:100]
+                # Structured tasks are forwarded as validated JSON
+                structured = getattr(task_output, "pydantic", None)
+                if structured is not None:
+                    output = structured.model_dump_json()
+                else:
+                    output = str(getattr(task_output, "raw", task_output))
+                self.task_output_callback(task_name, output)
             except Exception as e:
-                print(f"Error sending WebSocket message: {e}")
+                logger.exception(f"Error forwarding task output: {str(e)}")
+        self._record_activity(
+            "completed",
+            message=str(getattr(task_output, "raw", task_output)),
+            started_at=self._task_started_at,
+            completed_at=datetime.utcnow()
+        )
+        if self._pending_tasks:
+            self._pending_tasks.pop(0)
+        self._start_next_task()
+        self.cancel_token.raise_if_cancelled()
+    
+    def _start_next_task(self):
+        self._task_started_at = datetime.utcnow()
+        self._steps = 0
+        if self._pending_tasks:
+            self._record_activity("started", message=self._pending_tasks[0].description)
+    
+    def _record_activity(self, status: str, message: Optional[str] = None, **fields: Any):
+        """Hand an activity of the running task's agent to ``activity_callback``"""
+        if not self.activity_callback or not self._pending_tasks:
+            return
+        try:
+            task = self._pending_tasks[0]
+            activity = {
+                "agent_name": str(getattr(task.agent, "role", "") or "Agent").strip(),
+                "task_name": task.name,
+                "status": status,
+                "message": message[:ACTIVITY_MESSAGE_MAX_CHARS] if message else None,
+                "started_at": datetime.utcnow()
+            }
+            activity.update(fields)
+            self.activity_callback(activity)
+        except Exception as e:
+            logger.exception(f"Error recording agent activity: {str(e)}")
+        
+    def emit_event(self, message_type: str, data: Dict[str, Any]):
+        """Hand a progress event to ``event_callback``; never blocks the crew thread"""
+        if not self.event_callback:
+            return
+        try:
+            message = {
+                "type": message_type,
+                "data": data,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            self.event_callback(self.campaign_id, message)
+        except Exception as e:
+            logger.exception(f"Error sending WebSocket message: {str(e)}")
         
     def run_prospecting_campaign(self, inputs: Dict[str, Any]) -> str:
         """
@@ -166,9 +291,6 @@ class ProspectingCrewManager:
         Returns:
             String containing the campaign results
         """
-        import asyncio
-        from datetime import datetime
-        
         # Validate inputs
         required_fields = ['product']
         for field in required_fields:
@@ -182,69 +304,56 @@ class ProspectingCrewManager:
         inputs.setdefault('target_sectors', [])
         
         # Notify start of prospecting
-        try:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.send_websocket_message("agent_activity", {
-                "agent_name": "Global Market Researcher",
-                "action": "Démarrage de la prospection",
-                "description": f"Recherche de {inputs['prospect_count']} prospects dans {inputs['target_location']}",
-                "status": "started",
-                "campaign_id": self.campaign_id,
-                "timestamp": datetime.utcnow().isoformat()
-            }))
-        except:
-            pass  # Continue even if WebSocket fails
+        self.emit_event("agent_activity", {
+            "agent_name": "Global Market Researcher",
+            "action": "Démarrage de la prospection",
+            "description": f"Recherche de {inputs['prospect_count']} prospects dans {inputs['target_location']}",
+            "status": "started",
+            "campaign_id": self.campaign_id,
+            "timestamp": datetime.utcnow().isoformat()
+        })
         
         # Run the crew
+        self.cancel_token.raise_if_cancelled()
         crew = self.crew_instance.crew()
         
         # Notify execution start
-        try:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.send_websocket_message("agent_activity", {
-                "agent_name": "Global Market Researcher", 
-                "action": "Analyse du marché",
-                "description": "Analyse des secteurs cibles et identification des entreprises potentielles",
-                "status": "in_progress",
-                "campaign_id": self.campaign_id,
-                "timestamp": datetime.utcnow().isoformat()
-            }))
-        except:
-            pass
+        self.emit_event("agent_activity", {
+            "agent_name": "Global Market Researcher", 
+            "action": "Analyse du marché",
+            "description": "Analyse des secteurs cibles et identification des entreprises potentielles",
+            "status": "in_progress",
+            "campaign_id": self.campaign_id,
+            "timestamp": datetime.utcnow().isoformat()
+        })
         
-        result = crew.kickoff(inputs=inputs)
+        self.cancel_token.raise_if_cancelled()
+        self._pending_tasks = list(crew.tasks)
+        self._start_next_task()
+        try:
+            result = crew.kickoff(inputs=inputs)
+        except Exception as e:
+            self._record_activity(
+                "failed",
+                error_message=f"{type(e).__name__}: {e}",
+                started_at=self._task_started_at,
+                completed_at=datetime.utcnow()
+            )
+            raise
         
         # Notify completion
-        try:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.send_websocket_message("agent_activity", {
-                "agent_name": "Global Business Search",
-                "action": "Prospection terminée",
-                "description": "Analyse terminée et prospects identifiés avec succès",
-                "status": "completed",
-                "campaign_id": self.campaign_id,
-                "result": "Prospects identifiés et validés",
-                "timestamp": datetime.utcnow().isoformat()
-            }))
-        except:
-            pass
+        self.emit_event("agent_activity", {
+            "agent_name": "Global Business Search",
+            "action": "Prospection terminée",
+            "description": "Analyse terminée et prospects identifiés avec succès",
+            "status": "completed",
+            "campaign_id": self.campaign_id,
+            "result": "Prospects identifiés et validés",
+            "timestamp": datetime.utcnow().isoformat()
+        })
         
         return str(result)
     
     def get_crew_info(self) -> Dict[str, Any]:
         """Get information about the crew configuration"""
-        return {
-            "agents": [
-                "Global Market Researcher - Identifies potential companies worldwide",
-                "International Prospecting Specialist - Finds contact information globally", 
-                "Global Content Writer - Creates personalized content for any market"
-            ],
-            "tools": [
-                "Global Business Search - International business directory",
-                "Global Contact Finder - Contact information lookup worldwide",
-                "Global Market Analysis - Market insights for any country/region",
-                "Web Search - General web search capabilities"
-            ],
-            "process": "Sequential execution of tasks",
-            "memory": "Enabled for context retention"
-        }
\ No newline at end of file
+        return get_crew_registry().get_crew_info()
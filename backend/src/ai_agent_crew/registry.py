@@ -0,0 +1,133 @@
+import copy
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+# One-line summaries served by /crew/info, by agent key of agents.yaml
+AGENT_SUMMARIES = {
+    "market_researcher": "Identifies potential companies worldwide",
+    "prospecting_specialist": "Finds contact information globally",
+    "content_writer": "Creates personalized content for any market"
+}
+
+TOOL_SUMMARIES = [
+    "Global Business Search - International business directory",
+    "Global Contact Finder - Contact information lookup worldwide",
+    "Global Market Analysis - Market insights for any country/region",
+    "Web Search - General web search capabilities"
+]
+
+
+@dataclass
+class CrewTools:
+    """Tool instances shared by every crew of the process"""
+    business_search: Any
+    contact_finder: Any
+    market_analysis: Any
+    website_search: Any
+    web_tools: List[Any] = field(default_factory=list)
+
+
+def build_crew_tools() -> CrewTools:
+    """Instantiate the crew's tools (WebsiteSearchTool sets up its embedder)"""
+    from crewai_tools import SerperDevTool, WebsiteSearchTool
+    from .tools.custom_tool import GlobalBusinessSearchTool, ContactFinderTool, GlobalMarketAnalysisTool
+
+    # Web search tools only when their API key is available
+    web_tools = []
+    if os.getenv('SERPER_API_KEY'):
+        web_tools.append(SerperDevTool())
+
+    return CrewTools(
+        business_search=GlobalBusinessSearchTool(),
+        contact_finder=ContactFinderTool(),
+        market_analysis=GlobalMarketAnalysisTool(),
+        website_search=WebsiteSearchTool(),
+        web_tools=web_tools
+    )
+
+
+class CrewRegistry:
+    """Warm, process-wide state of the prospecting crew.
+
+    The YAML configs are parsed once, when the registry is created, and
+    describe the crew for /crew/info without building it. Tools are built
+    on first use (or at startup, see ``warm_up``) and then reused by every
+    ``AiAgentCrew``; none of them keeps per-campaign state.
+    """
+
+    def __init__(self, config_dir: Path = CONFIG_DIR):
+        self.config_dir = Path(config_dir)
+        self.agents_config = self._load_yaml("agents.yaml")
+        self.tasks_config = self._load_yaml("tasks.yaml")
+        self.crew_info = self._describe()
+        self._tools: Optional[CrewTools] = None
+        self._lock = threading.Lock()
+
+    def _load_yaml(self, name: str) -> Dict[str, Any]:
+        with open(self.config_dir / name, "r", encoding="utf-8") as file:
+            return yaml.safe_load(file) or {}
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "agents": [
+                f"{config['role'].strip()} - {AGENT_SUMMARIES.get(key) or config.get('goal', '').strip()}"
+                for key, config in self.agents_config.items()
+            ],
+            "tasks": list(self.tasks_config),
+            "tools": list(TOOL_SUMMARIES),
+            "process": "Sequential execution of tasks",
+            "memory": "Enabled for context retention"
+        }
+
+    def get_crew_info(self) -> Dict[str, Any]:
+        """Cached crew description (a copy, callers may modify it)"""
+        return copy.deepcopy(self.crew_info)
+
+    @property
+    def tools_ready(self) -> bool:
+        return self._tools is not None
+
+    def get_tools(self) -> CrewTools:
+        """Shared tool instances, built on the first call"""
+        if self._tools is None:
+            with self._lock:
+                if self._tools is None:
+                    start = time.perf_counter()
+                    self._tools = build_crew_tools()
+                    logger.info(f"Crew tools ready in {time.perf_counter() - start:.1f}s")
+        return self._tools
+
+    def warm_up(self) -> bool:
+        """Build the tools ahead of the first campaign; failures are retried on use"""
+        try:
+            self.get_tools()
+            return True
+        except Exception as e:
+            logger.error(f"Error warming up crew tools: {str(e)}")
+            return False
+
+
+_registry: Optional[CrewRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_crew_registry() -> CrewRegistry:
+    """Registry of the process, created on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CrewRegistry()
+    return _registry
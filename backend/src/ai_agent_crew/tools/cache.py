@@ -0,0 +1,213 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from .text import tokenize
+
+
+def normalize_query(query: str) -> str:
+    """Cache key of a query: case, accents, punctuation and word order are ignored.
+
+    "BNP Paribas", "bnp paribas." and "Paribas BNP" share one entry.
+    """
+    return " ".join(sorted(set(tokenize(query))))
+
+
+class MemoryCacheBackend:
+    """In-process LRU store, bounded to ``max_entries``"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """LRU store in a local SQLite file, shared by every process using the same path"""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_tool_cache_accessed_at ON tool_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE tool_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            # Expired entries go first, then the least recently used ones
+            self._conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (now,))
+            overflow = self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM tool_cache WHERE key IN "
+                    "(SELECT key FROM tool_cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM tool_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0]
+
+
+class ToolResultCache:
+    """Memoizes tool results per tool and normalized query.
+
+    Each tool has its own TTL (``ttls``, by tool name, ``default_ttl``
+    otherwise). Hit/miss counters are kept per tool for the current process.
+    """
+
+    def __init__(self, backend: Any, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600):
+        self.backend = backend
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, tool_name: str, counter: str):
+        with self._lock:
+            counters = self._counters.setdefault(tool_name, {"hits": 0, "misses": 0})
+            counters[counter] += 1
+
+    def _key(self, tool_name: str, query: str, variant: str = "") -> str:
+        # ``variant`` (page, options...) is kept out of the normalized words
+        key = f"{tool_name}:{normalize_query(query)}"
+        return f"{key}|{variant}" if variant else key
+
+    def get(self, tool_name: str, query: str, variant: str = "") -> Optional[Any]:
+        """Cached result for this tool and query, None on a miss (counted)"""
+        if self.ttls.get(tool_name, self.default_ttl) <= 0:
+            return None
+        value = self.backend.get(self._key(tool_name, query, variant))
+        self._count(tool_name, "misses" if value is None else "hits")
+        return None if value is None else json.loads(value)
+
+    def set(self, tool_name: str, query: str, result: Any, variant: str = "") -> Any:
+        """Cache ``result`` for this tool and query, and return it"""
+        ttl = self.ttls.get(tool_name, self.default_ttl)
+        if ttl > 0:
+            self.backend.set(self._key(tool_name, query, variant), json.dumps(result), ttl)
+        return result
+
+    def get_or_compute(self, tool_name: str, query: str, compute: Callable[[], str], variant: str = "") -> str:
+        """Cached result of ``compute`` for this tool and query.
+
+        Exceptions raised by ``compute`` propagate and nothing is cached.
+        """
+        if self.ttls.get(tool_name, self.default_ttl) <= 0:
+            return compute()
+
+        value = self.get(tool_name, query, variant)
+        if value is not None:
+            return value
+        return self.set(tool_name, query, compute(), variant)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self._counters.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = {
+                name: {
+                    **counters,
+                    "hit_rate": round(counters["hits"] / max(1, counters["hits"] + counters["misses"]), 3)
+                }
+                for name, counters in self._counters.items()
+            }
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "evictions": self.backend.evictions,
+            "ttls": {**self.ttls, "default": self.default_ttl},
+            "tools": tools
+        }
+
+
+def create_tool_cache() -> ToolResultCache:
+    """Build the shared cache from the application settings"""
+    if settings.TOOL_CACHE_BACKEND == "sqlite":
+        backend = SQLiteCacheBackend(settings.TOOL_CACHE_PATH, settings.TOOL_CACHE_MAX_ENTRIES)
+    else:
+        backend = MemoryCacheBackend(settings.TOOL_CACHE_MAX_ENTRIES)
+    return ToolResultCache(
+        backend,
+        ttls=settings.TOOL_CACHE_TTLS,
+        default_ttl=settings.TOOL_CACHE_DEFAULT_TTL
+    )
+
+
+# Shared by every tool instance of the process
+tool_cache = create_tool_cache()
@@ -0,0 +1,52 @@
+import asyncio
+from typing import List, Optional, Union
+
+from app.core.config import settings
+from .directory import CompanyRecord, get_business_directory
+from .providers import hunter_find_contact
+
+
+async def resolve_contact(company_name: str) -> Optional[CompanyRecord]:
+    """Contact of a company: business directory first, then Hunter.io"""
+    contact = get_business_directory().find_contact(company_name)
+    if contact is None and settings.HUNTER_API_KEY:
+        contact = await hunter_find_contact(company_name)
+    return contact
+
+
+async def resolve_contacts(
+    company_names: List[str],
+    concurrency: Optional[int] = None
+) -> List[Union[CompanyRecord, None, Exception]]:
+    """Contacts of several companies, resolved concurrently.
+
+    Runs on the tool HTTP client loop. Results follow the order of
+    ``company_names``; a failed lookup yields its exception instead of
+    failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.CONTACT_BATCH_CONCURRENCY))
+
+    async def resolve(company_name: str) -> Optional[CompanyRecord]:
+        async with semaphore:
+            return await resolve_contact(company_name)
+
+    return await asyncio.gather(
+        *(resolve(company_name) for company_name in company_names), return_exceptions=True
+    )
+
+
+def format_contact(company_name: str, contact: Optional[CompanyRecord]) -> str:
+    """Tool output for one company"""
+    if contact is None:
+        return (
+            f"Aucun contact spécifique trouvé pour {company_name}. "
+            "Recommandé de chercher sur LinkedIn ou le site web de l'entreprise."
+        )
+    return (
+        f"Contact trouvé pour {company_name}:\n"
+        f"Nom: {contact.contact_name}\n"
+        f"Poste: {contact.contact_position}\n"
+        f"Email: {contact.email}\n"
+        f"Téléphone: {contact.phone}\n"
+        f"LinkedIn: {contact.linkedin or 'Non disponible'}"
+    )
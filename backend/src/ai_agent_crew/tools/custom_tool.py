@@ -1,29 +1,47 @@
 from crewai.tools import BaseTool
-from typing import Type, Any
+from typing import Type, Any, List, Optional
 from pydantic import BaseModel, Field
-import requests
 import time
 from urllib.parse import quote_plus
 
+from app.core.config import settings
+from .cache import tool_cache
+from .directory import get_business_directory
+from .http_client import http_client
+from .contacts import format_contact, resolve_contacts
+from .providers import hunter_find_contact
+
 class SearchInput(BaseModel):
     """Input schema for SearchTool."""
     search_query: str = Field(..., description="The search query to execute")
 
+class BusinessSearchInput(SearchInput):
+    """Input schema for the paginated business search."""
+    page: int = Field(default=1, ge=1, description="Page of results to return, starting at 1")
+
+class ContactSearchInput(BaseModel):
+    """Input schema for the contact finder, one company or a batch."""
+    search_query: str = Field(default="", description="Company name to find a contact for")
+    company_names: List[str] = Field(
+        default_factory=list,
+        description="Several company names, looked up together in a single call"
+    )
+
 class GlobalBusinessSearchTool(BaseTool):
     name: str = "Global Business Search"
     description: str = (
         "Recherche d'entreprises dans n'importe quel pays du monde. "
         "Utilise des sources locales et internationales pour trouver des informations sur les entreprises."
     )
-    args_schema: Type[BaseModel] = SearchInput
+    args_schema: Type[BaseModel] = BusinessSearchInput
 
-    def _run(self, search_query: str) -> str:
+    def _run(self, search_query: str, page: int = 1) -> str:
         """
         Recherche d'entreprises à l'international
         """
         try:
-            # Simulation d'une recherche d'entreprises ivoiriennes
-            # En production, vous pourriez intégrer avec:
+            # Recherche dans l'annuaire indexé (BUSINESS_DIRECTORY_PATHS)
+            # En production, vous pourriez aussi intégrer avec:
             # - API Crunchbase (startups et entreprises tech)
             # - API LinkedIn Sales Navigator
             # - API Google Places/Maps pour entreprises locales
@@ -31,198 +49,108 @@ class GlobalBusinessSearchTool(BaseTool):
             # - Chambres de commerce internationales
             # - Registres d'entreprises nationaux
             # - API Clearbit, Hunter.io pour enrichissement
+            # Les appels HTTP passent par http_client (connexions partagées,
+            # limites par hôte et par fournisseur, retries)
             
-            results = self._simulate_business_search(search_query)
-            return results
+            return tool_cache.get_or_compute(
+                self.name, search_query, lambda: self._search_directory(search_query, page), variant=f"page={page}"
+            )
             
         except Exception as e:
             return f"Erreur lors de la recherche: {str(e)}"
     
-    def _simulate_business_search(self, query: str) -> str:
+    def _search_directory(self, query: str, page: int = 1) -> str:
         """
-        Simulation de recherche d'entreprises
-        En production, remplacer par de vraies API
+        Recherche dans l'annuaire d'entreprises indexé
         """
-        # Base de données simulée d'entreprises internationales
-        sample_businesses = {
-            "technologie": [
-                {
-                    "name": "Microsoft France",
-                    "sector": "Logiciels",
-                    "location": "Paris, France",
-                    "website": "www.microsoft.fr",
-                    "description": "Solutions logicielles et cloud pour entreprises"
-                },
-                {
-                    "name": "Shopify Inc.",
-                    "sector": "E-commerce",
-                    "location": "Ottawa, Canada",
-                    "website": "www.shopify.com",
-                    "description": "Plateforme e-commerce pour PME"
-                },
-                {
-                    "name": "SAP Deutschland",
-                    "sector": "ERP/Software",
-                    "location": "Walldorf, Allemagne",
-                    "website": "www.sap.de",
-                    "description": "Solutions d'entreprise et gestion"
-                }
-            ],
-            "finance": [
-                {
-                    "name": "BNP Paribas",
-                    "sector": "Banque",
-                    "location": "Paris, France",
-                    "website": "www.bnpparibas.com",
-                    "description": "Groupe bancaire international"
-                },
-                {
-                    "name": "Standard Bank",
-                    "sector": "Banque",
-                    "location": "Johannesburg, Afrique du Sud",
-                    "website": "www.standardbank.com",
-                    "description": "Banque panafricaine"
-                }
-            ],
-            "commerce": [
-                {
-                    "name": "Carrefour Group",
-                    "sector": "Distribution",
-                    "location": "Boulogne-Billancourt, France",
-                    "website": "www.carrefour.com",
-                    "description": "Groupe de distribution international"
-                },
-                {
-                    "name": "Metro AG",
-                    "sector": "Commerce de gros",
-                    "location": "Düsseldorf, Allemagne",
-                    "website": "www.metro.de",
-                    "description": "Commerce de gros international"
-                }
-            ],
-            "industrie": [
-                {
-                    "name": "Siemens AG",
-                    "sector": "Industrie/Technologie",
-                    "location": "Munich, Allemagne",
-                    "website": "www.siemens.com",
-                    "description": "Solutions industrielles et d'automatisation"
-                },
-                {
-                    "name": "Schneider Electric",
-                    "sector": "Énergie/Automatisation",
-                    "location": "Rueil-Malmaison, France",
-                    "website": "www.schneider-electric.com",
-                    "description": "Spécialiste de la gestion d'énergie"
-                }
-            ]
-        }
-        
-        results = []
-        query_lower = query.lower()
-        
-        for sector, businesses in sample_businesses.items():
-            if any(keyword in query_lower for keyword in [sector, "entreprise", "société"]):
-                for business in businesses:
-                    results.append(
-                        f"Entreprise: {business['name']}\n"
-                        f"Secteur: {business['sector']}\n"
-                        f"Localisation: {business['location']}\n"
-                        f"Site web: {business['website']}\n"
-                        f"Description: {business['description']}\n"
-                        "---"
-                    )
+        page_size = settings.BUSINESS_SEARCH_PAGE_SIZE
+        page = max(1, page)
+        result = get_business_directory().search(query, limit=page_size, offset=(page - 1) * page_size)
         
-        if not results:
+        if not result.results:
             return "Aucune entreprise trouvée pour cette recherche. Essayez des termes plus généraux."
         
-        return "\n".join(results[:5])  # Limiter à 5 résultats
+        pages = -(-result.total // page_size)
+        lines = [
+            f"Résultats {result.offset + 1}-{result.offset + len(result.results)} "
+            f"sur {result.total} (page {page}/{pages})"
+        ]
+        for business in result.results:
+            lines.append(
+                f"Entreprise: {business.name}\n"
+                f"Secteur: {business.sector}\n"
+                f"Localisation: {business.location}\n"
+                f"Site web: {business.website}\n"
+                f"Description: {business.description}\n"
+                "---"
+            )
+        if page < pages:
+            lines.append(f"Plus de résultats disponibles avec page={page + 1}")
+        
+        return "\n".join(lines)
 
 class ContactFinderTool(BaseTool):
     name: str = "Global Contact Finder"
     description: str = (
         "Trouve des informations de contact pour les entreprises du monde entier. "
-        "Recherche emails, téléphones et contacts clés dans tous les pays."
+        "Recherche emails, téléphones et contacts clés dans tous les pays. "
+        "Pour plusieurs entreprises, passer leurs noms dans company_names : un seul appel suffit."
     )
-    args_schema: Type[BaseModel] = SearchInput
+    args_schema: Type[BaseModel] = ContactSearchInput
 
-    def _run(self, search_query: str) -> str:
+    def _run(self, search_query: str = "", company_names: Optional[List[str]] = None) -> str:
         """
-        Recherche d'informations de contact
+        Recherche d'informations de contact, pour une entreprise ou une liste
         """
         try:
-            # En production, intégrer avec:
+            # Recherche dans l'annuaire indexé (BUSINESS_DIRECTORY_PATHS),
+            # puis Hunter.io si HUNTER_API_KEY est configurée
+            # En production, intégrer aussi avec:
             # - LinkedIn Sales Navigator (mondial)
-            # - Hunter.io pour emails professionnels
             # - Apollo.io, ZoomInfo pour contacts B2B
             # - Clearbit pour enrichissement de données
             # - Bases de données locales par pays
             # - Annuaires professionnels internationaux
             # - Crunchbase pour contacts startup
             
-            contacts = self._simulate_contact_search(search_query)
-            return contacts
+            if company_names:
+                return self._find_contacts([search_query, *company_names])
+            
+            return tool_cache.get_or_compute(
+                self.name, search_query, lambda: self._find_contact(search_query)
+            )
             
         except Exception as e:
             return f"Erreur lors de la recherche de contacts: {str(e)}"
     
-    def _simulate_contact_search(self, company_name: str) -> str:
+    def _find_contact(self, company_name: str) -> str:
         """
-        Simulation de recherche de contacts
+        Recherche du contact dans l'annuaire d'entreprises indexé, puis chez Hunter.io
         """
-        # Base de données simulée de contacts internationaux
-        sample_contacts = {
-            "microsoft": {
-                "contact_name": "Marie Dubois",
-                "position": "Directrice Partenariats",
-                "email": "marie.dubois@microsoft.com",
-                "phone": "+33 1 44 76 50 00",
-                "linkedin": "linkedin.com/in/marie-dubois-ms"
-            },
-            "shopify": {
-                "contact_name": "James Thompson",
-                "position": "Enterprise Sales Director",
-                "email": "james.thompson@shopify.com",
-                "phone": "+1 613 241 2727",
-                "linkedin": "linkedin.com/in/jamesthompson-shopify"
-            },
-            "sap": {
-                "contact_name": "Klaus Mueller",
-                "position": "Regional Sales Manager",
-                "email": "klaus.mueller@sap.com",
-                "phone": "+49 6227 7-47474",
-                "linkedin": "linkedin.com/in/klaus-mueller-sap"
-            },
-            "bnp paribas": {
-                "contact_name": "Sophie Martin",
-                "position": "Directrice Innovation",
-                "email": "sophie.martin@bnpparibas.com",
-                "phone": "+33 1 40 14 45 46",
-                "linkedin": "linkedin.com/in/sophie-martin-bnp"
-            },
-            "siemens": {
-                "contact_name": "Hans Schmidt",
-                "position": "Business Development Manager",
-                "email": "hans.schmidt@siemens.com",
-                "phone": "+49 89 636 00",
-                "linkedin": "linkedin.com/in/hans-schmidt-siemens"
-            }
-        }
+        contact = get_business_directory().find_contact(company_name)
+        if contact is None and settings.HUNTER_API_KEY:
+            contact = http_client.run(hunter_find_contact(company_name))
         
-        company_key = company_name.lower()
+        return format_contact(company_name, contact)
+    
+    def _find_contacts(self, company_names: List[str]) -> str:
+        """
+        Recherche groupée : les entreprises absentes du cache sont résolues en parallèle
+        """
+        names = list(dict.fromkeys(name.strip() for name in company_names if name and name.strip()))
+        results = {name: tool_cache.get(self.name, name) for name in names}
         
-        for key, contact in sample_contacts.items():
-            if key in company_key or any(word in company_key for word in key.split()):
-                return (
-                    f"Contact trouvé pour {company_name}:\n"
-                    f"Nom: {contact['contact_name']}\n"
-                    f"Poste: {contact['position']}\n"
-                    f"Email: {contact['email']}\n"
-                    f"Téléphone: {contact['phone']}\n"
-                    f"LinkedIn: {contact.get('linkedin', 'Non disponible')}"
-                )
+        missing = [name for name, result in results.items() if result is None]
+        if missing:
+            contacts = http_client.run(resolve_contacts(missing))
+            for name, contact in zip(missing, contacts):
+                if isinstance(contact, Exception):
+                    # Not cached, the next call retries it
+                    results[name] = f"Erreur lors de la recherche de contacts pour {name}: {str(contact)}"
+                else:
+                    results[name] = tool_cache.set(self.name, name, format_contact(name, contact))
         
-        return f"Aucun contact spécifique trouvé pour {company_name}. Recommandé de chercher sur LinkedIn ou le site web de l'entreprise."
+        return f"Contacts pour {len(names)} entreprises:\n\n" + "\n\n".join(results[name] for name in names)
 
 class GlobalMarketAnalysisTool(BaseTool):
     name: str = "Global Market Analysis"
@@ -237,8 +165,9 @@ class GlobalMarketAnalysisTool(BaseTool):
         Analyse de marché internationale
         """
         try:
-            analysis = self._analyze_global_market(search_query)
-            return analysis
+            return tool_cache.get_or_compute(
+                self.name, search_query, lambda: self._analyze_global_market(search_query)
+            )
             
         except Exception as e:
             return f"Erreur lors de l'analyse de marché: {str(e)}"
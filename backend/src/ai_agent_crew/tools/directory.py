@@ -0,0 +1,341 @@
+import csv
+import json
+import threading
+from abc import ABC, abstractmethod
+from itertools import chain, islice
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.utils.logger import setup_logger
+from .text import tokenize
+
+logger = setup_logger(__name__)
+
+
+@dataclass(slots=True)
+class CompanyRecord:
+    """One company of the business directory, with its main contact if known"""
+    name: str
+    sector: str = ""
+    location: str = ""
+    website: str = ""
+    description: str = ""
+    category: str = ""
+    contact_name: str = ""
+    contact_position: str = ""
+    email: str = ""
+    phone: str = ""
+    linkedin: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompanyRecord":
+        """Record from a CSV row or JSON object; unknown columns are ignored"""
+        values = {key: str(value).strip() for key, value in data.items() if value not in (None, "")}
+        values.setdefault("name", values.pop("company_name", ""))
+        values.setdefault("contact_position", values.pop("position", ""))
+        return cls(**{f.name: values[f.name] for f in fields(cls) if f.name in values})
+
+    @property
+    def has_contact(self) -> bool:
+        return bool(self.contact_name or self.email or self.phone)
+
+
+@dataclass
+class SearchPage:
+    """One page of ranked search results"""
+    total: int
+    offset: int
+    limit: int
+    results: List[CompanyRecord] = field(default_factory=list)
+
+
+# Indexed fields: weight of a query word found in them, and the record
+# attributes they cover
+FIELD_WEIGHTS = {"name": 3.0, "sector": 2.0, "location": 1.0}
+INDEXED_ATTRIBUTES = {
+    "name": ("name",),
+    "sector": ("sector", "category"),
+    "location": ("location",),
+}
+
+# Tied results are returned in load order up to this group size
+SORTED_GROUP_MAX_SIZE = 2048
+
+# Words that do not narrow a search ("entreprises de technologie à Paris")
+GENERIC_TOKENS = {
+    "entreprise", "entreprises", "societe", "societes", "company", "companies",
+    "business", "pme", "de", "des", "du", "la", "le", "les", "l", "d", "en",
+    "et", "a", "au", "aux", "dans", "pour", "in", "the", "of", "and", "for"
+}
+
+
+class BusinessDirectory(ABC):
+    """Interface of the directory backends used by the search tools"""
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 5, offset: int = 0) -> SearchPage:
+        """One page of the records matching ``query``, best matches first"""
+
+    @abstractmethod
+    def find_contact(self, company_name: str) -> Optional[CompanyRecord]:
+        """Record of ``company_name`` with its main contact, None if unknown"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of records in the directory"""
+
+
+class InMemoryBusinessDirectory(BusinessDirectory):
+    """Directory held in memory with an inverted token index.
+
+    The index maps each word of the name, sector/category and location of
+    the companies to the set of ids of the records containing it. Every
+    known word of a query must match; if no record has them all, the most
+    common words are dropped one by one until some records match. Results
+    are ranked by the weight of the fields the words were found in; ties
+    keep load order, except in very large groups where a stable set order
+    is used to avoid sorting them. Matching and ranking are set operations
+    on the postings, whose cost follows the rarest words of the query,
+    never the directory size.
+    """
+
+    def __init__(self, records: Iterable[CompanyRecord]):
+        self.records: List[CompanyRecord] = list(records)
+        self._postings: Dict[str, Dict[str, Set[int]]] = {name: {} for name in FIELD_WEIGHTS}
+        self._contact_ids = frozenset(
+            record_id for record_id, record in enumerate(self.records) if record.has_contact
+        )
+
+        for record_id, record in enumerate(self.records):
+            for field_name, attributes in INDEXED_ATTRIBUTES.items():
+                postings = self._postings[field_name]
+                text = " ".join(getattr(record, attribute) for attribute in attributes)
+                for token in set(tokenize(text)):
+                    postings.setdefault(token, set()).add(record_id)
+
+        # Records containing a word in any field; words found in a single
+        # field (most of them) share that field's set instead of a copy
+        self._any: Dict[str, Set[int]] = {}
+        for postings in self._postings.values():
+            for token, ids in postings.items():
+                existing = self._any.get(token)
+                self._any[token] = ids if existing is None else existing | ids
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _query_tokens(self, query: str) -> List[str]:
+        return [token for token in dict.fromkeys(tokenize(query)) if token not in GENERIC_TOKENS]
+
+    def _field_sets(self, token: str) -> List[Tuple[float, Set[int]]]:
+        """(weight, record ids) of the fields containing ``token``, heaviest first"""
+        return [
+            (weight, self._postings[field_name][token])
+            for field_name, weight in FIELD_WEIGHTS.items()
+            if token in self._postings[field_name]
+        ]
+
+    def _rank(
+        self,
+        candidates: Set[int],
+        field_sets: Dict[str, List[Tuple[float, Set[int]]]],
+        contained: Set[str]
+    ) -> List[Tuple[float, List[Set[int]]]]:
+        """Candidates grouped by score, best score first.
+
+        A record scores, for each query word, the weight of the heaviest
+        field containing it. Every candidate contains the ``contained``
+        words, so their lightest field needs no set operation. Each group is
+        a list of disjoint sets; postings are shared, never modified.
+        """
+        classes: Dict[float, List[Set[int]]] = {0.0: [candidates]}
+        for token, token_sets in field_sets.items():
+            last = len(token_sets) - 1 if token in contained else -1
+            scored: Dict[float, List[Set[int]]] = {}
+            for score, parts in classes.items():
+                for members in parts:
+                    for index, (weight, ids) in enumerate(token_sets):
+                        hits = members if index == last else members & ids
+                        if hits:
+                            scored.setdefault(score + weight, []).append(hits)
+                            members = set() if hits is members else members - hits
+                        if not members:
+                            break
+                    if members:
+                        scored.setdefault(score, []).append(members)
+            classes = scored
+        return sorted(classes.items(), key=lambda item: -item[0])
+
+    def search(self, query: str, limit: int = 5, offset: int = 0) -> SearchPage:
+        limit, offset = max(1, limit), max(0, offset)
+        tokens = self._query_tokens(query)
+
+        if not tokens:
+            # Nothing specific asked for: the whole directory, in load order
+            return SearchPage(len(self.records), offset, limit, self.records[offset:offset + limit])
+
+        # Words absent from the directory cannot narrow the search
+        tokens = sorted((token for token in tokens if token in self._any), key=lambda token: len(self._any[token]))
+        if not tokens:
+            return SearchPage(0, offset, limit)
+
+        # Every word must match; failing that, the most common words are
+        # dropped one by one until some records match
+        kept = list(tokens)
+        candidates = self._any[kept[0]].intersection(*(self._any[token] for token in kept[1:]))
+        while not candidates:
+            kept.pop()
+            candidates = self._any[kept[0]].intersection(*(self._any[token] for token in kept[1:]))
+
+        field_sets = {token: self._field_sets(token) for token in tokens}
+        page: List[CompanyRecord] = []
+        skip = offset
+        for _, parts in self._rank(candidates, field_sets, set(kept)):
+            if len(page) == limit:
+                break
+            size = sum(len(members) for members in parts)
+            if skip >= size:
+                skip -= size
+                continue
+            wanted = skip + limit - len(page)
+            if size <= SORTED_GROUP_MAX_SIZE:
+                ordered = sorted(chain.from_iterable(parts))[skip:wanted]
+            else:
+                ordered = islice(chain.from_iterable(parts), skip, wanted)
+            page.extend(self.records[record_id] for record_id in ordered)
+            skip = 0
+
+        return SearchPage(len(candidates), offset, limit, page)
+
+    def find_contact(self, company_name: str) -> Optional[CompanyRecord]:
+        """Company with a known contact best matching ``company_name``.
+
+        Candidates share the rarest word of the name that some company with
+        a contact has; they are ranked by the other words they share.
+        """
+        names = self._postings["name"]
+        tokens = sorted(
+            (token for token in self._query_tokens(company_name) if token in names),
+            key=lambda token: len(names[token])
+        )
+
+        for index, token in enumerate(tokens):
+            candidates = names[token] & self._contact_ids
+            if candidates:
+                break
+        else:
+            return None
+
+        field_sets = {other: [(1.0, names[other])] for other in tokens[index + 1:]}
+        _, best = self._rank(candidates, field_sets, set())[0]
+        return self.records[min(chain.from_iterable(best))]
+
+
+def iter_records(path: str) -> Iterator[CompanyRecord]:
+    """Records of a CSV (with header) or JSON Lines file"""
+    file_path = Path(path)
+    with file_path.open(encoding="utf-8", newline="") as handle:
+        if file_path.suffix.lower() == ".csv":
+            for row in csv.DictReader(handle):
+                record = CompanyRecord.from_dict(row)
+                if record.name:
+                    yield record
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    record = CompanyRecord.from_dict(json.loads(line))
+                    if record.name:
+                        yield record
+
+
+# Built-in companies used when no directory file is configured
+SAMPLE_COMPANIES = [
+    CompanyRecord(
+        name="Microsoft France", sector="Logiciels", location="Paris, France",
+        website="www.microsoft.fr", description="Solutions logicielles et cloud pour entreprises",
+        category="technologie", contact_name="Marie Dubois", contact_position="Directrice Partenariats",
+        email="marie.dubois@microsoft.com", phone="+33 1 44 76 50 00",
+        linkedin="linkedin.com/in/marie-dubois-ms"
+    ),
+    CompanyRecord(
+        name="Shopify Inc.", sector="E-commerce", location="Ottawa, Canada",
+        website="www.shopify.com", description="Plateforme e-commerce pour PME",
+        category="technologie", contact_name="James Thompson", contact_position="Enterprise Sales Director",
+        email="james.thompson@shopify.com", phone="+1 613 241 2727",
+        linkedin="linkedin.com/in/jamesthompson-shopify"
+    ),
+    CompanyRecord(
+        name="SAP Deutschland", sector="ERP/Software", location="Walldorf, Allemagne",
+        website="www.sap.de", description="Solutions d'entreprise et gestion",
+        category="technologie", contact_name="Klaus Mueller", contact_position="Regional Sales Manager",
+        email="klaus.mueller@sap.com", phone="+49 6227 7-47474",
+        linkedin="linkedin.com/in/klaus-mueller-sap"
+    ),
+    CompanyRecord(
+        name="BNP Paribas", sector="Banque", location="Paris, France",
+        website="www.bnpparibas.com", description="Groupe bancaire international",
+        category="finance", contact_name="Sophie Martin", contact_position="Directrice Innovation",
+        email="sophie.martin@bnpparibas.com", phone="+33 1 40 14 45 46",
+        linkedin="linkedin.com/in/sophie-martin-bnp"
+    ),
+    CompanyRecord(
+        name="Standard Bank", sector="Banque", location="Johannesburg, Afrique du Sud",
+        website="www.standardbank.com", description="Banque panafricaine", category="finance"
+    ),
+    CompanyRecord(
+        name="Carrefour Group", sector="Distribution", location="Boulogne-Billancourt, France",
+        website="www.carrefour.com", description="Groupe de distribution international", category="commerce"
+    ),
+    CompanyRecord(
+        name="Metro AG", sector="Commerce de gros", location="Düsseldorf, Allemagne",
+        website="www.metro.de", description="Commerce de gros international", category="commerce"
+    ),
+    CompanyRecord(
+        name="Siemens AG", sector="Industrie/Technologie", location="Munich, Allemagne",
+        website="www.siemens.com", description="Solutions industrielles et d'automatisation",
+        category="industrie", contact_name="Hans Schmidt", contact_position="Business Development Manager",
+        email="hans.schmidt@siemens.com", phone="+49 89 636 00",
+        linkedin="linkedin.com/in/hans-schmidt-siemens"
+    ),
+    CompanyRecord(
+        name="Schneider Electric", sector="Énergie/Automatisation", location="Rueil-Malmaison, France",
+        website="www.schneider-electric.com", description="Spécialiste de la gestion d'énergie",
+        category="industrie"
+    ),
+]
+
+DIRECTORY_BACKENDS = {
+    "memory": InMemoryBusinessDirectory,
+}
+
+_directory: Optional[BusinessDirectory] = None
+_directory_lock = threading.Lock()
+
+
+def load_business_directory() -> BusinessDirectory:
+    """Build the directory configured by the BUSINESS_DIRECTORY_* settings"""
+    backend = DIRECTORY_BACKENDS[settings.BUSINESS_DIRECTORY_BACKEND]
+    if settings.BUSINESS_DIRECTORY_PATHS:
+        records = (
+            record
+            for path in settings.BUSINESS_DIRECTORY_PATHS
+            for record in iter_records(path)
+        )
+    else:
+        records = SAMPLE_COMPANIES
+    directory = backend(records)
+    logger.info(f"Business directory loaded with {len(directory)} companies")
+    return directory
+
+
+def get_business_directory() -> BusinessDirectory:
+    """Shared directory of the process, built on first use"""
+    global _directory
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = load_business_directory()
+    return _directory
@@ -0,0 +1,210 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+# Responses worth another attempt; other statuses are returned as is
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, in bursts of up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters are served one at a time, in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ToolHttpClient:
+    """HTTP client shared by the crew tools.
+
+    A single pooled ``httpx.AsyncClient`` runs on its own event loop thread,
+    started on first use, so tool code running in executor threads reuses
+    keep-alive connections instead of opening one per lookup. Requests are
+    limited per host (``per_host_limit`` in flight) and per provider (token
+    bucket of ``rate_limits[provider]`` requests per second), and retried
+    with jittered exponential backoff on transport errors, 429 and 5xx.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        timeout: float = 10.0,
+        per_host_limit: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        rate_limits: Optional[Dict[str, float]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self.timeout = timeout
+        self.per_host_limit = max(1, per_host_limit)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limits = rate_limits or {}
+        self.transport = transport
+
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._client = httpx.AsyncClient(
+                    limits=self.limits, timeout=self.timeout, transport=self.transport
+                )
+                self._host_limits, self._buckets = {}, {}
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="tool-http-client", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the client loop and wait for its result.
+
+        Meant for synchronous code (tools, executor threads), never for the
+        client loop itself.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    async def run_async(self, coro: Awaitable[T]) -> T:
+        """Await ``coro`` on the client loop from another event loop"""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()))
+
+    def _bucket(self, provider: Optional[str]) -> Optional[TokenBucket]:
+        rate = self.rate_limits.get(provider) if provider else None
+        if not rate or rate <= 0:
+            return None
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            bucket = self._buckets[provider] = TokenBucket(rate)
+        return bucket
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        # Retry-After (in seconds) wins over the computed delay, within backoff_max
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(self, method: str, url: str, provider: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+        """Send a request on the client loop, with limits and retries.
+
+        Runs on the client loop only (through ``run``/``run_async``). The
+        last response is returned when retries are exhausted; the last
+        transport error is raised.
+        """
+        self._ensure_loop()
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        bucket = self._bucket(provider)
+
+        attempt = 0
+        while True:
+            if bucket is not None:
+                await bucket.acquire()
+            self.stats["requests"] += 1
+            try:
+                async with semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{method} {host} failed ({type(e).__name__}), retry in {delay:.2f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if attempt >= self.max_retries:
+                    self.stats["failures"] += 1
+                    return response
+                delay = self._backoff(attempt, response)
+                logger.warning(f"{method} {host} returned {response.status_code}, retry in {delay:.2f}s")
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def get_json(self, url: str, provider: Optional[str] = None, **kwargs: Any) -> Any:
+        """GET ``url`` from synchronous code and decode the JSON body.
+
+        Raises ``httpx.HTTPStatusError`` on an error status.
+        """
+        response = self.run(self.request("GET", url, provider=provider, **kwargs))
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        """Close the pooled connections and stop the loop thread"""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+        except Exception as e:
+            logger.error(f"Error closing the tool HTTP client: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+def create_http_client() -> ToolHttpClient:
+    """Build the shared client from the application settings"""
+    return ToolHttpClient(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+        timeout=settings.HTTP_CLIENT_TIMEOUT,
+        per_host_limit=settings.HTTP_CLIENT_PER_HOST_LIMIT,
+        max_retries=settings.HTTP_CLIENT_MAX_RETRIES,
+        backoff_base=settings.HTTP_CLIENT_BACKOFF_BASE,
+        backoff_max=settings.HTTP_CLIENT_BACKOFF_MAX,
+        rate_limits=settings.HTTP_PROVIDER_RATE_LIMITS
+    )
+
+
+# Shared by every tool instance of the process
+http_client = create_http_client()
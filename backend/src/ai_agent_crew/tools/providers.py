@@ -0,0 +1,41 @@
+from typing import Optional
+
+from app.core.config import settings
+from .directory import CompanyRecord
+from .http_client import http_client
+
+
+async def hunter_find_contact(company_name: str, domain: Optional[str] = None) -> Optional[CompanyRecord]:
+    """Best contact known by Hunter.io for a company (domain search).
+
+    Runs on the tool HTTP client loop. Returns None when no API key is
+    configured or Hunter has no email for the company.
+    """
+    if not settings.HUNTER_API_KEY:
+        return None
+
+    params = {"api_key": settings.HUNTER_API_KEY, "limit": 10}
+    if domain:
+        params["domain"] = domain
+    else:
+        params["company"] = company_name
+
+    response = await http_client.request(
+        "GET", f"{settings.HUNTER_API_URL.rstrip('/')}/domain-search", provider="hunter", params=params
+    )
+    response.raise_for_status()
+    data = response.json().get("data") or {}
+    emails = data.get("emails") or []
+    if not emails:
+        return None
+
+    best = max(emails, key=lambda email: email.get("confidence") or 0)
+    return CompanyRecord(
+        name=data.get("organization") or company_name,
+        website=data.get("domain") or "",
+        contact_name=" ".join(filter(None, [best.get("first_name"), best.get("last_name")])),
+        contact_position=best.get("position") or "",
+        email=best.get("value") or "",
+        phone=best.get("phone_number") or "",
+        linkedin=best.get("linkedin") or ""
+    )
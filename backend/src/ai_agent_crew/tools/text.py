@@ -0,0 +1,16 @@
+import re
+import unicodedata
+from typing import List
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def fold(text: str) -> str:
+    """Lowercase ``text`` and strip its accents ("Société" -> "societe")"""
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Folded words of ``text``, punctuation removed"""
+    return _NON_WORD.sub(" ", fold(text)).split()